@@ -0,0 +1,111 @@
+"""SDK benchmark suite.
+
+    cd python-sdk
+    python -m benchmarks run --out benchmarks/results/local.json
+    python -m benchmarks run --filter 'payout\\.' --compare benchmarks/baselines/reference.json
+    python -m benchmarks compare benchmarks/baselines/reference.json benchmarks/results/local.json
+
+``run`` times the micro benchmarks (per-call nanoseconds) and the macro
+throughput runs (payouts per second at several concurrency levels) against
+in-process fakes, plus the cold import cost of the SDK (``import.*``, see
+``benchmarks.importtime``), and writes a JSON result file. ``compare`` (or ``run
+--compare``) prints the change against a baseline and exits 1 when anything
+regressed by more than ``--tolerance``. Baselines are machine specific:
+record one on the machine that will be compared against it.
+"""
+
+import argparse
+import re
+import sys
+from typing import List, Optional
+
+from visa_direct_sdk.utils.metrics import configure_metrics
+from visa_direct_sdk.utils.otel import configure_otel
+
+from .cases import macro_cases, micro_cases
+from .harness import Result, compare, measure, read_results, report, write_results
+from .importtime import STATEMENTS, measure_statement
+
+
+def _run(args: argparse.Namespace) -> int:
+	if not args.otel:
+		configure_otel(disabled=True)
+	if args.no_metrics:
+		configure_metrics(disabled=True)
+	pattern = re.compile(args.filter) if args.filter else None
+	min_time, repeat = (0.05, 3) if args.quick else (args.min_time, args.repeat)
+	results: List[Result] = []
+
+	for name, setup in micro_cases().items():
+		if pattern and not pattern.search(name):
+			continue
+		metrics = measure(setup(), min_time=min_time, repeat=repeat)
+		results.append(Result(name, metrics))
+		print(f"{name:<40} {metrics['ns_median'] / 1000:>10.2f} µs/op  (±{metrics['ns_stdev'] / 1000:.2f})", file=sys.stderr)
+
+	if not args.no_import:
+		for name, statement in STATEMENTS.items():
+			if pattern and not pattern.search(name):
+				continue
+			metrics = measure_statement(statement, repeat=3 if args.quick else args.repeat)
+			results.append(Result(name, metrics, {"statement": statement}))
+			print(f"{name:<40} {metrics['ns_median'] / 1e6:>10.2f} ms      (±{metrics['ns_stdev'] / 1e6:.2f})", file=sys.stderr)
+
+	if not args.no_macro:
+		levels = tuple(int(x) for x in args.concurrency.split(","))
+		payouts = 200 if args.quick else args.payouts
+		for name, run_once, params in macro_cases(levels, payouts=payouts, latency=args.latency_ms / 1000):
+			if pattern and not pattern.search(name):
+				continue
+			runs = [run_once() for _ in range(1 if args.quick else 3)]
+			best = max(runs, key=lambda r: r["ops_per_sec"])
+			results.append(Result(name, best, params))
+			print(f"{name:<40} {best['ops_per_sec']:>10.0f} payouts/s", file=sys.stderr)
+
+	if args.out:
+		write_results(args.out, results)
+	if args.compare:
+		current = {r.name: r.metrics for r in results}
+		regressions = report(compare(read_results(args.compare), current), tolerance=args.tolerance)
+		return 1 if regressions else 0
+	return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+	regressions = report(compare(read_results(args.baseline), read_results(args.current)), tolerance=args.tolerance)
+	return 1 if regressions else 0
+
+
+def main(argv: Optional[list] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Visa Direct SDK benchmarks.")
+	sub = parser.add_subparsers(dest="command", required=True)
+
+	run = sub.add_parser("run", help="run the suite")
+	run.add_argument("--out", help="write results JSON here")
+	run.add_argument("--compare", metavar="BASELINE", help="compare against a baseline JSON and fail on regressions")
+	run.add_argument("--filter", help="only benchmarks whose name matches this regex")
+	run.add_argument("--quick", action="store_true", help="short timing runs (smoke test, not for baselines)")
+	run.add_argument("--min-time", type=float, default=0.2, help="seconds per timed batch")
+	run.add_argument("--repeat", type=int, default=7, help="timed batches per benchmark")
+	run.add_argument("--no-macro", action="store_true", help="skip throughput runs")
+	run.add_argument("--no-import", action="store_true", help="skip the cold import runs")
+	run.add_argument("--concurrency", default="1,4,16,64", help="throughput concurrency levels")
+	run.add_argument("--payouts", type=int, default=2000, help="payouts per throughput run")
+	run.add_argument("--latency-ms", type=float, default=2.0, help="simulated network latency for throughput runs")
+	run.add_argument("--otel", action="store_true", help="keep tracing as configured by the environment (off by default)")
+	run.add_argument("--no-metrics", action="store_true", help="disable the metrics registry")
+	run.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before a comparison fails")
+	run.set_defaults(func=_run)
+
+	cmp = sub.add_parser("compare", help="compare two result files")
+	cmp.add_argument("baseline")
+	cmp.add_argument("current")
+	cmp.add_argument("--tolerance", type=float, default=0.15)
+	cmp.set_defaults(func=_compare)
+
+	args = parser.parse_args(argv)
+	return args.func(args)
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,177 @@
+"""Benchmark cases: micro benchmarks of the payout hot path and macro throughput runs."""
+
+import itertools
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from jwcrypto import jwk
+
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.core.validation import validate_payout_request
+from visa_direct_sdk.policy.corridor_policy import compile_policy, get_rules, load_policy
+from visa_direct_sdk.storage.cache import InMemoryCache
+from visa_direct_sdk.storage.idempotency_store import DynamoIdempotencyStore, RedisIdempotencyStore
+from visa_direct_sdk.storage.receipt_store import DynamoReceiptStore, RedisReceiptStore
+from visa_direct_sdk.transport.secure_http_client import SecureHttpClient
+
+from .fakes import FakeDynamo, FakeRedis, FakeVisaBackend
+
+ENDPOINTS = str(Path(__file__).resolve().parents[2] / "endpoints" / "endpoints.json")
+
+FUNDING_TYPES = ("INTERNAL", "AFT", "PIS")
+DESTINATION_TYPES = ("CARD", "ACCOUNT", "WALLET", "ALIAS")
+
+Case = Callable[[], Callable[[], Any]]
+
+_KEY: Optional[jwk.JWK] = None
+
+
+def signing_key() -> jwk.JWK:
+	global _KEY
+	if _KEY is None:
+		_KEY = jwk.JWK.generate(kty="RSA", size=2048, kid="bench-1")
+	return _KEY
+
+
+def make_client(*, mle: bool = False, latency: float = 0.0) -> SecureHttpClient:
+	backend = FakeVisaBackend(signing_key() if mle else None, latency=latency)
+	return SecureHttpClient(base_url="https://bench.invalid", endpoints_file=os.environ.get("VISA_ENDPOINTS_FILE", ENDPOINTS), backend=backend)
+
+
+def request_factory(funding_type: str, destination_type: str) -> Callable[[], Dict[str, Any]]:
+	"""Fresh request dicts with unique idempotency keys and receipts, so every call does the full payout."""
+	seq = itertools.count()
+
+	def make() -> Dict[str, Any]:
+		n = next(seq)
+		if funding_type == "INTERNAL":
+			funding = {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": f"ledger-{n}"}
+		elif funding_type == "AFT":
+			funding = {"type": "AFT", "receiptId": f"aft-{n}", "status": "approved"}
+		else:
+			funding = {"type": "PIS", "paymentId": f"pis-{n}", "status": "executed"}
+		if destination_type == "CARD":
+			destination = {"type": "CARD", "panToken": "tok_pan_411111******1111"}
+		elif destination_type == "ACCOUNT":
+			destination = {"type": "ACCOUNT", "accountId": "acct-001"}
+		elif destination_type == "WALLET":
+			destination = {"type": "WALLET", "walletId": "wallet-001"}
+		else:
+			# one recurring alias: resolution is served from cache after the first call
+			destination = {"type": "ALIAS", "alias": "payee@example.com", "aliasType": "EMAIL"}
+		return {
+			"originatorId": "bench-originator",
+			"idempotencyKey": f"bench-{funding_type}-{destination_type}-{n}",
+			"funding": funding,
+			"destination": destination,
+			"amount": {"currency": "USD", "minor": 1000 + n % 500},
+		}
+	return make
+
+
+def _payout(funding_type: str, destination_type: str, *, mle: bool = False, stores: str = "memory") -> Case:
+	def setup() -> Callable[[], Any]:
+		options: Dict[str, Any] = {}
+		if stores == "redis":
+			redis = FakeRedis()
+			options = {"idempotency_store": RedisIdempotencyStore(redis), "receipt_store": RedisReceiptStore(redis)}
+		elif stores == "dynamo":
+			dynamo = FakeDynamo()
+			options = {"idempotency_store": DynamoIdempotencyStore("idem", dynamo), "receipt_store": DynamoReceiptStore("receipts", dynamo)}
+		orch = Orchestrator(make_client(mle=mle), **options)
+		make = request_factory(funding_type, destination_type)
+		return lambda: orch.payout(make())
+	return setup
+
+
+def _validate() -> Callable[[], Any]:
+	request = request_factory("AFT", "CARD")()
+	return lambda: validate_payout_request(request)
+
+
+def _get_rules() -> Callable[[], Any]:
+	policy = load_policy()
+	return lambda: get_rules(policy, source_country="GB", target_country="IN", source_currency="GBP", target_currency="INR")
+
+
+def _policy_lookup() -> Callable[[], Any]:
+	compiled = compile_policy(load_policy())
+	return lambda: compiled.lookup("GB", "IN", "GBP", "INR")
+
+
+def _cache_get_hit() -> Callable[[], Any]:
+	cache = InMemoryCache()
+	cache.set("alias:EMAIL:payee@example.com", {"panToken": "tok"}, 3600)
+	return lambda: cache.get("alias:EMAIL:payee@example.com")
+
+
+def _cache_get_with_revalidate() -> Callable[[], Any]:
+	cache = InMemoryCache()
+	cache.set("quote:USD:MXN:1000", {"quoteId": "Q"}, 3600)
+	return lambda: cache.get_with_revalidate("quote:USD:MXN:1000")
+
+
+def _cache_set() -> Callable[[], Any]:
+	cache = InMemoryCache()
+	keys = itertools.cycle([f"pav:tok-{i}" for i in range(1024)])
+	return lambda: cache.set(next(keys), {"valid": True}, 60)
+
+
+def _jwe_encrypt() -> Callable[[], Any]:
+	client = make_client(mle=True)
+	payload = request_factory("INTERNAL", "CARD")()
+	return lambda: client._encrypt_jwe(payload)
+
+
+def _jwe_decrypt() -> Callable[[], Any]:
+	client = make_client(mle=True)
+	token, _headers, _ = client._encrypt_jwe(request_factory("INTERNAL", "CARD")())
+	token = token.encode("ascii") if isinstance(token, str) else token
+	return lambda: client._decrypt_jwe(token)
+
+
+def _requires_mle(path: str) -> Case:
+	def setup() -> Callable[[], Any]:
+		client = make_client()
+		return lambda: client.requires_mle(path)
+	return setup
+
+
+def micro_cases() -> Dict[str, Case]:
+	cases: Dict[str, Case] = {"validate_payout_request": _validate}
+	for funding_type, destination_type in itertools.product(FUNDING_TYPES, DESTINATION_TYPES):
+		cases[f"payout.{funding_type}.{destination_type}"] = _payout(funding_type, destination_type)
+	cases["payout.mle.INTERNAL.CARD"] = _payout("INTERNAL", "CARD", mle=True)
+	cases["payout.redis_stores.AFT.CARD"] = _payout("AFT", "CARD", stores="redis")
+	cases["payout.dynamo_stores.AFT.CARD"] = _payout("AFT", "CARD", stores="dynamo")
+	cases["policy.get_rules"] = _get_rules
+	cases["policy.compiled_lookup"] = _policy_lookup
+	cases["cache.inmemory.get_hit"] = _cache_get_hit
+	cases["cache.inmemory.get_with_revalidate"] = _cache_get_with_revalidate
+	cases["cache.inmemory.set"] = _cache_set
+	cases["jwe.encrypt"] = _jwe_encrypt
+	cases["jwe.decrypt"] = _jwe_decrypt
+	cases["requires_mle.exact"] = _requires_mle("/visadirect/fundstransfer/v1/pushfunds")
+	cases["requires_mle.param"] = _requires_mle("/visapayouts/v3/payouts/P-123")
+	return cases
+
+
+def throughput(concurrency: int, *, payouts: int, latency: float, mle: bool = False) -> Dict[str, float]:
+	"""Drive ``payouts`` payouts through ``Orchestrator.payout_batch``; the fake network sleeps ``latency`` per call."""
+	orch = Orchestrator(make_client(mle=mle, latency=latency))
+	make = request_factory("INTERNAL", "CARD")
+	requests: Iterator[Dict[str, Any]] = (make() for _ in range(payouts))
+	started = time.perf_counter()
+	errors = sum(1 for outcome in orch.payout_batch(requests, max_workers=concurrency) if not outcome.ok)
+	elapsed = time.perf_counter() - started
+	return {"ops_per_sec": payouts / elapsed, "seconds": elapsed, "errors": errors}
+
+
+def macro_cases(levels: Tuple[int, ...], *, payouts: int, latency: float) -> List[Tuple[str, Callable[[], Dict[str, float]], Dict[str, Any]]]:
+	cases = []
+	for level in levels:
+		params = {"concurrency": level, "payouts": payouts, "latency_ms": latency * 1000}
+		cases.append((f"throughput.payout.c{level}", lambda level=level: throughput(level, payouts=payouts, latency=latency), params))
+	return cases
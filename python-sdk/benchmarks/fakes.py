@@ -0,0 +1,133 @@
+"""In-process stand-ins for Visa, Redis and DynamoDB used by the benchmarks."""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from jwcrypto import jwe, jwk
+
+
+class FakeResponse:
+
+	__slots__ = ("content", "status_code", "headers", "_json")
+
+	def __init__(self, content: bytes, status_code: int = 200, payload: Any = None) -> None:
+		self.content = content
+		self.status_code = status_code
+		self.headers = {"content-type": "application/json"}
+		self._json = payload
+
+	def raise_for_status(self) -> None:
+		if self.status_code >= 400:
+			raise RuntimeError(f"HTTP {self.status_code}")
+
+	def json(self) -> Any:
+		return self._json
+
+
+class FakeVisaBackend:
+	"""``HttpBackend`` answering every SDK route from memory.
+
+	With ``key`` it serves that key as the JWKS and answers ``application/jose``
+	requests with a JWE, so MLE routes pay the real RSA-OAEP/AES-GCM cost.
+	``latency`` (seconds) sleeps per request to stand in for the network.
+	"""
+
+	errors = (ConnectionError,)
+
+	def __init__(self, key: Optional[jwk.JWK] = None, *, latency: float = 0.0) -> None:
+		self.key = key
+		self.latency = latency
+		self._jwks = {"keys": [json.loads(key.export())]} if key is not None else {"keys": []}
+		self._protected = json.dumps({"alg": "RSA-OAEP-256", "enc": "A256GCM", "kid": key.get("kid")}) if key is not None else None
+		self._expires = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+		self._seq = 0
+		self._lock = threading.Lock()
+
+	def get(self, url: str, *, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> FakeResponse:
+		if url.endswith("jwks") or "jwks" in url:
+			return FakeResponse(b"", payload=self._jwks)
+		return FakeResponse(b'{"status":"executed"}')
+
+	def post(self, url: str, *, data: bytes, headers: Dict[str, str]) -> FakeResponse:
+		if self.latency:
+			time.sleep(self.latency)
+		if headers.get("content-type") == "application/jose":
+			token = jwe.JWE()
+			token.deserialize(data if isinstance(data, str) else data.decode("ascii"), key=self.key)
+			body = self._answer(url, json.loads(token.payload))
+			reply = jwe.JWE(json.dumps(body).encode(), self._protected)
+			reply.add_recipient(self.key)
+			return FakeResponse(reply.serialize(compact=True).encode("ascii"))
+		return FakeResponse(json.dumps(self._answer(url, json.loads(data))).encode())
+
+	def close(self) -> None:
+		pass
+
+	def _answer(self, url: str, body: Dict[str, Any]) -> Dict[str, Any]:
+		if url.endswith("/visaaliasdirectory/v1/resolve"):
+			return {"panToken": f"tok_{body.get('alias')}"}
+		if url.endswith("/paai/v1/fundstransfer/attributes/inquiry"):
+			return {"octEligible": True}
+		if url.endswith("/pav/v1/card/validation"):
+			return {"valid": True}
+		if url.endswith("/forexrates/v1/lock"):
+			return {"quoteId": f"Q-{body['amount']['minor']}", "expiresAt": self._expires, "rate": 17.1}
+		with self._lock:
+			self._seq += 1
+			seq = self._seq
+		return {"payoutId": f"payout-{seq}", "status": "executed"}
+
+
+class FakeRedis:
+	"""The slice of redis-py used by the Redis stores (``get``/``set``/``setex``/``setnx``)."""
+
+	def __init__(self) -> None:
+		self._data: Dict[str, Any] = {}
+		self._lock = threading.Lock()
+
+	def get(self, key: str) -> Any:
+		return self._data.get(key)
+
+	def set(self, key: str, value: Any, nx: bool = False, ex: Optional[int] = None) -> bool:
+		with self._lock:
+			if nx and key in self._data:
+				return False
+			self._data[key] = value
+			return True
+
+	def setex(self, key: str, ttl: int, value: Any) -> bool:
+		return self.set(key, value, ex=ttl)
+
+	def setnx(self, key: str, value: Any) -> bool:
+		return self.set(key, value, nx=True)
+
+
+class ConditionalCheckFailed(Exception):
+
+	def __init__(self) -> None:
+		super().__init__("ConditionalCheckFailedException")
+		self.response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class FakeDynamo:
+	"""The slice of the boto3 DynamoDB client used by the Dynamo stores."""
+
+	def __init__(self) -> None:
+		self._tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+		self._lock = threading.Lock()
+
+	def get_item(self, TableName: str, Key: Dict[str, Any]) -> Dict[str, Any]:  # noqa: N803
+		item = self._tables.get(TableName, {}).get(next(iter(Key.values()))["S"])
+		return {"Item": item} if item else {}
+
+	def put_item(self, TableName: str, Item: Dict[str, Any], ConditionExpression: Optional[str] = None) -> Dict[str, Any]:  # noqa: N803
+		key = next(iter(Item.values()))["S"]
+		with self._lock:
+			table = self._tables.setdefault(TableName, {})
+			if ConditionExpression and key in table:
+				raise ConditionalCheckFailed()
+			table[key] = Item
+		return {}
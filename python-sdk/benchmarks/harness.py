@@ -0,0 +1,138 @@
+"""Timing loop, result files and the regression comparator."""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# metrics where a larger value is better; everything else is a cost
+HIGHER_IS_BETTER = frozenset({"ops_per_sec"})
+
+
+@dataclass
+class Result:
+	name: str
+	metrics: Dict[str, float]
+	params: Dict[str, Any] = field(default_factory=dict)
+
+
+def measure(fn: Callable[[], Any], *, min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+	"""Time ``fn`` in batches of at least ``min_time`` seconds; per-call ``ns_median``/``ns_min``/``ns_stdev``.
+
+	The batch size is calibrated first, and the collector is paused while timing
+	so a collection landing in one run does not skew the median.
+	"""
+	number = 1
+	while True:
+		elapsed = _run(fn, number)
+		if elapsed >= min_time / 4 or number >= 1 << 24:
+			break
+		number *= 4 if elapsed < min_time / 40 else 2
+	runs: List[float] = []
+	for _ in range(repeat):
+		runs.append(_run(fn, number) / number * 1e9)
+	return {
+		"ns_median": statistics.median(runs),
+		"ns_min": min(runs),
+		"ns_stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+		"number": number,
+	}
+
+
+def _run(fn: Callable[[], Any], number: int) -> float:
+	was_enabled = gc.isenabled()
+	gc.disable()
+	try:
+		started = time.perf_counter()
+		for _ in range(number):
+			fn()
+		return time.perf_counter() - started
+	finally:
+		if was_enabled:
+			gc.enable()
+
+
+def environment() -> Dict[str, Any]:
+	return {
+		"python": platform.python_version(),
+		"implementation": platform.python_implementation(),
+		"platform": platform.platform(),
+		"machine": platform.machine(),
+		"cpus": os.cpu_count(),
+	}
+
+
+def write_results(path: str, results: List[Result]) -> None:
+	payload = {
+		"environment": environment(),
+		"createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+		"results": {r.name: {"metrics": r.metrics, "params": r.params} for r in results},
+	}
+	directory = os.path.dirname(path)
+	if directory:
+		os.makedirs(directory, exist_ok=True)
+	with open(path, "w", encoding="utf-8") as handle:
+		json.dump(payload, handle, indent=2, sort_keys=True)
+		handle.write("\n")
+
+
+def read_results(path: str) -> Dict[str, Dict[str, float]]:
+	with open(path, "r", encoding="utf-8") as handle:
+		payload = json.load(handle)
+	return {name: entry["metrics"] for name, entry in payload["results"].items()}
+
+
+@dataclass
+class Comparison:
+	name: str
+	metric: str
+	baseline: float
+	current: float
+
+	@property
+	def change(self) -> float:
+		"""Relative slowdown: positive is worse, whichever direction the metric runs."""
+		if self.metric in HIGHER_IS_BETTER:
+			return self.baseline / self.current - 1 if self.current else float("inf")
+		return self.current / self.baseline - 1 if self.baseline else 0.0
+
+
+def compare(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]], *, metric: str = "ns_median") -> List[Comparison]:
+	"""Pair up benchmarks present in both runs on ``metric`` (``ops_per_sec`` for throughput runs)."""
+	rows = []
+	for name in sorted(set(baseline) & set(current)):
+		key = metric if metric in baseline[name] and metric in current[name] else "ops_per_sec"
+		if key in baseline[name] and key in current[name]:
+			rows.append(Comparison(name, key, baseline[name][key], current[name][key]))
+	return rows
+
+
+def report(rows: List[Comparison], *, tolerance: float, out=sys.stdout) -> int:
+	"""Print the comparison table; returns the number of regressions beyond ``tolerance``."""
+	regressions = 0
+	width = max((len(r.name) for r in rows), default=10)
+	print(f"{'benchmark':<{width}}  {'metric':<11} {'baseline':>12} {'current':>12} {'change':>8}", file=out)
+	for row in rows:
+		flag = ""
+		if row.change > tolerance:
+			flag = "  REGRESSION"
+			regressions += 1
+		elif row.change < -tolerance:
+			flag = "  faster"
+		print(f"{row.name:<{width}}  {row.metric:<11} {_fmt(row.baseline):>12} {_fmt(row.current):>12} {row.change:>+8.1%}{flag}", file=out)
+	return regressions
+
+
+def _fmt(value: Optional[float]) -> str:
+	if value is None:
+		return "-"
+	if value >= 1e6:
+		return f"{value / 1e6:.2f}M"
+	if value >= 1e3:
+		return f"{value / 1e3:.2f}k"
+	return f"{value:.1f}"
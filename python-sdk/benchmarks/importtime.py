@@ -0,0 +1,119 @@
+"""Cold import cost of the SDK, measured with ``python -X importtime``.
+
+    cd python-sdk
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --statement "from visa_direct_sdk import VisaDirectClient" --top 20
+
+Each statement runs in a fresh interpreter; the cost is the cumulative time
+of the top-level ``visa_direct_sdk`` imports it triggers, so interpreter
+startup is excluded. The command also checks that none of ``HEAVY`` is
+loaded by the light statements and exits 1 if one is. ``python -m benchmarks
+run`` records the same statements as ``import.*`` results, so the baseline
+comparison catches import-time regressions too.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+SDK_ROOT = Path(__file__).resolve().parents[1]
+
+# statements a deployment with in-memory stores and tracing off runs at cold start;
+# a bare ``import visa_direct_sdk`` loads no submodules and is guarded by
+# tests/test_import_time.py instead (it is too small to time reliably)
+STATEMENTS: Dict[str, str] = {
+	"import.orchestrator": "from visa_direct_sdk import Orchestrator, InMemoryIdempotencyStore, InMemoryReceiptStore",
+	"import.client": "from visa_direct_sdk import VisaDirectClient, VisaDirectClientConfig",
+}
+
+# dependencies that must only load when the feature needing them is used
+HEAVY = ("requests", "urllib3", "jwcrypto", "cryptography", "opentelemetry", "boto3", "botocore", "redis", "httpx", "numpy")
+
+
+class ImportRecord(NamedTuple):
+	name: str
+	depth: int
+	self_us: int
+	cumulative_us: int
+
+
+def parse(stderr: str) -> List[ImportRecord]:
+	"""Records of ``-X importtime`` output, in the order Python printed them."""
+	records = []
+	for line in stderr.splitlines():
+		if not line.startswith("import time:"):
+			continue
+		parts = line[len("import time:"):].split("|")
+		if len(parts) != 3 or not parts[0].strip().isdigit():
+			continue
+		raw = parts[2].rstrip()
+		name = raw.lstrip()
+		# one leading space, then two per nesting level
+		records.append(ImportRecord(name, (len(raw) - len(name) - 1) // 2, int(parts[0]), int(parts[1])))
+	return records
+
+
+def run_statement(statement: str) -> List[ImportRecord]:
+	env = dict(os.environ, OTEL_DISABLED="1")
+	env.pop("PYTHONPROFILEIMPORTTIME", None)
+	proc = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", statement],
+		cwd=str(SDK_ROOT),
+		env=env,
+		capture_output=True,
+		text=True,
+		check=False,
+	)
+	if proc.returncode != 0:
+		raise RuntimeError(f"{statement!r} failed:\n{proc.stderr[-2000:]}")
+	return parse(proc.stderr)
+
+
+def sdk_cost_us(records: Sequence[ImportRecord]) -> int:
+	"""Cumulative microseconds of the top-level SDK imports (their dependencies are nested under them)."""
+	return sum(r.cumulative_us for r in records if r.depth == 0 and r.name.split(".")[0] == "visa_direct_sdk")
+
+
+def heavy_modules(records: Sequence[ImportRecord]) -> List[str]:
+	return sorted({r.name.split(".")[0] for r in records if r.name.split(".")[0] in HEAVY})
+
+
+def measure_statement(statement: str, *, repeat: int = 5) -> Dict[str, float]:
+	"""Median cold import cost over ``repeat`` fresh interpreters, in the suite's ``ns_*`` units."""
+	runs = [sdk_cost_us(run_statement(statement)) * 1000 for _ in range(repeat)]
+	return {
+		"ns_median": statistics.median(runs),
+		"ns_min": min(runs),
+		"ns_stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+		"number": 1,
+	}
+
+
+def main(argv: Optional[list] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime", description="Cold import cost of the SDK.")
+	parser.add_argument("--statement", action="append", help="statement to time (repeatable); defaults to the built-in set")
+	parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per statement")
+	parser.add_argument("--top", type=int, default=15, help="slowest modules to list per statement, by self time")
+	args = parser.parse_args(argv)
+
+	statements = {s: s for s in args.statement} if args.statement else STATEMENTS
+	failures = 0
+	for label, statement in statements.items():
+		metrics = measure_statement(statement, repeat=args.repeat)
+		records = run_statement(statement)
+		heavy = heavy_modules(records)
+		print(f"{label:<22} {metrics['ns_median'] / 1e6:>8.1f} ms  (±{metrics['ns_stdev'] / 1e6:.1f})  {statement}")
+		if heavy:
+			print(f"{'':<22} loads {', '.join(heavy)}")
+			failures += label in STATEMENTS
+		for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:args.top]:
+			print(f"{'':<22} {record.self_us / 1000:>8.2f} ms self  {record.cumulative_us / 1000:>8.2f} ms cum  {record.name}")
+	return 1 if failures else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,401 @@
+"""Load generator: drives VisaDirectClient against the local simulator.
+
+    cd python-sdk
+    python -m benchmarks.loadgen --spawn-simulator --mode open --rate 200 --duration 30
+    python -m benchmarks.loadgen --mode closed --concurrency 32 --duration 30 --json out.json
+
+``open`` mode issues payouts on a fixed (or ``--poisson``) arrival schedule
+whatever the response times, on a pool of ``--concurrency`` workers. Latency
+is measured from each payout's *intended* start, so time spent queued behind
+slow responses is counted (coordinated-omission correction); the raw service
+time is reported alongside. ``closed`` mode runs ``--concurrency`` workers
+back to back (with optional ``--think-ms``), which measures capacity but, by
+construction, hides queueing.
+
+The payout mix is set with ``--mix CARD=50,ACCOUNT=20,WALLET=15,ALIAS=15``,
+``--fx-share`` routes that fraction through an FX-locked corridor from
+``--corridors``, and ALIAS payouts draw from ``--alias-pool`` recurring
+aliases so alias-cache hit rates resemble production reuse.
+
+The simulator serves ``/jwks`` and answers MLE routes with JWEs, so the run
+pays the real RSA-OAEP/AES-GCM cost. ``--rotate-every`` rotates its key during
+the run; each rotation should cost one kid miss and one JWKS refresh per client.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from visa_direct_sdk.utils.metrics import LatencyHistogram, get_metrics
+
+SIMULATOR = Path(__file__).resolve().parents[2] / "simulator" / "app.py"
+QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+# (source country, target country, source currency, target currency) from the default corridor policy
+CORRIDORS: Dict[str, Tuple[str, str, str, str]] = {
+	"US-MX": ("US", "MX", "USD", "MXN"),
+	"GB-IN": ("GB", "IN", "GBP", "INR"),
+	"GB-EU": ("GB", "EU", "GBP", "EUR"),
+}
+
+
+class PayoutMix:
+	"""Generates payout request dicts in the configured destination mix."""
+
+	def __init__(
+		self,
+		weights: Dict[str, float],
+		*,
+		fx_share: float = 0.0,
+		corridors: Sequence[str] = ("US-MX",),
+		alias_pool: int = 1000,
+		seed: Optional[int] = None,
+	) -> None:
+		self.types = list(weights)
+		self.weights = [weights[t] for t in self.types]
+		self.fx_share = fx_share
+		self.corridors = [CORRIDORS[c] for c in corridors]
+		self.alias_pool = alias_pool
+		self._random = random.Random(seed)
+		self._seq = itertools.count()
+		self._run = f"{os.getpid()}-{int(time.time())}"
+		self._lock = threading.Lock()
+
+	def next(self) -> Dict[str, Any]:
+		with self._lock:
+			n = next(self._seq)
+			rnd = self._random
+			fx = rnd.random() < self.fx_share
+			dtype = "CARD" if fx else rnd.choices(self.types, self.weights)[0]
+			alias_n = rnd.randrange(self.alias_pool)
+			corridor = rnd.choice(self.corridors) if fx else None
+			# the simulator executes odd amounts and fails even ones
+			minor = rnd.randrange(500, 50000) | 1
+		if dtype == "CARD":
+			destination = {"type": "CARD", "panToken": f"tok_{n % 9973:06d}1"}
+		elif dtype == "ACCOUNT":
+			destination = {"type": "ACCOUNT", "accountId": f"acct-{n % 9973}"}
+		elif dtype == "WALLET":
+			destination = {"type": "WALLET", "walletId": f"wallet-{n % 9973}"}
+		else:
+			destination = {"type": "ALIAS", "alias": f"payee{alias_n}@example.com", "aliasType": "EMAIL"}
+		request: Dict[str, Any] = {
+			"originatorId": "loadgen",
+			"idempotencyKey": f"lg-{self._run}-{n}",
+			"funding": {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": f"lg-ledger-{n}"},
+			"destination": destination,
+			"amount": {"currency": "USD", "minor": minor},
+		}
+		if corridor is not None:
+			src_country, dst_country, src_currency, dst_currency = corridor
+			request["amount"]["currency"] = dst_currency
+			request["preflight"] = {
+				"fxLock": {"srcCurrency": src_currency, "dstCurrency": dst_currency},
+				"corridor": {"sourceCountry": src_country, "targetCountry": dst_country, "sourceCurrency": src_currency, "targetCurrency": dst_currency},
+			}
+		return request
+
+
+@dataclass
+class LoadReport:
+	mode: str
+	duration: float = 0.0
+	sent: int = 0
+	completed: int = 0
+	dropped: int = 0
+	errors: Dict[str, int] = field(default_factory=dict)
+	statuses: Dict[str, int] = field(default_factory=dict)
+	latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+	service: LatencyHistogram = field(default_factory=LatencyHistogram)
+	_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+	def record(self, intended: float, started: float, finished: float, result: Any = None, error: Optional[BaseException] = None) -> None:
+		self.latency.record(int((finished - intended) * 1e6))
+		self.service.record(int((finished - started) * 1e6))
+		with self._lock:
+			self.completed += 1
+			if error is not None:
+				name = _error_name(error)
+				self.errors[name] = self.errors.get(name, 0) + 1
+			else:
+				status = str(result.get("status")) if isinstance(result, dict) else "ok"
+				self.statuses[status] = self.statuses.get(status, 0) + 1
+
+	@property
+	def throughput(self) -> float:
+		return self.completed / self.duration if self.duration else 0.0
+
+	def as_dict(self) -> Dict[str, Any]:
+		def millis(histogram: LatencyHistogram) -> Dict[str, float]:
+			values = {f"p{q * 100:g}": micros / 1000 for q, micros in histogram.percentiles(QUANTILES).items()}
+			values["max"] = histogram.max_micros / 1000
+			values["mean"] = histogram.total_micros / histogram.count / 1000 if histogram.count else 0.0
+			return values
+
+		return {
+			"mode": self.mode,
+			"durationSeconds": round(self.duration, 3),
+			"sent": self.sent,
+			"completed": self.completed,
+			"dropped": self.dropped,
+			"throughputPerSecond": round(self.throughput, 1),
+			"errors": dict(sorted(self.errors.items())),
+			"statuses": dict(sorted(self.statuses.items())),
+			"latencyMs": millis(self.latency),
+			"serviceTimeMs": millis(self.service),
+		}
+
+
+def _error_name(error: BaseException) -> str:
+	response = getattr(error, "response", None)
+	status_code = getattr(response, "status_code", None)
+	if status_code is not None:
+		return f"{type(error).__name__}:{status_code}"
+	return type(error).__name__
+
+
+def _call(payout: Callable[[Dict[str, Any]], Any], request: Dict[str, Any], intended: float, report: LoadReport) -> None:
+	started = time.perf_counter()
+	try:
+		result = payout(request)
+	except Exception as exc:  # noqa: BLE001 - every failure is part of the report
+		report.record(intended, started, time.perf_counter(), error=exc)
+	else:
+		report.record(intended, started, time.perf_counter(), result=result)
+
+
+def run_open_loop(
+	payout: Callable[[Dict[str, Any]], Any],
+	mix: PayoutMix,
+	*,
+	rate: float,
+	duration: float,
+	concurrency: int = 64,
+	poisson: bool = False,
+	max_outstanding: int = 10000,
+	seed: Optional[int] = None,
+) -> LoadReport:
+	"""Issue payouts at ``rate``/s for ``duration`` seconds, latency measured from the intended start."""
+	report = LoadReport("open")
+	rnd = random.Random(seed)
+	outstanding = threading.Semaphore(max_outstanding)
+
+	def task(request: Dict[str, Any], intended: float) -> None:
+		try:
+			_call(payout, request, intended, report)
+		finally:
+			outstanding.release()
+
+	with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadgen") as pool:
+		start = time.perf_counter()
+		intended = start
+		end = start + duration
+		while intended < end:
+			delay = intended - time.perf_counter()
+			if delay > 0:
+				time.sleep(delay)
+			request = mix.next()
+			report.sent += 1
+			if outstanding.acquire(blocking=False):
+				pool.submit(task, request, intended)
+			else:
+				# the backlog is already max_outstanding deep; count it rather than grow without bound
+				report.dropped += 1
+			intended += rnd.expovariate(rate) if poisson else 1.0 / rate
+	report.duration = time.perf_counter() - start
+	return report
+
+
+def run_closed_loop(
+	payout: Callable[[Dict[str, Any]], Any],
+	mix: PayoutMix,
+	*,
+	concurrency: int,
+	duration: float,
+	think_time: float = 0.0,
+) -> LoadReport:
+	"""``concurrency`` workers each issue the next payout as soon as the previous one returns."""
+	report = LoadReport("closed")
+	start = time.perf_counter()
+	end = start + duration
+	lock = threading.Lock()
+
+	def worker() -> None:
+		while time.perf_counter() < end:
+			request = mix.next()
+			with lock:
+				report.sent += 1
+			issued = time.perf_counter()
+			_call(payout, request, issued, report)
+			if think_time:
+				time.sleep(think_time)
+
+	threads = [threading.Thread(target=worker, name=f"loadgen-{i}", daemon=True) for i in range(concurrency)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	report.duration = time.perf_counter() - start
+	return report
+
+
+def format_report(report: LoadReport) -> str:
+	data = report.as_dict()
+	lines = [
+		f"mode={data['mode']} duration={data['durationSeconds']}s sent={data['sent']} completed={data['completed']} dropped={data['dropped']} throughput={data['throughputPerSecond']}/s",
+		"            " + " ".join(f"{k:>9}" for k in data["latencyMs"]),
+	]
+	for label, key in (("latency ms", "latencyMs"), ("service ms", "serviceTimeMs")):
+		lines.append(f"{label:<12}" + " ".join(f"{v:>9.2f}" for v in data[key].values()))
+	lines.append("statuses: " + (", ".join(f"{k}={v}" for k, v in data["statuses"].items()) or "-"))
+	lines.append("errors:   " + (", ".join(f"{k}={v}" for k, v in data["errors"].items()) or "-"))
+	return "\n".join(lines)
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+	weights = {}
+	for part in text.split(","):
+		name, _, weight = part.partition("=")
+		name = name.strip().upper()
+		if name not in ("CARD", "ACCOUNT", "WALLET", "ALIAS"):
+			raise argparse.ArgumentTypeError(f"unknown destination type {name}")
+		weights[name] = float(weight or 1)
+	return weights
+
+
+def mle_counts() -> Dict[str, int]:
+	"""JWKS fetches and kid misses recorded by the SDK so far."""
+	counts = {"jwksFetches": 0, "kidMisses": 0}
+	for (name, _labels), value in get_metrics().counters().items():
+		if name == "visa_sdk_jwks_fetches_total":
+			counts["jwksFetches"] += int(value)
+		elif name == "visa_sdk_jwe_kid_miss_total":
+			counts["kidMisses"] += int(value)
+	return counts
+
+
+def _rotate_keys(base_url: str, every: float, stop: threading.Event, rotations: List[str]) -> None:
+	while not stop.wait(every):
+		request = urllib.request.Request(f"{base_url.rstrip('/')}/__sim/jwks/rotate", data=b"", method="POST")
+		with urllib.request.urlopen(request, timeout=30) as response:
+			rotations.append(json.loads(response.read())["kid"])
+
+
+def _wait_for_port(host: str, port: int, timeout: float) -> None:
+	deadline = time.monotonic() + timeout
+	while time.monotonic() < deadline:
+		try:
+			with socket.create_connection((host, port), timeout=0.5):
+				return
+		except OSError:
+			time.sleep(0.1)
+	raise RuntimeError(f"simulator did not start listening on {host}:{port}")
+
+
+def start_simulator(base_url: str, extra_args: str = "") -> subprocess.Popen:
+	"""Run ``simulator/app.py`` on the host and port of ``base_url``; returns once it is listening."""
+	host_port = base_url.split("//", 1)[-1].split("/", 1)[0]
+	host, _, port = host_port.partition(":")
+	args = [sys.executable, str(SIMULATOR), "--host", host, "--port", port or "80", *extra_args.split()]
+	simulator = subprocess.Popen(args, cwd=str(SIMULATOR.parent))
+	try:
+		_wait_for_port(host, int(port or 80), 15.0)
+	except RuntimeError:
+		simulator.terminate()
+		raise
+	return simulator
+
+
+def stop_simulator(simulator: Optional[subprocess.Popen]) -> None:
+	if simulator is not None:
+		simulator.terminate()
+		simulator.wait(timeout=10)
+
+
+def main(argv: Optional[list] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen", description="Drive VisaDirectClient against the local simulator.")
+	parser.add_argument("--base-url", default="http://127.0.0.1:8766")
+	parser.add_argument("--spawn-simulator", action="store_true", help=f"start {SIMULATOR.relative_to(SIMULATOR.parents[1])} for the run")
+	parser.add_argument("--simulator-args", default="", help="extra arguments for the spawned simulator")
+	parser.add_argument("--mode", choices=("open", "closed"), default="open")
+	parser.add_argument("--rate", type=float, default=100.0, help="open loop: payouts per second")
+	parser.add_argument("--poisson", action="store_true", help="open loop: exponential inter-arrival times")
+	parser.add_argument("--concurrency", type=int, default=32, help="worker threads (closed loop: in-flight payouts)")
+	parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+	parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unrecorded load first")
+	parser.add_argument("--think-ms", type=float, default=0.0, help="closed loop: pause between a worker's payouts")
+	parser.add_argument("--max-outstanding", type=int, default=10000, help="open loop: backlog beyond which arrivals are dropped")
+	parser.add_argument("--mix", type=_parse_mix, default=_parse_mix("CARD=50,ACCOUNT=20,WALLET=15,ALIAS=15"))
+	parser.add_argument("--fx-share", type=float, default=0.2, help="fraction of payouts through an FX-locked corridor")
+	parser.add_argument("--corridors", default="US-MX,GB-IN,GB-EU", help=f"FX corridors, from {', '.join(CORRIDORS)}")
+	parser.add_argument("--alias-pool", type=int, default=1000, help="distinct recurring aliases")
+	parser.add_argument("--seed", type=int)
+	parser.add_argument("--rotate-every", type=float, default=0.0, help="rotate the simulator's MLE key every N seconds of the measured run")
+	parser.add_argument("--json", help="also write the report as JSON here")
+	parser.add_argument("--record", metavar="JSONL", help="record the measured run with TrafficRecorder (replay with benchmarks.replay)")
+	args = parser.parse_args(argv)
+
+	# the simulator plays the JWKS host too; started with --no-mle it serves none and the SDK falls back to plain JSON in dev mode
+	os.environ.setdefault("VISA_JWKS_URL", f"{args.base_url.rstrip('/')}/jwks")
+	os.environ.setdefault("OTEL_DISABLED", "1")
+	simulator = start_simulator(args.base_url, args.simulator_args) if args.spawn_simulator else None
+	try:
+		from visa_direct_sdk.client import VisaDirectClient, VisaDirectClientConfig
+		from visa_direct_sdk.utils.recording import TrafficRecorder
+
+		client = VisaDirectClient(VisaDirectClientConfig(base_url=args.base_url))
+		payout = client.orchestrator.payout
+		mix = PayoutMix(args.mix, fx_share=args.fx_share, corridors=[c.strip() for c in args.corridors.split(",") if c.strip()], alias_pool=args.alias_pool, seed=args.seed)
+
+		def run(duration: float) -> LoadReport:
+			if args.mode == "open":
+				return run_open_loop(payout, mix, rate=args.rate, duration=duration, concurrency=args.concurrency, poisson=args.poisson, max_outstanding=args.max_outstanding, seed=args.seed)
+			return run_closed_loop(payout, mix, concurrency=args.concurrency, duration=duration, think_time=args.think_ms / 1000)
+
+		if args.warmup > 0:
+			run(args.warmup)
+		recorder = TrafficRecorder(args.record) if args.record else None
+		client.orchestrator.recorder = client.http_client.recorder = recorder
+		before = mle_counts()
+		stop = threading.Event()
+		rotations: List[str] = []
+		rotator = None
+		if args.rotate_every > 0:
+			rotator = threading.Thread(target=_rotate_keys, args=(args.base_url, args.rotate_every, stop, rotations), daemon=True)
+			rotator.start()
+		try:
+			report = run(args.duration)
+		finally:
+			stop.set()
+			if rotator is not None:
+				rotator.join()
+			if recorder is not None:
+				recorder.close()
+		mle = {key: value - before[key] for key, value in mle_counts().items()}
+		mle["rotations"] = len(rotations)
+		print(format_report(report))
+		print("mle:      " + ", ".join(f"{k}={v}" for k, v in mle.items()))
+		if args.json:
+			with open(args.json, "w", encoding="utf-8") as handle:
+				json.dump({**report.as_dict(), "mle": mle}, handle, indent=2)
+				handle.write("\n")
+		client.close()
+	finally:
+		stop_simulator(simulator)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,201 @@
+"""Replays a TrafficRecorder JSONL recording against the local simulator.
+
+    cd python-sdk
+    python -m benchmarks.replay traffic.jsonl --spawn-simulator
+    python -m benchmarks.replay traffic.jsonl --speed 10 --json replay.json
+
+Every ``payout`` record becomes a synthetic request issued at its recorded
+arrival offset divided by ``--speed``. Each redacted reference maps to one
+synthetic value, so idempotency-key retries, recurring aliases and cards, and
+reused receipts recur exactly as they did in the recording. The burst pattern
+is kept too. Recorded ``executed``/``approved`` outcomes get odd amounts and
+failures get even ones, so the simulator reproduces the outcome mix. Latency
+is measured from the intended start, as in the open-loop load generator.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from visa_direct_sdk.utils.metrics import LatencyHistogram
+
+from .loadgen import QUANTILES, LoadReport, _call, format_report, start_simulator, stop_simulator
+
+_FAILED = frozenset({"failed", "declined"})
+
+
+def load_recording(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+	"""Header and ``payout`` records of a recording, in arrival order."""
+	header: Dict[str, Any] = {}
+	payouts: List[Dict[str, Any]] = []
+	with open(path, "r", encoding="utf-8") as handle:
+		for line in handle:
+			line = line.strip()
+			if not line:
+				continue
+			record = json.loads(line)
+			kind = record.get("type")
+			if kind == "header" and not header:
+				header = record
+			elif kind == "payout":
+				payouts.append(record)
+	payouts.sort(key=lambda r: r["t"])
+	return header, payouts
+
+
+def _amount_minor(record: Dict[str, Any]) -> int:
+	digits = max(1, int(record.get("amountDigits", 4)))
+	base = 10 ** (digits - 1) if digits > 1 else 2
+	return base if record.get("status") in _FAILED else base + 1
+
+
+def to_request(record: Dict[str, Any], run: str) -> Dict[str, Any]:
+	"""A payout request with the shape of ``record``; the same reference always yields the same value."""
+	ref = record.get("destinationRef") or "none"
+	dtype = record["destination"]
+	if dtype == "CARD":
+		destination = {"type": "CARD", "panToken": f"tok_{ref}"}
+	elif dtype == "ACCOUNT":
+		destination = {"type": "ACCOUNT", "accountId": f"acct-{ref}"}
+	elif dtype == "WALLET":
+		destination = {"type": "WALLET", "walletId": f"wallet-{ref}"}
+	else:
+		destination = {"type": "ALIAS", "alias": f"{ref}@replay.invalid", "aliasType": record.get("aliasType", "EMAIL")}
+
+	funding_ref = f"rp-{run}-{record.get('fundingRef') or record['key']}"
+	ftype = record["funding"]
+	if ftype == "AFT":
+		funding = {"type": "AFT", "receiptId": funding_ref, "status": record.get("fundingStatus") or "approved"}
+	elif ftype == "PIS":
+		funding = {"type": "PIS", "paymentId": funding_ref, "status": record.get("fundingStatus") or "executed"}
+	else:
+		funding = {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": funding_ref}
+
+	request: Dict[str, Any] = {
+		"originatorId": f"rp-{record.get('originator') or 'unknown'}",
+		"idempotencyKey": f"rp-{run}-{record['key']}",
+		"funding": funding,
+		"destination": destination,
+		"amount": {"currency": record.get("currency", "USD"), "minor": _amount_minor(record)},
+	}
+	preflight: Dict[str, Any] = {}
+	if record.get("fx"):
+		preflight["fxLock"] = {"srcCurrency": record["fx"]["src"], "dstCurrency": record["fx"]["dst"]}
+	if record.get("corridor"):
+		preflight["corridor"] = record["corridor"]
+	if preflight:
+		request["preflight"] = preflight
+	return request
+
+
+def summarize(payouts: List[Dict[str, Any]]) -> Dict[str, Any]:
+	"""Shape of a recording: span, rate, key and destination reuse, recorded latency."""
+	if not payouts:
+		return {"payouts": 0}
+	span = payouts[-1]["t"] - payouts[0]["t"]
+	durations = LatencyHistogram()
+	destinations: Dict[str, int] = {}
+	for record in payouts:
+		durations.record(int(record.get("durationMs", 0) * 1000))
+		destinations[record["destination"]] = destinations.get(record["destination"], 0) + 1
+	keys = {r["key"] for r in payouts}
+	refs = {(r["destination"], r.get("destinationRef")) for r in payouts}
+	return {
+		"payouts": len(payouts),
+		"spanSeconds": round(span, 3),
+		"ratePerSecond": round(len(payouts) / span, 1) if span else None,
+		"keyReuse": round(1 - len(keys) / len(payouts), 4),
+		"destinationReuse": round(1 - len(refs) / len(payouts), 4),
+		"destinations": dict(sorted(destinations.items())),
+		"durationMs": {f"p{q * 100:g}": micros / 1000 for q, micros in durations.percentiles(QUANTILES).items()},
+	}
+
+
+def replay(
+	payout: Callable[[Dict[str, Any]], Any],
+	payouts: Iterable[Dict[str, Any]],
+	*,
+	speed: float = 1.0,
+	concurrency: int = 64,
+	max_outstanding: int = 10000,
+	run: Optional[str] = None,
+) -> LoadReport:
+	"""Issue each recorded payout at ``t / speed`` after the first, latency measured from that intended start."""
+	if speed <= 0:
+		raise ValueError("speed must be positive")
+	run = run or f"{os.getpid()}-{int(time.time())}"
+	report = LoadReport("replay")
+	outstanding = threading.Semaphore(max_outstanding)
+
+	def task(request: Dict[str, Any], intended: float) -> None:
+		try:
+			_call(payout, request, intended, report)
+		finally:
+			outstanding.release()
+
+	with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="replay") as pool:
+		start = time.perf_counter()
+		origin: Optional[float] = None
+		for record in payouts:
+			if origin is None:
+				origin = record["t"]
+			intended = start + (record["t"] - origin) / speed
+			delay = intended - time.perf_counter()
+			if delay > 0:
+				time.sleep(delay)
+			request = to_request(record, run)
+			report.sent += 1
+			if outstanding.acquire(blocking=False):
+				pool.submit(task, request, intended)
+			else:
+				report.dropped += 1
+	report.duration = time.perf_counter() - start
+	return report
+
+
+def main(argv: Optional[list] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m benchmarks.replay", description="Replay a recorded traffic shape against the local simulator.")
+	parser.add_argument("recording", help="JSONL written by TrafficRecorder")
+	parser.add_argument("--base-url", default="http://127.0.0.1:8766")
+	parser.add_argument("--spawn-simulator", action="store_true", help="start simulator/app.py for the run")
+	parser.add_argument("--simulator-args", default="", help="extra arguments for the spawned simulator")
+	parser.add_argument("--speed", type=float, default=1.0, help="time compression: 10 replays an hour in six minutes")
+	parser.add_argument("--concurrency", type=int, default=64, help="worker threads")
+	parser.add_argument("--max-outstanding", type=int, default=10000, help="backlog beyond which arrivals are dropped")
+	parser.add_argument("--limit", type=int, help="replay only the first N payouts")
+	parser.add_argument("--json", help="also write the report as JSON here")
+	args = parser.parse_args(argv)
+
+	header, payouts = load_recording(args.recording)
+	if args.limit:
+		payouts = payouts[:args.limit]
+	recorded = summarize(payouts)
+	print(f"recording: version={header.get('version')} startedAt={header.get('startedAt')} sampleRate={header.get('sampleRate')}")
+	print("recorded:  " + ", ".join(f"{k}={v}" for k, v in recorded.items()))
+
+	os.environ.setdefault("VISA_JWKS_URL", f"{args.base_url.rstrip('/')}/jwks")
+	os.environ.setdefault("OTEL_DISABLED", "1")
+	simulator = start_simulator(args.base_url, args.simulator_args) if args.spawn_simulator else None
+	try:
+		from visa_direct_sdk.client import VisaDirectClient, VisaDirectClientConfig
+
+		client = VisaDirectClient(VisaDirectClientConfig(base_url=args.base_url))
+		report = replay(client.orchestrator.payout, payouts, speed=args.speed, concurrency=args.concurrency, max_outstanding=args.max_outstanding)
+		print(format_report(report))
+		if args.json:
+			with open(args.json, "w", encoding="utf-8") as handle:
+				json.dump({**report.as_dict(), "speed": args.speed, "recorded": recorded}, handle, indent=2)
+				handle.write("\n")
+		client.close()
+	finally:
+		stop_simulator(simulator)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
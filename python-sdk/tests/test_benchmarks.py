@@ -0,0 +1,24 @@
+import io
+
+from benchmarks.__main__ import main
+from benchmarks.harness import compare, read_results, report
+
+
+def test_comparator_flags_regressions_in_either_direction() -> None:
+	baseline = {"payout": {"ns_median": 100.0}, "throughput": {"ops_per_sec": 1000.0}, "gone": {"ns_median": 1.0}}
+	current = {"payout": {"ns_median": 130.0}, "throughput": {"ops_per_sec": 700.0}, "new": {"ns_median": 1.0}}
+	rows = compare(baseline, current)
+	assert [(r.name, r.metric) for r in rows] == [("payout", "ns_median"), ("throughput", "ops_per_sec")]
+	assert round(rows[0].change, 2) == 0.30 and round(rows[1].change, 2) == 0.43
+	out = io.StringIO()
+	assert report(rows, tolerance=0.5, out=out) == 0
+	assert report(rows, tolerance=0.2, out=out) == 2
+
+
+def test_run_writes_results_and_compares(tmp_path) -> None:
+	path = str(tmp_path / "run.json")
+	assert main(["run", "--quick", "--no-macro", "--filter", r"^(cache\.inmemory\.get_hit|payout\.INTERNAL\.CARD)$", "--out", path]) == 0
+	results = read_results(path)
+	assert set(results) == {"cache.inmemory.get_hit", "payout.INTERNAL.CARD"}
+	assert results["payout.INTERNAL.CARD"]["ns_median"] > 0
+	assert main(["compare", path, path, "--tolerance", "0"]) == 0
@@ -0,0 +1,38 @@
+import pytest
+
+from visa_direct_sdk.policy import bulk
+from visa_direct_sdk.policy.corridor_policy import compile_policy, load_policy
+
+ROWS = [
+	{"sourceCountry": "GB", "targetCountry": "IN", "sourceCurrency": "GBP", "targetCurrency": "INR", "destinationType": "CARD", "amountMinor": "1000", "fxLock": "true"},
+	{"sourceCountry": "GB", "targetCountry": "IN", "sourceCurrency": "GBP", "targetCurrency": "INR", "destinationType": "WALLET", "amountMinor": "1000", "fxLock": ""},
+	{"sourceCountry": "GB", "targetCountry": "IN", "sourceCurrency": "GBP", "targetCurrency": "INR", "destinationType": "ACCOUNT", "amountMinor": "5000001", "fxLock": "1"},
+	{"sourceCountry": "US", "targetCountry": "MX", "sourceCurrency": "USD", "targetCurrency": "MXN", "destinationType": "ALIAS", "amountMinor": "7", "fxLock": True},
+	{"sourceCountry": "FR", "targetCountry": "DE", "destinationType": "CARD", "amountMinor": "1"},
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def columnar_backend(request, monkeypatch):
+	if request.param == "numpy":
+		pytest.importorskip("numpy")
+	else:
+		monkeypatch.setattr(bulk, "np", None)
+	return request.param
+
+
+def test_bulk_validation_returns_mask_and_reason_codes(columnar_backend) -> None:
+	result = bulk.validate_rows(ROWS, compile_policy(load_policy()))
+	assert [bool(v) for v in result.valid] == [True, False, False, True, False]
+	assert result.reason_names(1) == ["DESTINATION_NOT_ALLOWED", "FX_LOCK_REQUIRED"]
+	assert result.reason_names(2) == ["MAX_VALUE_EXCEEDED"]
+	assert result.reason_names(4) == ["NO_CORRIDOR"]
+	assert result.rejected_rows() == [1, 2, 4]
+
+
+def test_unparseable_rows_are_rejected_without_aborting_the_file(columnar_backend) -> None:
+	rows = [ROWS[0], {**ROWS[0], "amountMinor": "12.5"}, {"targetCountry": "IN", "amountMinor": "1"}, {**ROWS[0], "sourceCountry": ""}, ROWS[3]]
+	result = bulk.validate_rows(rows, compile_policy(load_policy()))
+	assert [bool(v) for v in result.valid] == [True, False, False, False, True]
+	assert [result.reason_names(i) for i in (1, 2, 3)] == [["MALFORMED_ROW"]] * 3
+	assert result.rejected_rows() == [1, 2, 3]
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.dx.builder import PayoutBuilder
+from visa_direct_sdk.errors import DestinationNotAllowedError, QuoteRequiredError
+from visa_direct_sdk.policy.corridor_policy import (
+	Corridor,
+	CorridorRules,
+	Policy,
+	PolicyNotFoundError,
+	compile_policy,
+	get_rules,
+)
+
+
+def make_policy() -> Policy:
+	return Policy(version="2.0.0", corridors=[
+		Corridor("GB", "IN", {"source": "GBP", "target": "INR"}, CorridorRules(fx={"lockRequired": True}, rails={"allowedDestinations": ["card"]})),
+		Corridor("GB", "IN", {"target": "INR"}, CorridorRules(rails={"allowedDestinations": ["account"]})),
+		Corridor("GB", "IN", None, CorridorRules(limits={"maxValueMinor": 100, "dailyCountMax": 3})),
+	])
+
+
+def test_lookup_prefers_exact_currencies_then_wildcards() -> None:
+	compiled = compile_policy(make_policy())
+	assert compiled.lookup("GB", "IN", "GBP", "INR").fx_lock_required is True
+	assert compiled.lookup("GB", "IN", "USD", "INR").allowed_destinations == frozenset({"account"})
+	fallback = compiled.lookup("GB", "IN", "USD", "USD")
+	assert (fallback.max_value_minor, fallback.daily_count_max, fallback.allowed_destinations) == (100, 3, None)
+	with pytest.raises(PolicyNotFoundError):
+		compiled.lookup("US", "IN", "USD", "INR")
+
+
+def test_get_rules_keeps_returning_corridor_rules() -> None:
+	policy = make_policy()
+	rules = get_rules(policy, source_country="GB", target_country="IN", source_currency="GBP", target_currency="INR")
+	assert rules.rails == {"allowedDestinations": ["card"]}
+	assert compile_policy(policy) is policy.compiled
+
+
+def test_compiled_rules_checks() -> None:
+	rules = compile_policy(make_policy()).lookup("GB", "IN", "GBP", "INR")
+	rules.check_destination("card", "GB->IN")
+	with pytest.raises(DestinationNotAllowedError):
+		rules.check_destination("wallet", "GB->IN")
+	with pytest.raises(QuoteRequiredError):
+		rules.check_fx_lock(False)
+
+
+class QuotingHttpClient:
+
+	def post(self, path, data, headers=None):  # noqa: ANN001
+		if path == "/forexrates/v1/lock":
+			expires = (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()
+			return ({"quoteId": "Q-1", "expiresAt": expires}, 200, {})
+		return ({"payoutId": "p-1", "status": "executed", "fxQuoteId": data["fxQuoteId"]}, 200, {})
+
+
+def test_builder_resolves_corridor_once_for_orchestrator() -> None:
+	orch = Orchestrator(QuotingHttpClient())
+	orch._resolve_corridor_rules = lambda corridor: pytest.fail("corridor resolved twice")
+	result = PayoutBuilder(orch) \
+		.for_originator("fi-001") \
+		.with_funding_internal(True, "conf-1") \
+		.to_card_direct("tok_pan_1") \
+		.for_amount("MXN", 501) \
+		.with_quote_lock("USD", "MXN") \
+		.for_corridor("US", "MX") \
+		.with_idempotency_key("corridor-1") \
+		.execute()
+	assert result["fxQuoteId"] == "Q-1"
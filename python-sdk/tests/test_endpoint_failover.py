@@ -0,0 +1,112 @@
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from visa_direct_sdk.transport.endpoint_pool import EndpointPool
+from visa_direct_sdk.transport.secure_http_client import SecureHttpClient
+
+ENDPOINTS = str(Path(__file__).resolve().parents[2] / "endpoints" / "endpoints.json")
+
+
+def start_stand_in(status: int) -> ThreadingHTTPServer:
+
+	class Handler(BaseHTTPRequestHandler):
+
+		def do_POST(self) -> None:  # noqa: N802
+			self.rfile.read(int(self.headers.get("content-length", 0)))
+			body = b'{"served":"%d"}' % self.server.server_port
+			self.send_response(status)
+			self.send_header("content-type", "application/json")
+			self.send_header("content-length", str(len(body)))
+			self.end_headers()
+			self.wfile.write(body)
+
+		def log_message(self, *args) -> None:  # noqa: ANN002
+			pass
+
+	server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	return server
+
+
+def unused_url() -> str:
+	with socket.socket() as s:
+		s.bind(("127.0.0.1", 0))
+		return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+@pytest.fixture()
+def stand_ins():
+	servers = [start_stand_in(503), start_stand_in(200)]
+	yield [f"http://127.0.0.1:{s.server_port}" for s in servers]
+	for s in servers:
+		s.shutdown()
+
+
+def make_client(base_urls, **kwargs) -> SecureHttpClient:
+	os.environ.setdefault("SDK_ENV", "dev")
+	return SecureHttpClient(base_url=base_urls, endpoints_file=ENDPOINTS, **kwargs)
+
+
+def test_idempotent_requests_fail_over_to_healthy_instance(stand_ins) -> None:
+	down = unused_url()
+	degraded, healthy = stand_ins
+	client = make_client([down, degraded, healthy])
+	data, status, _ = client.post("/pav/v1/card/validation", {"panToken": "tok"})
+	assert status == 200 and data["served"] == healthy.rsplit(":", 1)[1]
+	assert client.endpoint_pool.candidates()[0] == healthy
+
+
+def test_idempotency_key_fails_over_only_when_opted_in(stand_ins) -> None:
+	degraded, healthy = stand_ins
+	payout = ("/visadirect/fundstransfer/v1/pushfunds", {"amount": {"minor": 1}})
+	client = make_client([degraded, healthy])
+	assert client.failover_on_idempotency_key is False
+	with pytest.raises(requests.HTTPError):
+		client.post(*payout, headers={"x-idempotency-key": "k-1"})
+	opted_in = make_client([degraded, healthy], failover_on_idempotency_key=True)
+	data, _, _ = opted_in.post(*payout, headers={"x-idempotency-key": "k-2"})
+	assert data["served"] == healthy.rsplit(":", 1)[1]
+
+
+def test_span_records_the_endpoint_used(stand_ins) -> None:
+	degraded, healthy = stand_ins
+
+	class Span:
+		def __init__(self) -> None:
+			self.attributes = {}
+
+		def set_attribute(self, key, value) -> None:  # noqa: ANN001
+			self.attributes[key] = value
+
+		def add_event(self, *args) -> None:  # noqa: ANN002
+			pass
+
+	client = make_client([degraded, healthy])
+	span = Span()
+	client._send("/pav/v1/card/validation", b"{}", {"content-type": "application/json"}, True, span)
+	assert span.attributes["http.url"] == f"{healthy}/pav/v1/card/validation"
+	assert client.base_url == degraded
+
+
+def test_non_idempotent_requests_are_not_retried(stand_ins) -> None:
+	degraded, healthy = stand_ins
+	client = make_client(f"{degraded},{healthy}")
+	with pytest.raises(requests.HTTPError):
+		client.post("/forexrates/v1/lock", {"src": "USD"})
+
+
+def test_pool_ejects_after_consecutive_failures_and_prefers_low_latency() -> None:
+	pool = EndpointPool(["http://a", "http://b"], failure_threshold=2, cooldown_seconds=60)
+	pool.record_success("http://a", 0.050)
+	pool.record_success("http://b", 0.010)
+	assert pool.candidates() == ["http://b", "http://a"]
+	pool.record_failure("http://b")
+	pool.record_failure("http://b")
+	assert pool.candidates() == ["http://a", "http://b"]
+	assert [s["healthy"] for s in pool.snapshot()] == [True, False]
@@ -0,0 +1,101 @@
+import json
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+h2_config = pytest.importorskip("h2.config")
+h2_connection = pytest.importorskip("h2.connection")
+h2_events = pytest.importorskip("h2.events")
+pytest.importorskip("httpx")
+
+from visa_direct_sdk.transport.http_backends import Http2Backend  # noqa: E402
+from visa_direct_sdk.transport.secure_http_client import SecureHttpClient  # noqa: E402
+
+ENDPOINTS = str(Path(__file__).resolve().parents[2] / "endpoints" / "endpoints.json")
+
+
+class H2StandIn:
+	"""Minimal h2c (prior knowledge) server that echoes JSON bodies."""
+
+	def __init__(self) -> None:
+		self.sock = socket.socket()
+		self.sock.bind(("127.0.0.1", 0))
+		self.sock.listen()
+		self.port = self.sock.getsockname()[1]
+		self.connections = 0
+		threading.Thread(target=self._accept, daemon=True).start()
+
+	def _accept(self) -> None:
+		while True:
+			try:
+				conn, _ = self.sock.accept()
+			except OSError:
+				return
+			self.connections += 1
+			threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+	def _serve(self, conn: socket.socket) -> None:
+		h2 = h2_connection.H2Connection(config=h2_config.H2Configuration(client_side=False))
+		h2.initiate_connection()
+		conn.sendall(h2.data_to_send())
+		bodies = {}
+		while True:
+			data = conn.recv(65535)
+			if not data:
+				return
+			for event in h2.receive_data(data):
+				if isinstance(event, h2_events.RequestReceived):
+					bodies[event.stream_id] = b""
+				elif isinstance(event, h2_events.DataReceived):
+					bodies[event.stream_id] += event.data
+					h2.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+				elif isinstance(event, h2_events.StreamEnded):
+					reply = json.dumps({"echo": json.loads(bodies.pop(event.stream_id)), "stream": event.stream_id}).encode()
+					h2.send_headers(event.stream_id, [(":status", "200"), ("content-type", "application/json"), ("content-length", str(len(reply)))])
+					h2.send_data(event.stream_id, reply, end_stream=True)
+			conn.sendall(h2.data_to_send())
+
+	def close(self) -> None:
+		self.sock.close()
+
+
+def test_concurrent_posts_multiplex_over_one_connection() -> None:
+	os.environ.setdefault("SDK_ENV", "dev")
+	server = H2StandIn()
+	backend = Http2Backend(prior_knowledge=True, max_connections=1)
+	client = SecureHttpClient(base_url=f"http://127.0.0.1:{server.port}", endpoints_file=ENDPOINTS, backend=backend)
+	try:
+		with ThreadPoolExecutor(max_workers=16) as pool:
+			results = list(pool.map(lambda i: client.post("/forexrates/v1/lock", {"n": i}), range(32)))
+	finally:
+		client.close()
+		server.close()
+	assert [r[0]["echo"]["n"] for r in results] == list(range(32))
+	assert {r[1] for r in results} == {200}
+	assert len({r[0]["stream"] for r in results}) == 32
+	assert server.connections == 1
+
+
+def test_get_uses_client_timeout_unless_given() -> None:
+	import httpx
+
+	seen = []
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		seen.append(request.extensions["timeout"])
+		return httpx.Response(200, json={})
+
+	backend = Http2Backend(timeout=7.0)
+	backend.client.close()
+	backend.client = httpx.Client(transport=httpx.MockTransport(handler), timeout=7.0)
+	try:
+		backend.get("http://stand-in/status")
+		backend.get("http://stand-in/status", timeout=2.5)
+	finally:
+		backend.close()
+	assert seen[0]["read"] == 7.0 and seen[0]["connect"] == 7.0
+	assert seen[1]["read"] == 2.5
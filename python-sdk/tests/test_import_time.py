@@ -0,0 +1,35 @@
+from benchmarks.importtime import STATEMENTS, heavy_modules, parse, run_statement
+
+
+def test_parse_reads_importtime_lines() -> None:
+	stderr = (
+		"import time: self [us] | cumulative | imported package\n"
+		"import time:       120 |        300 | visa_direct_sdk\n"
+		"import time:       180 |        180 |   visa_direct_sdk.errors\n"
+		"some other output\n"
+	)
+	records = parse(stderr)
+	assert [(r.name, r.depth, r.self_us, r.cumulative_us) for r in records] == [
+		("visa_direct_sdk", 0, 120, 300),
+		("visa_direct_sdk.errors", 1, 180, 180),
+	]
+
+
+def test_bare_import_loads_no_submodules() -> None:
+	names = {r.name for r in run_statement("import visa_direct_sdk; visa_direct_sdk.__all__; dir(visa_direct_sdk)")}
+	assert "visa_direct_sdk" in names
+	assert not {n for n in names if n.startswith("visa_direct_sdk.")}
+
+
+def test_cold_start_skips_heavy_dependencies() -> None:
+	for statement in STATEMENTS.values():
+		records = run_statement(statement)
+		assert heavy_modules(records) == [], statement
+		names = {r.name for r in records}
+		assert "asyncio" not in names and "pstats" not in names, statement
+
+
+def test_transport_does_not_load_models_or_policy() -> None:
+	names = {r.name for r in run_statement("import visa_direct_sdk.transport.secure_http_client")}
+	assert "visa_direct_sdk.transport.secure_http_client" in names
+	assert not names & {"visa_direct_sdk.core.models", "visa_direct_sdk.policy.corridor_policy", "visa_direct_sdk.utils.schema"}
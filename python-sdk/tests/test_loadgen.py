@@ -0,0 +1,52 @@
+import threading
+import time
+
+from benchmarks.loadgen import PayoutMix, run_closed_loop, run_open_loop
+from visa_direct_sdk.core.validation import validate_payout_request
+
+
+def test_mix_generates_valid_requests_in_proportion() -> None:
+	mix = PayoutMix({"CARD": 3, "ALIAS": 1}, fx_share=0.25, corridors=["US-MX", "GB-IN"], alias_pool=5, seed=7)
+	requests = [mix.next() for _ in range(2000)]
+	for request in requests:
+		validate_payout_request(request)
+	types = [r["destination"]["type"] for r in requests]
+	assert 0.15 < types.count("ALIAS") / len(types) < 0.25
+	assert len({r["destination"].get("alias") for r in requests} - {None}) == 5
+	fx = [r for r in requests if "preflight" in r]
+	assert 0.2 < len(fx) / len(requests) < 0.3
+	assert all(r["amount"]["currency"] != "USD" for r in fx)
+	assert len({r["idempotencyKey"] for r in requests}) == len(requests)
+
+
+def test_open_loop_counts_queueing_behind_a_stall() -> None:
+	calls = []
+	lock = threading.Lock()
+
+	def payout(request):
+		with lock:
+			calls.append(request)
+			first = len(calls) == 1
+		if first:
+			time.sleep(0.3)
+		if request["amount"]["minor"] % 7 == 0:
+			raise ConnectionError("reset")
+		return {"status": "executed"}
+
+	mix = PayoutMix({"CARD": 1}, seed=1)
+	report = run_open_loop(payout, mix, rate=200, duration=0.5, concurrency=1, seed=1)
+	data = report.as_dict()
+	assert report.completed == report.sent and report.dropped == 0
+	assert 80 <= report.sent <= 110
+	# one worker stalled for 300ms: payouts scheduled meanwhile waited, and only the corrected latency shows it
+	assert data["latencyMs"]["p50"] > 50
+	assert data["serviceTimeMs"]["p50"] < 5
+	assert data["errors"].get("ConnectionError", 0) + data["statuses"]["executed"] == report.completed
+
+
+def test_closed_loop_reports_service_time() -> None:
+	report = run_closed_loop(lambda request: (time.sleep(0.002), {"status": "executed"})[1], PayoutMix({"WALLET": 1}, seed=2), concurrency=4, duration=0.2)
+	data = report.as_dict()
+	assert report.completed == report.sent > 20
+	assert data["statuses"] == {"executed": report.completed}
+	assert 1.5 < data["latencyMs"]["p50"] < 20
@@ -0,0 +1,144 @@
+import random
+import time
+import urllib.request
+
+import pytest
+
+from visa_direct_sdk.core.orchestrator import Orchestrator, ReceiptReused
+from visa_direct_sdk.transport.crypto_executor import JweCryptoExecutor
+from visa_direct_sdk.transport.endpoint_pool import EndpointPool
+from visa_direct_sdk.utils import metrics
+from visa_direct_sdk.utils.metrics import LatencyHistogram, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+	registry = metrics.configure_metrics()
+	yield registry
+	metrics.configure_metrics()
+
+
+class StubHttpClient:
+
+	def post(self, path, data, headers=None):  # noqa: ANN001
+		if path == "/visaaliasdirectory/v1/resolve":
+			return ({"panToken": "tok_alias"}, 200, {})
+		if path == "/paai/v1/fundstransfer/attributes/inquiry":
+			return ({"octEligible": True}, 200, {})
+		if path == "/pav/v1/card/validation":
+			return ({"valid": True}, 200, {})
+		if data["amount"]["minor"] == 13:
+			raise ConnectionError("simulated network failure")
+		return ({"status": "executed"}, 200, {})
+
+
+def request(key, *, minor=100, destination=None, funding=None):
+	return {
+		"originatorId": "o1",
+		"idempotencyKey": key,
+		"funding": funding or {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": "c1"},
+		"destination": destination or {"type": "CARD", "panToken": "tok_1"},
+		"amount": {"currency": "USD", "minor": minor},
+	}
+
+
+def test_histogram_percentiles_are_within_bucket_error() -> None:
+	histogram = LatencyHistogram()
+	values = [random.randint(1, 5_000_000) for _ in range(20000)]
+	for value in values:
+		histogram.record(value)
+	values.sort()
+	for q, measured in histogram.percentiles((0.5, 0.99, 0.999)).items():
+		exact = values[int(q * len(values)) - 1]
+		assert abs(measured - exact) <= exact * 0.02 + 1
+	assert histogram.percentile(1.0) == values[-1]
+	assert histogram.count == len(values) and histogram.min_micros == values[0]
+
+
+def test_payout_records_latency_and_counters(registry) -> None:
+	orch = Orchestrator(StubHttpClient())
+	orch.payout(request("k1"))
+	orch.payout(request("k1"))
+	alias = {"type": "ALIAS", "alias": "a@example.com", "aliasType": "EMAIL"}
+	orch.payout(request("k2", destination=alias))
+	orch.payout(request("k3", destination=alias))
+	aft = {"type": "AFT", "receiptId": "r1", "status": "approved"}
+	orch.payout(request("k4", funding=aft))
+	with pytest.raises(ReceiptReused):
+		orch.payout(request("k5", funding=aft))
+	with pytest.raises(ConnectionError):
+		orch.payout(request("k6", minor=13))
+
+	counters = registry.counters()
+	assert counters[("visa_sdk_idempotency_hits_total", ())] == 1
+	assert counters[("visa_sdk_cache_requests_total", (("cache", "alias"), ("result", "miss")))] == 1
+	assert counters[("visa_sdk_cache_requests_total", (("cache", "alias"), ("result", "hit")))] == 1
+	assert counters[("visa_sdk_receipt_reuse_rejections_total", (("funding", "AFT"),))] == 1
+	assert counters[("visa_sdk_compensation_events_total", ())] == 1
+	timers = registry.timers()
+	assert timers[("visa_sdk_payout_seconds", (("destination", "CARD"), ("outcome", "ok")))].count == 2
+	assert timers[("visa_sdk_payout_seconds", (("destination", "CARD"), ("outcome", "error")))].count == 2
+	assert timers[("visa_sdk_stage_seconds", (("stage", "alias"),))].count == 2
+
+	text = registry.render_prometheus()
+	assert "# TYPE visa_sdk_payout_seconds summary" in text
+	assert 'visa_sdk_payout_seconds_count{destination="ALIAS",outcome="ok"} 2' in text
+	assert 'visa_sdk_idempotency_hits_total 1' in text
+
+
+def test_prometheus_endpoint_and_disabled_registry() -> None:
+	registry = MetricsRegistry()
+	registry.counter("visa_sdk_test_total", kind='quo"te').inc(3)
+	server = registry.serve_prometheus(port=0)
+	try:
+		with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+			assert 'visa_sdk_test_total{kind="quo\\"te"} 3' in response.read().decode()
+	finally:
+		server.shutdown()
+
+	disabled = metrics.configure_metrics(disabled=True)
+	try:
+		with disabled.timer("visa_sdk_x_seconds").time():
+			disabled.counter("visa_sdk_x_total").inc()
+		assert disabled.counters() == {} and disabled.timers() == {}
+	finally:
+		metrics.configure_metrics()
+
+
+def test_pool_usage_gauges(registry, monkeypatch) -> None:
+	from test_secure_http_client import FakeBackend, make_client
+
+	pool = EndpointPool(["http://a", "http://b"], failure_threshold=2, cooldown_seconds=0.05)
+	gauges = registry.gauges
+	assert gauges()[("visa_sdk_endpoint_healthy", (("endpoint", "http://a"),))] == 1
+	pool.record_failure("http://a")
+	pool.record_failure("http://a")
+	pool.record_failure("http://a")
+	assert gauges()[("visa_sdk_endpoint_healthy", (("endpoint", "http://a"),))] == 0
+	assert registry.counters()[("visa_sdk_endpoint_ejections_total", (("endpoint", "http://a"),))] == 1
+	monotonic = time.monotonic
+	monkeypatch.setattr(time, "monotonic", lambda: monotonic() + 1)
+	pool.candidates()
+	monkeypatch.undo()
+	assert gauges()[("visa_sdk_endpoint_healthy", (("endpoint", "http://a"),))] == 1
+
+	seen = []
+
+	class ObservingBackend(FakeBackend):
+
+		def post(self, url, data=None, headers=None):  # noqa: ANN001
+			seen.append(gauges()[("visa_sdk_http_in_flight", ())])
+			return super().post(url, data, headers)
+
+	make_client(ObservingBackend()).post("/not/a/configured/route/123", {"x": 1})
+	assert seen == [1] and gauges()[("visa_sdk_http_in_flight", ())] == 0
+	timers = registry.timers()
+	assert ("visa_sdk_http_request_seconds", (("method", "POST"), ("route", "unmatched"), ("status", "200"))) in timers
+
+	with JweCryptoExecutor(max_workers=1) as executor:
+		assert gauges()[("visa_sdk_crypto_pool_workers", ())] == 1
+		future = executor._tracked(executor._pool.submit(sum, [1, 2]))
+		assert future.result() == 3
+	assert gauges()[("visa_sdk_crypto_pool_pending", ())] == 0
+	assert gauges()[("visa_sdk_crypto_pool_workers", ())] == 0
+	assert "# TYPE visa_sdk_http_in_flight gauge" in registry.render_prometheus()
@@ -0,0 +1,97 @@
+import dataclasses
+
+import pytest
+
+from visa_direct_sdk.core.models import Amount, Destination, Funding, PayoutRequest
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.dx.builder import PayoutBuilder
+from visa_direct_sdk.errors import SchemaValidationError
+
+
+class RecordingHttpClient:
+
+	def __init__(self) -> None:
+		self.calls = []
+
+	def post(self, path, data, headers=None):  # noqa: ANN001
+		self.calls.append((path, data, headers))
+		return ({"payoutId": "p-1", "status": "executed"}, 200, {})
+
+
+def make_dict(**overrides):
+	request = {
+		"originatorId": "fi-models",
+		"idempotencyKey": "models-1",
+		"funding": {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": "conf-1"},
+		"destination": {"type": "ACCOUNT", "accountId": "acct-1"},
+		"amount": {"currency": "USD", "minor": 2500},
+	}
+	request.update(overrides)
+	return request
+
+
+def test_dict_and_typed_requests_produce_the_same_wire_payload() -> None:
+	via_dict, via_builder = RecordingHttpClient(), RecordingHttpClient()
+	Orchestrator(via_dict).payout(make_dict())
+	PayoutBuilder(Orchestrator(via_builder)) \
+		.for_originator("fi-models") \
+		.with_funding_internal(True, "conf-1") \
+		.to_account("acct-1") \
+		.for_amount("USD", 2500) \
+		.with_idempotency_key("models-1") \
+		.execute()
+	assert via_dict.calls == via_builder.calls
+	path, data, headers = via_dict.calls[0]
+	assert path == "/accountpayouts/v1/payout"
+	assert headers == {"x-idempotency-key": "models-1"}
+	assert data == {
+		"originatorId": "fi-models",
+		"funding": {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": "conf-1"},
+		"destination": {"type": "ACCOUNT", "accountId": "acct-1"},
+		"amount": {"currency": "USD", "minor": 2500},
+		"fxQuoteId": None,
+	}
+
+
+def test_round_trip_and_immutability() -> None:
+	source = make_dict(preflight={"corridor": {"sourceCountry": "US", "targetCountry": "MX", "sourceCurrency": "USD", "targetCurrency": "MXN"}})
+	req = PayoutRequest.from_dict(source)
+	assert req.to_dict() == source
+	assert req.amount == Amount("USD", 2500)
+	assert req.destination == Destination.account("acct-1")
+	with pytest.raises(dataclasses.FrozenInstanceError):
+		req.amount.minor = 1  # type: ignore[misc]
+	assert not hasattr(Funding.aft("r-1", "approved"), "__dict__")
+
+
+def test_builder_reports_missing_parts() -> None:
+	with pytest.raises(SchemaValidationError) as exc:
+		PayoutBuilder(Orchestrator(RecordingHttpClient())).for_originator("fi").to_account("a").build()
+	assert exc.value.path == "$.funding"
+
+
+def test_typed_requests_are_validated_when_built() -> None:
+	bad = [
+		lambda: PayoutRequest("", "k-1", Funding.internal(True, "conf-1"), Destination.account("acct-1"), Amount("USD", 1)),
+		lambda: PayoutRequest("fi", "k-2", Funding.aft(None, "approved"), Destination.account("acct-1"), Amount("USD", 1)),
+		lambda: PayoutRequest("fi", "k-3", Funding.internal(True, "conf-1"), Destination.card(""), Amount("USD", 1)),
+		lambda: PayoutRequest("fi", "k-4", Funding.internal(True, "conf-1"), Destination.account("acct-1"), Amount("USD", "12.5")),
+		lambda: PayoutRequest("fi", "k-5", {"type": "INTERNAL"}, Destination.account("acct-1"), Amount("USD", 1)),
+	]
+	paths = []
+	for build in bad:
+		with pytest.raises(SchemaValidationError) as exc:
+			build()
+		paths.append(exc.value.path)
+	assert paths == ["$.originatorId", "$.funding.receiptId", "$.destination.panToken", "$.amount.minor", "$.funding"]
+
+
+def test_typed_requests_skip_the_dict_schema(monkeypatch) -> None:
+	import visa_direct_sdk.core.orchestrator as orchestrator_module
+
+	monkeypatch.setattr(orchestrator_module, "validate_payout_request", lambda data: pytest.fail("typed request re-validated"))
+	monkeypatch.setattr(PayoutRequest, "to_dict", lambda self: pytest.fail("typed request converted to a dict"))
+	http = RecordingHttpClient()
+	req = PayoutRequest("fi", "k-typed", Funding.internal(True, "conf-1"), Destination.account("acct-1"), Amount("USD", 1))
+	Orchestrator(http).payout(req)
+	assert len(http.calls) == 1
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from visa_direct_sdk.utils import otel
+
+
+@pytest.fixture(autouse=True)
+def restore_otel():
+	yield
+	otel.configure_otel(disabled=True)
+
+
+def exploding_attributes():
+	raise AssertionError("attributes must not be built")
+
+
+def test_disabled_spans_are_shared_noops(monkeypatch) -> None:
+	otel.reset_otel()
+	monkeypatch.setenv("OTEL_DISABLED", "1")
+	first = otel.use_span("a", exploding_attributes)
+	monkeypatch.delenv("OTEL_DISABLED")
+	# the environment is read once; later changes need reset_otel()
+	assert otel.use_span("b", exploding_attributes) is first
+	with first as span:
+		assert span is None
+
+
+def test_lazy_attributes_and_error_status() -> None:
+	exporter = InMemorySpanExporter()
+	otel.configure_otel(exporter=exporter, batch=False)
+	with otel.use_span("ok", lambda: {"visa.k": "v"}):
+		pass
+	with pytest.raises(ValueError):
+		with otel.use_span("boom"):
+			raise ValueError("x")
+	spans = {s.name: s for s in exporter.get_finished_spans()}
+	assert spans["ok"].attributes["visa.k"] == "v"
+	assert spans["boom"].status.status_code is StatusCode.ERROR
+
+
+def test_unsampled_spans_skip_attributes() -> None:
+	exporter = InMemorySpanExporter()
+	otel.configure_otel(exporter=exporter, batch=False, sample_ratio=0.0)
+	with otel.use_span("dropped", exploding_attributes) as span:
+		assert not span.is_recording()
+	assert exporter.get_finished_spans() == ()
+
+
+def test_file_exporter_writes_json_lines(tmp_path) -> None:
+	path = tmp_path / "spans.jsonl"
+	otel.configure_otel(exporter="file", file_path=str(path), batch=False)
+	with otel.use_span("filed", {"visa.k": 1}):
+		pass
+	record = json.loads(path.read_text().splitlines()[0])
+	assert record["name"] == "filed" and record["attributes"] == {"visa.k": 1}
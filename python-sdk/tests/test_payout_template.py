@@ -0,0 +1,124 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from visa_direct_sdk.core.models import Destination, Funding
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.dx.builder import PayoutBuilder
+from visa_direct_sdk.errors import DestinationNotAllowedError, SchemaValidationError
+from visa_direct_sdk.policy.provider import PolicyProvider
+
+
+class QuotingHttpClient:
+
+	def __init__(self) -> None:
+		self.lock = threading.Lock()
+		self.payouts = []
+
+	def post(self, path, data, headers=None):  # noqa: ANN001
+		if path == "/forexrates/v1/lock":
+			expires = (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()
+			return ({"quoteId": f"Q-{data['amount']['minor']}", "expiresAt": expires}, 200, {})
+		with self.lock:
+			self.payouts.append((path, data, headers))
+		if data["amount"]["minor"] == 13:
+			raise ConnectionError("simulated network failure")
+		return ({"status": "executed", "fxQuoteId": data["fxQuoteId"]}, 200, {})
+
+
+def ledger(n):
+	return Funding.internal(True, f"ledger-{n}")
+
+
+def make_template(http):
+	orch = Orchestrator(http)
+	template = PayoutBuilder(orch) \
+		.for_originator("fi-payroll") \
+		.with_funding_internal(True, "batch-conf-1") \
+		.for_amount("MXN", 0) \
+		.with_quote_lock("USD", "MXN") \
+		.for_corridor("US", "MX") \
+		.as_template()
+	return orch, template
+
+
+def test_template_resolves_corridor_once(monkeypatch) -> None:
+	http = QuotingHttpClient()
+	orch, template = make_template(http)
+	orch._resolve_corridor_rules = lambda corridor: pytest.fail("corridor resolved per payout")
+	monkeypatch.setattr(orch.corridor_policy(), "lookup", lambda *args: pytest.fail("corridor looked up per payout"))
+	assert template.preflight.corridor.source_currency == "USD"
+	assert template.preflight.corridor.target_currency == "MXN"
+	result = template.execute(Destination.card("tok_1"), 501, "payroll-1", ledger(1))
+	assert result["fxQuoteId"] == "Q-501"
+	assert template.bind(Destination.card("tok_2"), 10, "payroll-2", ledger(2)).preflight is template.preflight
+
+
+def test_template_enforces_destination_per_payout() -> None:
+	_orch, template = make_template(QuotingHttpClient())
+	with pytest.raises(DestinationNotAllowedError):
+		template.bind(Destination.account("acct-1"), 100, "payroll-acct", ledger(1))
+
+
+def test_template_batch_streams_outcomes() -> None:
+	http = QuotingHttpClient()
+	_orch, template = make_template(http)
+	items = ((Destination.card(f"tok_{i}"), 10 + i, f"batch-{i}", ledger(i)) for i in range(20))
+	outcomes = list(template.execute_batch(items, max_workers=4))
+	assert len(outcomes) == 20 and len(http.payouts) == 20
+	failed = [o for o in outcomes if not o.ok]
+	assert [o.item[2] for o in failed] == ["batch-3"]
+	assert isinstance(failed[0].error, ConnectionError)
+	assert {o.result["fxQuoteId"] for o in outcomes if o.ok} == {f"Q-{10 + i}" for i in range(20) if i != 3}
+	assert len({data["funding"]["confirmationRef"] for _, data, _ in http.payouts}) == 20
+
+
+def test_template_batch_binds_single_use_funding_per_item() -> None:
+	http = QuotingHttpClient()
+	orch = Orchestrator(http)
+	template = PayoutBuilder(orch) \
+		.for_originator("fi-payroll") \
+		.with_funding_from_card("aft-template", "approved") \
+		.for_amount("MXN", 0) \
+		.with_quote_lock("USD", "MXN") \
+		.for_corridor("US", "MX") \
+		.as_template()
+	assert template.funding_type == "AFT"
+	items = [(Destination.card(f"tok_{i}"), 20 + i, f"aft-{i}", Funding.aft(f"rcpt-{i}", "approved")) for i in range(5)]
+	outcomes = list(template.execute_batch(items, max_workers=2))
+	assert all(o.ok for o in outcomes) and len(http.payouts) == 5
+	with pytest.raises(SchemaValidationError):
+		template.bind(Destination.card("tok_x"), 1, "wrong-type", ledger(1))
+	with pytest.raises(SchemaValidationError):
+		template.execute(Destination.card("tok_x"), 1, "empty-receipt", Funding.aft("", "approved"))
+
+
+def test_template_follows_policy_hot_reload() -> None:
+	http = QuotingHttpClient()
+	provider = PolicyProvider()
+	orch = Orchestrator(http, policy_provider=provider)
+	template = PayoutBuilder(orch) \
+		.for_originator("fi-payroll") \
+		.with_funding_internal(True, "batch-conf-1") \
+		.for_amount("MXN", 0) \
+		.with_quote_lock("USD", "MXN") \
+		.for_corridor("US", "MX") \
+		.as_template()
+	template.execute(Destination.card("tok_1"), 501, "reload-1", ledger(1))
+	provider.push({"version": "9.9.9", "corridors": [{"sourceCountry": "US", "targetCountry": "MX", "rules": {"rails": {"allowedDestinations": ["wallet"]}}}]})
+	with pytest.raises(DestinationNotAllowedError):
+		template.bind(Destination.card("tok_2"), 502, "reload-2", ledger(2))
+	assert template.preflight.corridor_rules.policy_version == "9.9.9"
+
+
+def test_orchestrator_ignores_rules_from_a_replaced_policy() -> None:
+	http = QuotingHttpClient()
+	provider = PolicyProvider()
+	orch = Orchestrator(http, policy_provider=provider)
+	_orch, template = make_template(http)
+	request = template.bind(Destination.card("tok_1"), 501, "stale-1", ledger(1))
+	provider.push({"version": "9.9.9", "corridors": [{"sourceCountry": "US", "targetCountry": "MX", "rules": {"rails": {"allowedDestinations": ["wallet"]}}}]})
+	with pytest.raises(DestinationNotAllowedError):
+		orch.payout(request)
+	assert http.payouts == []
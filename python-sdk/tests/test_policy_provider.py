@@ -0,0 +1,63 @@
+import json
+import os
+
+import pytest
+
+from visa_direct_sdk.core.models import PayoutCorridor
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.errors import DestinationNotAllowedError
+from visa_direct_sdk.policy.corridor_policy import InvalidPolicyError
+from visa_direct_sdk.policy.provider import PolicyProvider
+
+
+def write_policy(path, version: str, destinations, mtime_ns: int) -> None:
+	path.write_text(json.dumps({
+		"version": version,
+		"corridors": [{
+			"sourceCountry": "GB",
+			"targetCountry": "PH",
+			"currencies": {"source": "GBP", "target": "PHP"},
+			"rules": {"rails": {"allowedDestinations": destinations}},
+		}],
+	}))
+	os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_refresh_swaps_to_new_version_and_keeps_old_snapshot(tmp_path) -> None:
+	path = tmp_path / "corridor-policy.json"
+	write_policy(path, "1.0.0", ["card"], 1_000_000_000)
+	provider = PolicyProvider(str(path))
+	snapshot = provider.current()
+	assert provider.refresh() is False
+
+	write_policy(path, "1.1.0", ["account"], 2_000_000_000)
+	assert provider.refresh() is True
+	assert provider.version == "1.1.0"
+	assert provider.current().lookup("GB", "PH", "GBP", "PHP").allowed_destinations == frozenset({"account"})
+	assert snapshot.lookup("GB", "PH", "GBP", "PHP").allowed_destinations == frozenset({"card"})
+
+
+def test_invalid_update_keeps_active_policy(tmp_path) -> None:
+	path = tmp_path / "corridor-policy.json"
+	write_policy(path, "1.0.0", ["card"], 1_000_000_000)
+	provider = PolicyProvider(str(path))
+	path.write_text("{not json")
+	os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+	assert provider.refresh() is False
+	assert provider.version == "1.0.0"
+	assert isinstance(provider.last_error, InvalidPolicyError)
+	with pytest.raises(InvalidPolicyError):
+		provider.push({"version": "2.0.0", "corridors": [{"targetCountry": "PH"}]})
+
+
+def test_orchestrator_reads_pushed_policy() -> None:
+	provider = PolicyProvider()
+	orch = Orchestrator(object(), policy_provider=provider)
+	corridor = PayoutCorridor("GB", "PH", "GBP", "PHP")
+	seen = []
+	provider.subscribe(lambda compiled: seen.append(compiled.version))
+	provider.push({"version": "9.0.0", "corridors": [{"sourceCountry": "GB", "targetCountry": "PH", "rules": {"rails": {"allowedDestinations": ["wallet"]}}}]})
+	rules = orch._resolve_corridor_rules(corridor)
+	assert (rules.policy_version, seen) == ("9.0.0", ["9.0.0"])
+	with pytest.raises(DestinationNotAllowedError):
+		rules.check_destination("card", "GB->PH")
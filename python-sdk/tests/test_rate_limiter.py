@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from visa_direct_sdk.errors import RateLimitExceeded
+from visa_direct_sdk.transport.rate_limiter import InMemoryRateLimiter, RateLimit, RedisRateLimiter
+
+PUSH = "/visadirect/fundstransfer/v1/pushfunds"
+
+
+def test_fail_fast_admits_burst_then_rejects() -> None:
+	limiter = InMemoryRateLimiter({PUSH: RateLimit(per_second=10, burst=3)}, mode="fail_fast")
+	for _ in range(3):
+		limiter.acquire(PUSH, "fi-001")
+	with pytest.raises(RateLimitExceeded) as exc:
+		limiter.acquire(PUSH, "fi-001")
+	assert 0 < exc.value.retry_after <= 0.1
+	# other originators and unlimited routes are unaffected
+	limiter.acquire(PUSH, "fi-002")
+	limiter.acquire("/forexrates/v1/lock", "fi-001")
+
+
+def test_block_mode_waits_until_admitted_within_deadline() -> None:
+	limiter = InMemoryRateLimiter({PUSH: RateLimit(per_second=20, burst=1)}, max_wait_seconds=1.0)
+	start = time.monotonic()
+	for _ in range(3):
+		limiter.acquire(PUSH, "fi-001")
+	assert time.monotonic() - start >= 0.09
+	with pytest.raises(RateLimitExceeded):
+		limiter.acquire(PUSH, "fi-001", max_wait_seconds=0.0)
+
+
+class FakeScriptRedis:
+
+	def __init__(self) -> None:
+		self.calls = []
+		self.replies = [0, 250_000]
+
+	def eval(self, script, numkeys, *args):  # noqa: ANN001
+		self.calls.append((numkeys, args))
+		return self.replies.pop(0)
+
+
+def test_redis_limiter_runs_one_script_per_acquire() -> None:
+	redis = FakeScriptRedis()
+	limiter = RedisRateLimiter(redis, {PUSH: RateLimit(per_second=4, burst=2)}, mode="fail_fast")
+	limiter.acquire(PUSH, "fi-001")
+	with pytest.raises(RateLimitExceeded) as exc:
+		limiter.acquire(PUSH, "fi-001")
+	assert exc.value.retry_after == pytest.approx(0.25)
+	assert redis.calls[0] == (1, ("ratelimit:" + PUSH + "|fi-001", 250_000, 250_000, 1500))
+
+
+def test_in_memory_limiter_sweeps_expired_keys(monkeypatch) -> None:
+	clock = [1000.0]
+	monkeypatch.setattr("visa_direct_sdk.transport.rate_limiter.time.monotonic", lambda: clock[0])
+	limiter = InMemoryRateLimiter({PUSH: RateLimit(per_second=4, burst=5)}, mode="fail_fast")
+	for i in range(1000):
+		limiter.acquire(PUSH, f"fi-{i}")
+	assert len(limiter._tat) == 1000
+	clock[0] += 2.0
+	limiter.acquire(PUSH, "fi-live")
+	assert list(limiter._tat) == [f"{PUSH}|fi-live"]
+	# a swept key starts from a fresh burst, exactly as before it was dropped
+	for _ in range(5):
+		limiter.acquire(PUSH, "fi-0")
+
+
+def test_post_is_limited_by_route_template() -> None:
+	import os
+	from pathlib import Path
+
+	from visa_direct_sdk.transport.secure_http_client import SecureHttpClient
+
+	class Response:
+		status_code = 200
+		content = b"{}"
+		headers = {"content-type": "application/json"}
+
+		def raise_for_status(self) -> None:
+			pass
+
+	class Backend:
+		errors = ()
+
+		def post(self, url, data=None, headers=None):  # noqa: ANN001
+			return Response()
+
+	os.environ.setdefault("SDK_ENV", "dev")
+	route = "/visapayouts/v3/payouts/:id"
+	limiter = InMemoryRateLimiter({route: RateLimit(per_second=1, burst=2)}, mode="fail_fast")
+	endpoints = str(Path(__file__).resolve().parents[2] / "endpoints" / "endpoints.json")
+	client = SecureHttpClient(base_url="http://visa.test", endpoints_file=endpoints, backend=Backend(), rate_limiter=limiter)
+	client.post("/visapayouts/v3/payouts/p-1", {"originatorId": "fi-001"})
+	client.post("/visapayouts/v3/payouts/p-2", {"originatorId": "fi-001"})
+	with pytest.raises(RateLimitExceeded):
+		client.post("/visapayouts/v3/payouts/p-3", {"originatorId": "fi-001"})
+	assert list(limiter._tat) == [f"{route}|fi-001"]
@@ -0,0 +1,106 @@
+import json
+
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.reconcile import main, reconcile
+from visa_direct_sdk.run import main as run_main
+
+
+def write_jsonl(path, records) -> None:
+	path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+
+def read_stream(directory, name):
+	return [json.loads(line) for line in (directory / f"{name}.jsonl").read_text().splitlines()]
+
+
+def test_partitioned_join_classifies_records(tmp_path) -> None:
+	results = [
+		{"line": i, "confirmationRef": f"conf-{i}", "status": "ok", "result": {"payoutId": f"p-{i}", "amount": {"currency": "USD", "minor": 100 + i}}}
+		for i in range(500)
+	]
+	results[7]["result"]["amount"]["minor"] = 1
+	del results[9]["confirmationRef"]
+	results.append({"line": 999, "confirmationRef": "conf-unknown", "status": "ok", "result": {"amount": {"minor": 5}}})
+	write_jsonl(tmp_path / "results.jsonl", results)
+	ledger_rows = ["confirmationRef,amountMinor,currency"] + [f"conf-{i},{100 + i},USD" for i in range(500) if i != 3] + ["conf-extra,42,USD"]
+	(tmp_path / "ledger.csv").write_text("\n".join(ledger_rows) + "\n")
+
+	out = tmp_path / "out"
+	summary = reconcile(str(tmp_path / "results.jsonl"), str(tmp_path / "ledger.csv"), str(out), partitions=7, work_dir=str(tmp_path))
+	assert summary.counts == {
+		"matched": 497,
+		"amount_mismatch": 1,
+		"failed": 0,
+		"missing_in_ledger": 2,
+		"missing_in_results": 2,
+		"failed_without_ledger": 0,
+		"unkeyed_results": 1,
+		"unkeyed_ledger": 0,
+	}
+	assert [r["key"] for r in read_stream(out, "amount_mismatch")] == ["conf-7"]
+	assert sorted(r["key"] for r in read_stream(out, "missing_in_ledger")) == ["conf-3", "conf-unknown"]
+	assert sorted(r["key"] for r in read_stream(out, "missing_in_results")) == ["conf-9", "conf-extra"]
+	assert not summary.clean
+	assert [p.name for p in tmp_path.iterdir() if p.name.startswith("visa-recon-")] == []
+
+
+def test_cli_exit_status(tmp_path) -> None:
+	write_jsonl(tmp_path / "results.jsonl", [{"payoutId": "p-1", "amount": {"minor": 10}}])
+	write_jsonl(tmp_path / "ledger.jsonl", [{"payoutId": "p-1", "amountMinor": 10}])
+	args = [str(tmp_path / "results.jsonl"), str(tmp_path / "ledger.jsonl"), "--out", str(tmp_path / "out"),
+		"--result-key", "payoutId", "--ledger-key", "payoutId", "--result-amount", "amount.minor"]
+	assert main(args) == 0
+	assert read_stream(tmp_path / "out", "matched")[0]["ledger"] == {"payoutId": "p-1", "amountMinor": 10}
+
+
+def test_failed_payouts_are_reported_as_not_paid(tmp_path) -> None:
+	error = {"type": "PISFailed", "message": "declined"}
+	write_jsonl(tmp_path / "results.jsonl", [
+		{"line": 1, "confirmationRef": "c1", "status": "error", "error": error},
+		{"line": 2, "confirmationRef": "c2", "status": "error", "error": error},
+		{"line": 3, "confirmationRef": "c3", "status": "ok", "result": {"amount": {"minor": 300}}},
+	])
+	(tmp_path / "ledger.csv").write_text("confirmationRef,amountMinor\nc1,100\nc3,300\n")
+	out = tmp_path / "out"
+	summary = reconcile(str(tmp_path / "results.jsonl"), str(tmp_path / "ledger.csv"), str(out))
+	assert [r["key"] for r in read_stream(out, "failed")] == ["c1"]
+	assert read_stream(out, "failed")[0]["ledger"] == {"confirmationRef": "c1", "amountMinor": "100"}
+	assert summary.counts["amount_mismatch"] == 0 and summary.counts["matched"] == 1
+	assert summary.counts["failed_without_ledger"] == 1 and summary.counts["missing_in_ledger"] == 0
+	assert not summary.clean
+
+
+class SimulatedHttpClient:
+	"""Answers like the simulator: even amounts come back as ``failed`` with HTTP 200."""
+
+	def post(self, path, data, headers=None):  # noqa: ANN001
+		minor = data["amount"]["minor"]
+		status = "executed" if minor % 2 else "failed"
+		return ({"payoutId": f"p-{minor}", "status": status, "amount": data["amount"]}, 200, {})
+
+
+def test_declined_runner_outcomes_are_failed(tmp_path) -> None:
+	requests = [
+		{
+			"originatorId": "fi-recon",
+			"idempotencyKey": f"recon-{minor}",
+			"funding": {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": f"c-{minor}"},
+			"destination": {"type": "ACCOUNT", "accountId": "acct-1"},
+			"amount": {"currency": "USD", "minor": minor},
+		}
+		for minor in (101, 102)
+	]
+	write_jsonl(tmp_path / "payouts.jsonl", requests)
+	results = tmp_path / "results.jsonl"
+	assert run_main([str(tmp_path / "payouts.jsonl"), "--output", str(results)], orchestrator=Orchestrator(SimulatedHttpClient())) == 0
+	assert {json.loads(line)["status"] for line in results.read_text().splitlines()} == {"ok"}
+	(tmp_path / "ledger.csv").write_text("confirmationRef,amountMinor\nc-101,101\nc-102,102\n")
+
+	out = tmp_path / "out"
+	summary = reconcile(str(results), str(tmp_path / "ledger.csv"), str(out))
+	assert [r["key"] for r in read_stream(out, "matched")] == ["c-101"]
+	assert [r["key"] for r in read_stream(out, "failed")] == ["c-102"]
+	assert not summary.clean
+
+	ignored = reconcile(str(results), str(tmp_path / "ledger.csv"), str(tmp_path / "ignored"), result_outcome=None)
+	assert ignored.counts["matched"] == 2 and ignored.counts["failed"] == 0
@@ -0,0 +1,146 @@
+import io
+import json
+import threading
+import time
+
+from benchmarks.replay import load_recording, replay, summarize, to_request
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.core.validation import validate_payout_request
+from visa_direct_sdk.utils.recording import TrafficRecorder
+
+from test_secure_http_client import FakeBackend, make_client
+
+
+def request(key, *, alias="payee@example.com", receipt="aft-1", minor=1001):
+	return {
+		"originatorId": "fi-001",
+		"idempotencyKey": key,
+		"funding": {"type": "AFT", "receiptId": receipt, "status": "approved"},
+		"destination": {"type": "ALIAS", "alias": alias, "aliasType": "EMAIL"},
+		"amount": {"currency": "MXN", "minor": minor},
+		"preflight": {
+			"fxLock": {"srcCurrency": "USD", "dstCurrency": "MXN"},
+			"corridor": {"sourceCountry": "US", "targetCountry": "MX", "sourceCurrency": "USD", "targetCurrency": "MXN"},
+		},
+	}
+
+
+def records(out):
+	return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_orchestrator_and_client_write_redacted_records() -> None:
+	out = io.StringIO()
+	recorder = TrafficRecorder(out, salt=b"fixed", flush_every=1)
+	orch = Orchestrator(make_client(FakeBackend()), recorder=recorder)
+	orch.http.recorder = recorder
+	orch.recipient_service.resolve_alias = lambda alias, alias_type: {"panToken": "tok_pan_4111"}
+	orch.recipient_service.pav = lambda token: {"cardStatus": "GOOD"}
+	orch.recipient_service.ftai = lambda token: {"octEligible": True}
+	orch.quoting_service.lock = lambda src, dst, minor: {"quoteId": "Q-1", "expiresAt": "2999-01-01T00:00:00Z"}
+
+	orch.payout(request("idem-secret-1"))
+	orch.payout(request("idem-secret-1"))
+	try:
+		orch.payout(request("idem-secret-2"))
+	except Exception:
+		pass
+	recorder.close()
+
+	text = out.getvalue()
+	for secret in ("idem-secret", "payee@example.com", "aft-1", "fi-001", '"minor"'):
+		assert secret not in text
+	header, *rest = records(out)
+	assert header["type"] == "header" and header["version"] == 1
+	payouts = [r for r in rest if r["type"] == "payout"]
+	http = [r for r in rest if r["type"] == "http"]
+	assert len(payouts) == 3
+	first, retry, reused = payouts
+	assert first["key"] == retry["key"] != reused["key"]
+	assert first["destinationRef"] == reused["destinationRef"] and first["fundingRef"] == reused["fundingRef"]
+	assert first["fx"] == {"src": "USD", "dst": "MXN"} and first["corridor"]["targetCountry"] == "MX"
+	assert first["amountDigits"] == 4 and first["currency"] == "MXN"
+	assert reused["error"] == "ReceiptReused"
+	assert first["t"] <= retry["t"] <= reused["t"]
+	assert len(http) == 1 and http[0]["route"] == "/visadirect/fundstransfer/v1/pushfunds"
+	assert http[0]["key"] == first["key"] and http[0]["status"] == "200" and http[0]["mle"] is True
+
+
+def test_sampling_keeps_or_drops_whole_keys() -> None:
+	out = io.StringIO()
+	recorder = TrafficRecorder(out, sample_rate=0.5, salt=b"fixed")
+	for n in range(400):
+		req = request(f"k-{n % 200}")
+		recorder.record_payout(req, 0, result={"status": "executed"})
+	kept = [r for r in records(out) if r["type"] == "payout"]
+	counts = {}
+	for record in kept:
+		counts[record["key"]] = counts.get(record["key"], 0) + 1
+	assert 60 < len(counts) < 140
+	assert set(counts.values()) == {2}
+
+
+def test_replay_reproduces_timing_and_reuse(tmp_path) -> None:
+	path = tmp_path / "traffic.jsonl"
+	with TrafficRecorder(str(path), salt=b"fixed") as recorder:
+		recorder._origin = 0
+		for t, key, alias, status in [
+			(0.0, "a", "x@example.com", "executed"),
+			(0.2, "b", "y@example.com", "failed"),
+			(0.2, "a", "x@example.com", "executed"),
+			(0.6, "c", "x@example.com", "executed"),
+		]:
+			recorder.record_payout(request(key, alias=alias, receipt=f"r-{key}"), int(t * 1e9), result={"status": status})
+
+	header, payouts = load_recording(str(path))
+	assert header["version"] == 1 and [p["t"] for p in payouts] == [0.0, 0.2, 0.2, 0.6]
+	shape = summarize(payouts)
+	assert shape["payouts"] == 4 and shape["keyReuse"] == 0.25 and shape["destinationReuse"] == 0.5
+
+	synthetic = [to_request(p, "run1") for p in payouts]
+	for req in synthetic:
+		validate_payout_request(req)
+	assert synthetic[0]["idempotencyKey"] == synthetic[2]["idempotencyKey"] != synthetic[1]["idempotencyKey"]
+	assert synthetic[0]["destination"]["alias"] == synthetic[3]["destination"]["alias"]
+	assert synthetic[0]["amount"]["minor"] % 2 == 1 and synthetic[1]["amount"]["minor"] % 2 == 0
+	assert synthetic[0]["preflight"]["fxLock"] == {"srcCurrency": "USD", "dstCurrency": "MXN"}
+
+	arrivals = []
+	lock = threading.Lock()
+
+	def payout(req):
+		with lock:
+			arrivals.append((req["idempotencyKey"], time.perf_counter()))
+		return {"status": "executed"}
+
+	report = replay(payout, payouts, speed=2.0, concurrency=4, run="run1")
+	assert report.sent == report.completed == 4
+	offsets = sorted(at - arrivals[0][1] for _, at in arrivals)
+	assert 0.25 < offsets[-1] < 0.45
+	assert len({key for key, _ in arrivals}) == 3
+
+
+def test_recording_failures_never_reach_the_payout() -> None:
+
+	class FullDisk(io.StringIO):
+
+		def write(self, text):  # noqa: ANN001
+			if '"type":"header"' not in text:
+				raise OSError(28, "No space left on device")
+			return super().write(text)
+
+	recorder = TrafficRecorder(FullDisk(), salt=b"fixed", flush_every=1)
+	orch = Orchestrator(make_client(FakeBackend()), recorder=recorder)
+	orch.http.recorder = recorder
+	orch.recipient_service.resolve_alias = lambda alias, alias_type: {"panToken": "tok_pan_4111"}
+	orch.recipient_service.pav = lambda token: {"cardStatus": "GOOD"}
+	orch.recipient_service.ftai = lambda token: {"octEligible": True}
+	orch.quoting_service.lock = lambda src, dst, minor: {"quoteId": "Q-1", "expiresAt": "2999-01-01T00:00:00Z"}
+	assert orch.payout(request("idem-full")) is not None
+	assert recorder.failures == 2
+
+	closed = TrafficRecorder(io.StringIO(), salt=b"fixed")
+	closed.close()
+	closed.record_payout(request("idem-closed"), 0, result={"status": "executed"})
+	closed.record_http("POST", "/x", "200", 0, mle=False)
+	assert closed.failures == 2
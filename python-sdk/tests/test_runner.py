@@ -0,0 +1,143 @@
+import io
+import json
+import sys
+import threading
+
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.run import Checkpoint, main
+from visa_direct_sdk.utils.codec import default_codec
+
+
+class CountingHttpClient:
+
+	def __init__(self) -> None:
+		self.lock = threading.Lock()
+		self.sent = []
+
+	def post(self, path, data, headers=None):  # noqa: ANN001
+		with self.lock:
+			self.sent.append(headers["x-idempotency-key"])
+		return ({"payoutId": f"p-{headers['x-idempotency-key']}", "status": "executed"}, 200, {})
+
+
+def make_request(i: int) -> dict:
+	return {
+		"originatorId": "fi-run",
+		"idempotencyKey": f"run-{i}",
+		"funding": {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": f"c-{i}"},
+		"destination": {"type": "CARD", "panToken": f"tok_{i}"},
+		"amount": {"currency": "USD", "minor": 100 + i},
+	}
+
+
+def test_jsonl_run_resumes_without_resending(tmp_path, monkeypatch) -> None:
+	source = tmp_path / "payouts.jsonl"
+	lines = [json.dumps(make_request(i)) for i in range(40)]
+	lines.insert(10, "{not json")
+	lines.insert(20, "")
+	source.write_text("\n".join(lines) + "\n")
+	output, checkpoint = tmp_path / "out.jsonl", tmp_path / "run.ckpt"
+	args = [str(source), "--output", str(output), "--checkpoint", str(checkpoint), "--concurrency", "4", "--checkpoint-every", "5"]
+
+	first = CountingHttpClient()
+	real_open = open
+	read = {"n": 0}
+
+	class CrashingFile:
+
+		def __init__(self, handle) -> None:  # noqa: ANN001
+			self.handle = handle
+
+		def __iter__(self):
+			for raw in self.handle:
+				read["n"] += 1
+				if read["n"] > 25:
+					raise OSError("simulated crash")
+				yield raw
+
+		def close(self) -> None:
+			self.handle.close()
+
+	monkeypatch.setattr("builtins.open", lambda path, mode="r", **kw: CrashingFile(real_open(path, mode, **kw)) if str(path) == str(source) else real_open(path, mode, **kw))
+	try:
+		main(args, orchestrator=Orchestrator(first))
+	except OSError:
+		pass
+	monkeypatch.undo()
+	recorded = {json.loads(line)["idempotencyKey"] for line in output.read_text().splitlines()}
+	assert 0 < len(first.sent) <= 23
+
+	second = CountingHttpClient()
+	assert main(args, orchestrator=Orchestrator(second)) == 0
+	# payouts in flight at the crash may be re-sent (same idempotency key); recorded ones never are
+	assert not recorded & set(second.sent)
+	assert set(first.sent) | set(second.sent) == {f"run-{i}" for i in range(40)}
+
+	records = [json.loads(line) for line in output.read_text().splitlines()]
+	assert sorted(r["line"] for r in records) == [line for line in range(1, 43) if line != 21]
+	assert [r["line"] for r in records if r["status"] == "error"] == [11]
+	assert json.loads(checkpoint.read_text())["watermark"] == 42
+
+
+def test_csv_rows_are_expanded(tmp_path) -> None:
+	source = tmp_path / "payouts.csv"
+	source.write_text(
+		"originatorId,idempotencyKey,fundingType,debitConfirmed,confirmationRef,destinationType,accountId,currency,amountMinor\n"
+		"fi-csv,csv-1,INTERNAL,true,conf-1,ACCOUNT,acct-1,USD,250\n"
+		"fi-csv,csv-2,INTERNAL,false,conf-2,ACCOUNT,acct-2,USD,300\n"
+	)
+	output = tmp_path / "out.jsonl"
+	http = CountingHttpClient()
+	assert main([str(source), "--output", str(output)], orchestrator=Orchestrator(http)) == 1
+	records = {r["idempotencyKey"]: r for r in map(json.loads, output.read_text().splitlines())}
+	assert records["csv-1"]["status"] == "ok"
+	assert records["csv-2"]["error"]["type"] == "LedgerNotConfirmed"
+	assert http.sent == ["csv-1"]
+
+
+def test_resume_recovers_outcomes_written_after_the_last_checkpoint(tmp_path, monkeypatch) -> None:
+	source = tmp_path / "payouts.jsonl"
+	source.write_text("".join(json.dumps(make_request(i)) + "\n" for i in range(30)))
+	output, checkpoint = tmp_path / "out.jsonl", tmp_path / "run.ckpt"
+	args = [str(source), "--output", str(output), "--checkpoint", str(checkpoint), "--concurrency", "4"]
+
+	# killed before any checkpoint save, mid-way through writing one more record
+	monkeypatch.setattr(Checkpoint, "save", lambda self: None)
+	first = CountingHttpClient()
+	main(args, orchestrator=Orchestrator(first))
+	monkeypatch.undo()
+	assert not checkpoint.exists() and len(first.sent) == 30
+	with open(output, "ab") as handle:
+		handle.write(b'{"line": 31, "idempot')
+
+	second = CountingHttpClient()
+	assert main(args, orchestrator=Orchestrator(second)) == 0
+	assert second.sent == []
+	records = [json.loads(line) for line in output.read_text().splitlines()]
+	assert sorted(r["line"] for r in records) == list(range(1, 31))
+	assert json.loads(checkpoint.read_text())["watermark"] == 30
+
+
+def test_recover_keeps_keys_only_above_the_watermark(tmp_path) -> None:
+	output = tmp_path / "out.jsonl"
+	lines = [1, 2, 3, 5, 7]
+	output.write_text("".join(json.dumps({"line": n, "idempotencyKey": f"k-{n}", "status": "ok"}) + "\n" for n in lines))
+	checkpoint = Checkpoint(None)
+	assert checkpoint.recover(str(output), default_codec()) == 5
+	assert checkpoint.watermark == 3
+	assert checkpoint.resumed_keys == {"k-5", "k-7"}
+	assert checkpoint.is_done(2, None) and checkpoint.is_done(7, None) and not checkpoint.is_done(4, None)
+
+
+def test_csv_from_stdin(tmp_path, monkeypatch) -> None:
+	data = (
+		"originatorId,idempotencyKey,fundingType,debitConfirmed,confirmationRef,destinationType,accountId,currency,amountMinor\n"
+		"fi-csv,stdin-1,INTERNAL,true,conf-1,ACCOUNT,acct-1,USD,250\n"
+	).encode()
+	stdin = io.TextIOWrapper(io.BytesIO(data))
+	monkeypatch.setattr(sys, "stdin", stdin)
+	output = tmp_path / "out.jsonl"
+	http = CountingHttpClient()
+	assert main(["-", "--format", "csv", "--output", str(output)], orchestrator=Orchestrator(http)) == 0
+	assert http.sent == ["stdin-1"]
+	assert not stdin.buffer.closed
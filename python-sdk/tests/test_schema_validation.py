@@ -0,0 +1,82 @@
+import pytest
+
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.core.validation import validate_payout_request
+from visa_direct_sdk.errors import SchemaValidationError
+from visa_direct_sdk.policy.corridor_policy import InvalidPolicyError, policy_from_dict
+from visa_direct_sdk.storage.receipt_store import InMemoryReceiptStore
+from visa_direct_sdk.utils.schema import _predicate, compile_schema
+
+
+def make_request(**overrides):
+	request = {
+		"originatorId": "fi-schema",
+		"idempotencyKey": "schema-1",
+		"funding": {"type": "AFT", "receiptId": "r-1", "status": "approved"},
+		"destination": {"type": "CARD", "panToken": "tok"},
+		"amount": {"currency": "USD", "minor": 101},
+	}
+	request.update(overrides)
+	return request
+
+
+class ExplodingHttpClient:
+
+	def post(self, *args, **kwargs):  # noqa: ANN002, ANN003
+		raise AssertionError("network must not be called for malformed requests")
+
+
+@pytest.mark.parametrize("overrides, path", [
+	({"funding": {"type": "AFT", "status": "approved"}}, "$.funding.receiptId"),
+	({"destination": {"type": "WALLET"}}, "$.destination.walletId"),
+	({"amount": {"currency": "USD", "minor": "101"}}, "$.amount.minor"),
+	({"amount": {"currency": "USD", "minor": True}}, "$.amount.minor"),
+	({"destination": {"type": "SWIFT", "iban": "x"}}, "$.destination.type"),
+	({"preflight": {"corridor": {"sourceCountry": "GBR", "targetCountry": "PH"}}}, "$.preflight.corridor.sourceCountry"),
+])
+def test_malformed_requests_fail_before_side_effects(overrides, path) -> None:
+	receipts = InMemoryReceiptStore()
+	orch = Orchestrator(ExplodingHttpClient(), receipt_store=receipts)
+	with pytest.raises(SchemaValidationError) as exc:
+		orch.payout(make_request(**overrides))
+	assert exc.value.path == path
+	assert receipts.consume_once("AFT", "r-1") is True
+
+
+def test_valid_request_passes() -> None:
+	validate_payout_request(make_request(preflight={"fxLock": {"srcCurrency": "USD", "dstCurrency": "MXN", "amountMinor": 1}}))
+
+
+def test_policy_schema_rejects_unknown_rule_keys() -> None:
+	with pytest.raises(InvalidPolicyError, match=r"\$\.corridors\[0\]\.rules\.limits\.maxValue"):
+		policy_from_dict({"version": "1", "corridors": [{"sourceCountry": "GB", "targetCountry": "PH", "rules": {"limits": {"maxValue": 1}}}]})
+
+
+def test_conditions_are_boolean_predicates() -> None:
+	schema = {
+		"type": "object",
+		"required": ["kind"],
+		"properties": {"kind": {"enum": ["a", "b", 1]}, "n": {"type": "integer", "minimum": 1}, "tags": {"items": {"pattern": "^t"}}},
+		"additionalProperties": False,
+	}
+	validate = compile_schema(schema)
+	matches = _predicate(schema)
+	for instance in ({"kind": "a"}, {"kind": 1, "n": 3}, {"kind": True}, {"n": 1}, {"kind": "b", "n": 0},
+			{"kind": "a", "x": 1}, {"kind": "a", "tags": ["t1", "u"]}, {"kind": "a", "tags": ["t1"]}, []):
+		try:
+			validate(instance)
+			valid = True
+		except SchemaValidationError:
+			valid = False
+		assert matches(instance) is valid, instance
+
+
+def test_any_mapping_is_an_object() -> None:
+	from types import MappingProxyType
+
+	request = make_request(funding=MappingProxyType({"type": "AFT", "receiptId": "r-1", "status": "approved"}))
+	validate_payout_request(MappingProxyType(request))
+	with pytest.raises(SchemaValidationError) as exc:
+		validate_payout_request(MappingProxyType(make_request(destination=MappingProxyType({"type": "CARD"}))))
+	assert exc.value.path == "$.destination.panToken"
+
@@ -0,0 +1,104 @@
+import json
+import os
+from pathlib import Path
+
+from jwcrypto import jwe, jwk
+
+from visa_direct_sdk.transport import crypto_executor
+from visa_direct_sdk.transport.crypto_executor import JweCryptoExecutor
+from visa_direct_sdk.transport.secure_http_client import SecureHttpClient
+from visa_direct_sdk.utils.codec import StdlibJsonCodec
+
+ENDPOINTS = str(Path(__file__).resolve().parents[2] / "endpoints" / "endpoints.json")
+
+
+class FakeResponse:
+
+	def __init__(self, content: bytes, status_code: int = 200, jwks=None) -> None:
+		self.content = content
+		self.status_code = status_code
+		self.headers = {"content-type": "application/json"}
+		self._jwks = jwks
+
+	def raise_for_status(self) -> None:
+		pass
+
+	def json(self):
+		return self._jwks
+
+
+class FakeBackend:
+
+	def __init__(self, key: jwk.JWK = None) -> None:
+		self.key = key
+		self.sent = []
+
+	def get(self, url, timeout=None):  # noqa: ANN001
+		return FakeResponse(b"", jwks={"keys": [json.loads(self.key.export())]} if self.key else {"keys": []})
+
+	errors = ()
+
+	def post(self, url, data=None, headers=None):  # noqa: ANN001
+		self.sent.append((url, data, headers))
+		if headers.get("content-type") == "application/jose":
+			token = jwe.JWE()
+			token.deserialize(data.decode("ascii") if isinstance(data, bytes) else data, key=self.key)
+			body = json.loads(token.payload)
+			reply = jwe.JWE(json.dumps({"echo": body}).encode(), json.dumps({"alg": "RSA-OAEP-256", "enc": "A256GCM", "kid": self.key.get("kid")}))
+			reply.add_recipient(self.key)
+			return FakeResponse(reply.serialize(compact=True).encode("ascii"))
+		return FakeResponse(b'{"ok":true,"path":"' + url.encode() + b'"}')
+
+
+def make_client(backend: FakeBackend) -> SecureHttpClient:
+	os.environ.setdefault("SDK_ENV", "dev")
+	client = SecureHttpClient(base_url="http://visa.test", endpoints_file=ENDPOINTS, codec=StdlibJsonCodec(), backend=backend)
+	return client
+
+
+def test_plain_body_is_sent_as_compact_bytes_and_parsed_from_content() -> None:
+	backend = FakeBackend()
+	client = make_client(backend)
+	data, status, _ = client.post("/forexrates/v1/lock", {"src": "USD", "dst": "EUR"})
+	_, body, headers = backend.sent[0]
+	assert body == b'{"src":"USD","dst":"EUR"}'
+	assert headers["content-type"] == "application/json"
+	assert status == 200
+	assert data == {"ok": True, "path": "http://visa.test/forexrates/v1/lock"}
+
+
+def test_mle_round_trip_uses_codec_for_plaintext() -> None:
+	key = jwk.JWK.generate(kty="RSA", size=2048, kid="kid-1")
+	backend = FakeBackend(key)
+	client = make_client(backend)
+	data, _, _ = client.post("/visadirect/fundstransfer/v1/pushfunds", {"amount": {"minor": 101}})
+	assert backend.sent[0][2]["content-type"] == "application/jose"
+	assert data == {"echo": {"amount": {"minor": 101}}}
+
+
+def test_non_json_response_is_returned_as_text() -> None:
+	client = make_client(FakeBackend())
+	assert client._parse_maybe_json(b"accepted") == "accepted"
+
+
+def test_mle_round_trip_through_crypto_process_pool() -> None:
+	key = jwk.JWK.generate(kty="RSA", size=2048, kid="kid-pool")
+	backend = FakeBackend(key)
+	with JweCryptoExecutor(max_workers=2, keys=[json.loads(key.export())]) as executor:
+		client = make_client(backend)
+		client.crypto_executor = executor
+		data, _, _ = client.post("/accountpayouts/v1/payout", {"amount": {"minor": 7}})
+	assert data == {"echo": {"amount": {"minor": 7}}}
+
+
+def test_key_cache_separates_public_and_private_halves_and_is_bounded(monkeypatch) -> None:
+	monkeypatch.setattr(crypto_executor, "_KEY_CACHE", type(crypto_executor._KEY_CACHE)())
+	monkeypatch.setattr(crypto_executor, "KEY_CACHE_SIZE", 2)
+	key = jwk.JWK.generate(kty="RSA", size=2048, kid="kid-halves")
+	public, private = json.loads(key.export_public()), json.loads(key.export_private())
+	token = crypto_executor.encrypt_compact(b"x", public, json.dumps({"alg": "RSA-OAEP-256", "enc": "A256GCM", "kid": "kid-halves"}))
+	assert crypto_executor.decrypt_compact(token, private) == b"x"
+	assert len(crypto_executor._KEY_CACHE) == 2
+	crypto_executor.load_jwk({"kty": "oct", "kid": "other", "k": "c2VjcmV0"})
+	assert len(crypto_executor._KEY_CACHE) == 2
+	assert crypto_executor._key_id(public) not in crypto_executor._KEY_CACHE
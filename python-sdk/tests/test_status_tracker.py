@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from visa_direct_sdk.errors import PayoutStatusTimeout
+from visa_direct_sdk.services.status_tracker import PayoutStatusTracker, TimerWheel
+
+
+class FakeClock:
+
+	def __init__(self) -> None:
+		self.now = 1000.0
+
+	def __call__(self) -> float:
+		return self.now
+
+
+def test_timer_wheel_handles_multiple_revolutions() -> None:
+	clock = FakeClock()
+	wheel = TimerWheel(tick_seconds=1.0, slots=8, clock=clock)
+	wheel.schedule(3, "soon")
+	wheel.schedule(20, "later")
+	clock.now += 5
+	assert wheel.advance() == ["soon"]
+	clock.now += 10
+	assert wheel.advance() == []
+	clock.now += 10
+	assert wheel.advance() == ["later"] and len(wheel) == 0
+
+
+def test_tracker_backs_off_until_terminal() -> None:
+	clock = FakeClock()
+	polls = {}
+	statuses = {"p-1": ["pending", "pending", "executed"], "p-2": ["failed"]}
+
+	def fetch(payout_id):
+		polls.setdefault(payout_id, []).append(clock.now)
+		if payout_id == "p-missing":
+			raise LookupError("404")
+		return {"payoutId": payout_id, "status": statuses[payout_id].pop(0)}
+
+	tracker = PayoutStatusTracker(fetch=fetch, max_workers=0, initial_delay=1.0, jitter=0, max_attempts=3, tick_seconds=0.5, clock=clock)
+	done = []
+	f1 = tracker.track("p-1", callback=lambda f: done.append(f.result()["status"]))
+	f2 = tracker.track("p-2")
+	f3 = tracker.track("p-missing")
+	assert tracker.track("p-1") is f1
+	for _ in range(40):
+		clock.now += 0.5
+		tracker.run_once()
+	assert f1.result()["status"] == "executed" and done == ["executed"]
+	assert f2.result()["status"] == "failed"
+	with pytest.raises(PayoutStatusTimeout):
+		f3.result()
+	gaps = [round(b - a, 1) for a, b in zip(polls["p-1"], polls["p-1"][1:])]
+	assert gaps == [2.0, 4.0]
+	assert tracker.pending == 0
+
+
+def test_global_rate_cap_defers_backlog() -> None:
+	clock = FakeClock()
+	sent = []
+	tracker = PayoutStatusTracker(
+		fetch=lambda pid: sent.append(pid) or {"status": "executed"},
+		max_workers=0, max_polls_per_second=100, initial_delay=0.0, jitter=0, clock=clock,
+	)
+	futures = [tracker.track(f"p-{i}") for i in range(1000)]
+	clock.now += 0.2
+	first = tracker.run_once()
+	assert 100 <= first < 1000
+	deadline = time.monotonic() + 15
+	while tracker.pending and time.monotonic() < deadline:
+		time.sleep(0.05)
+		tracker.run_once()
+	assert all(f.done() for f in futures)
+	assert sent == [f"p-{i}" for i in range(1000)]
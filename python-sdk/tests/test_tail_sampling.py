@@ -0,0 +1,90 @@
+import time
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+from visa_direct_sdk.utils import otel
+from visa_direct_sdk.utils.tail_sampling import TailSamplingSpanProcessor
+
+
+def make(**kwargs):
+	exporter = InMemorySpanExporter()
+	sampler = TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), **kwargs)
+	provider = TracerProvider()
+	provider.add_span_processor(sampler)
+	return provider.get_tracer("test"), sampler, exporter
+
+
+def names(exporter):
+	return sorted(span.name for span in exporter.get_finished_spans())
+
+
+def test_keeps_only_interesting_traces() -> None:
+	tracer, sampler, exporter = make(latency_threshold_ms=50)
+	with tracer.start_as_current_span("fast"):
+		with tracer.start_as_current_span("fast.child"):
+			pass
+	with tracer.start_as_current_span("compensated"):
+		with tracer.start_as_current_span("compensated.child") as child:
+			child.add_event("orchestrator.compensation_emitted")
+	with tracer.start_as_current_span("failed"):
+		with tracer.start_as_current_span("failed.child") as child:
+			child.set_status(Status(StatusCode.ERROR))
+	with tracer.start_as_current_span("slow"):
+		time.sleep(0.06)
+	assert names(exporter) == ["compensated", "compensated.child", "failed", "failed.child", "slow"]
+	assert sampler.stats["kept_traces"] == 3 and sampler.stats["dropped_traces"] == 1
+	assert sampler.buffered_traces == 0
+
+
+def test_buffer_is_bounded() -> None:
+	tracer, sampler, exporter = make(max_traces=2, max_spans_per_trace=3)
+	roots = [tracer.start_span(f"root{i}") for i in range(3)]
+	for i, root in enumerate(roots):
+		with tracer.start_as_current_span(f"child{i}", context=trace.set_span_in_context(root)) as child:
+			if i == 0:
+				child.add_event("jwe.decrypt.retry_on_kid_miss")
+	# the third trace evicted the first, which was already marked interesting
+	assert sampler.buffered_traces == 2
+	assert sampler.stats["evicted_traces"] == 1
+	assert names(exporter) == ["child0"]
+
+	with tracer.start_as_current_span("wide"):
+		for i in range(5):
+			with tracer.start_as_current_span(f"w{i}") as span:
+				span.set_status(Status(StatusCode.ERROR))
+	assert sampler.stats["overflow_spans"] == 3
+	assert [n for n in names(exporter) if n.startswith("w")] == ["w0", "w1", "w2"]
+
+
+def test_orphaned_traces_expire() -> None:
+	now = [1000.0]
+	tracer, sampler, exporter = make(trace_timeout_seconds=10, clock=lambda: now[0])
+	root = tracer.start_span("never-ends")
+	with tracer.start_as_current_span("orphan", context=trace.set_span_in_context(root)):
+		pass
+	now[0] += 11
+	with tracer.start_as_current_span("later"):
+		pass
+	assert sampler.stats["expired_traces"] == 1 and sampler.buffered_traces == 0
+
+
+@pytest.fixture
+def restore_otel():
+	yield
+	otel.configure_otel(disabled=True)
+
+
+def test_configure_otel_wraps_exporter(restore_otel) -> None:
+	exporter = InMemorySpanExporter()
+	otel.configure_otel(exporter=exporter, batch=False, tail_latency_ms=10_000)
+	with otel.use_span("quick"):
+		pass
+	with pytest.raises(RuntimeError):
+		with otel.use_span("raised"):
+			raise RuntimeError("x")
+	assert names(exporter) == ["raised"]
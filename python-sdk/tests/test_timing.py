@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+from jwcrypto import jwk
+
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.transport.secure_http_client import SecureHttpClient
+from visa_direct_sdk.utils.timing import StageTimings, TimingCollector, collect_timings, current_timings, stage
+
+from test_secure_http_client import FakeBackend
+
+ENDPOINTS = str(Path(__file__).resolve().parents[2] / "endpoints" / "endpoints.json")
+
+
+def request(key):
+	return {
+		"originatorId": "o1",
+		"idempotencyKey": key,
+		"funding": {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": "c1"},
+		"destination": {"type": "CARD", "panToken": "tok_1"},
+		"amount": {"currency": "USD", "minor": 100},
+	}
+
+
+def make_client(monkeypatch):
+	monkeypatch.setenv("SDK_ENV", "production")
+	key = jwk.JWK.generate(kty="RSA", size=2048, kid="k1")
+	return SecureHttpClient(base_url="https://sandbox.example", endpoints_file=ENDPOINTS, backend=FakeBackend(key))
+
+
+def test_stage_is_noop_outside_a_collection() -> None:
+	assert current_timings() is None
+	assert stage("a") is stage("b")
+
+
+def test_side_channel_collects_sdk_stages(monkeypatch) -> None:
+	orch = Orchestrator(make_client(monkeypatch))
+	with collect_timings() as timings:
+		orch.payout(request("k1"))
+	stages = timings.as_dict()
+	for name in ("validate", "idempotency.get", "guards", "http", "jwe.encrypt", "network", "jwe.decrypt", "idempotency.put"):
+		assert name in stages, name
+	assert stages["http"] >= stages["jwe.encrypt"] + stages["network"]
+	assert timings.total_ns >= stages["http"] and timings.error is None
+	assert current_timings() is None
+
+
+def test_collector_callback_and_sampled_profile(monkeypatch) -> None:
+	seen = []
+	collector = TimingCollector(seen.append, profile_every=2, profile_limit=5)
+	orch = Orchestrator(make_client(monkeypatch), timing_collector=collector)
+	for i in range(4):
+		orch.payout(request(f"k{i}"))
+	assert len(seen) == 4 and all(isinstance(t, StageTimings) for t in seen)
+	assert [t.profile is not None for t in seen] == [False, True, False, True]
+	assert "cumulative" in seen[1].profile or "function calls" in seen[1].profile
+
+	outer = StageTimings()
+	with collect_timings(outer):
+		orch.payout(request("k-outer"))
+	# an explicit collection takes precedence over the orchestrator's collector
+	assert len(seen) == 4 and "http" in outer.as_dict()
+	json.dumps(outer.as_millis())
@@ -0,0 +1,124 @@
+import pytest
+
+from visa_direct_sdk.core.orchestrator import Orchestrator
+from visa_direct_sdk.errors import VelocityLimitExceeded
+from visa_direct_sdk.policy.corridor_policy import CorridorRules, compile_rules
+from visa_direct_sdk.policy.velocity import RedisVelocityStore, VelocityEngine, VelocityLimit
+
+RULES = compile_rules(CorridorRules(limits={"maxValueMinor": 25000, "dailyCountMax": 2}))
+
+
+def reserve(engine: VelocityEngine, originator: str = "fi-1", amount: int = 100, now: float = 1_700_000_000.0):
+	return engine.reserve(originator_id=originator, source_country="GB", target_country="PH", amount_minor=amount, rules=RULES, now=now)
+
+
+def test_corridor_limits_enforce_per_payout_value_and_daily_count() -> None:
+	engine = VelocityEngine()
+	with pytest.raises(VelocityLimitExceeded) as exc:
+		reserve(engine, amount=25001)
+	assert exc.value.limit == "corridor:GB>PH:maxValueMinor"
+	reserve(engine)
+	second = reserve(engine)
+	with pytest.raises(VelocityLimitExceeded):
+		reserve(engine)
+	reserve(engine, originator="fi-2")
+	second.rollback()
+	reserve(engine)
+	reserve(engine, now=1_700_000_000.0 + 86400)
+
+
+def test_sliding_value_window_expires_old_buckets() -> None:
+	engine = VelocityEngine(limits=[VelocityLimit("originator", window_seconds=60, max_value_minor=1000, sliding=True, buckets=6)])
+	reserve(engine, amount=600, now=1000.0)
+	with pytest.raises(VelocityLimitExceeded):
+		reserve(engine, amount=600, now=1030.0)
+	reserve(engine, amount=600, now=1065.0)
+
+
+def test_sliding_limits_with_different_bucket_widths_do_not_share_buckets() -> None:
+	engine = VelocityEngine(limits=[
+		VelocityLimit("originator", window_seconds=60, max_count=1, sliding=True, buckets=6),
+		VelocityLimit("originator", window_seconds=60, max_count=5, sliding=True, buckets=60),
+	])
+	reserve(engine, now=100.0)
+	# the 10s-bucket limit's bucket 100 is the 1s-bucket limit's bucket from t=100
+	reserve(engine, now=1000.0)
+
+
+class FakePipeline:
+
+	def __init__(self, data) -> None:
+		self.data = data
+		self.ops = []
+
+	def hincrby(self, name, field, amount):  # noqa: ANN001
+		self.ops.append(("hincrby", name, field, amount))
+
+	def expire(self, name, ttl):  # noqa: ANN001
+		self.ops.append(("expire", name, ttl))
+
+	def hmget(self, name, *fields):  # noqa: ANN001
+		self.ops.append(("hmget", name, fields))
+
+	def execute(self):
+		results = []
+		for op in self.ops:
+			if op[0] == "hincrby":
+				entry = self.data.setdefault(op[1], {})
+				entry[op[2]] = entry.get(op[2], 0) + op[3]
+				results.append(entry[op[2]])
+			elif op[0] == "expire":
+				results.append(True)
+			else:
+				entry = self.data.get(op[1], {})
+				results.append([entry.get(f) for f in op[2]])
+		return results
+
+
+class FakeRedis:
+
+	def __init__(self) -> None:
+		self.data = {}
+		self.pipelines = 0
+
+	def pipeline(self, transaction=True):  # noqa: ANN001
+		self.pipelines += 1
+		return FakePipeline(self.data)
+
+
+def test_redis_store_uses_one_pipeline_and_rolls_back_on_breach() -> None:
+	redis = FakeRedis()
+	engine = VelocityEngine(RedisVelocityStore(redis))
+	reserve(engine)
+	reserve(engine)
+	assert redis.pipelines == 2
+	with pytest.raises(VelocityLimitExceeded):
+		reserve(engine)
+	(counter,) = redis.data.values()
+	assert counter == {"count": 2, "value": 200}
+
+
+class FailingHttpClient:
+
+	def post(self, path, data, headers=None):  # noqa: ANN001
+		raise ConnectionError("gateway down")
+
+
+class SilentEmitter:
+
+	async def emit(self, event) -> None:  # noqa: ANN001
+		pass
+
+
+def test_orchestrator_rolls_back_reservation_when_payout_fails() -> None:
+	engine = VelocityEngine(limits=[VelocityLimit("originator", max_count=1)])
+	orch = Orchestrator(FailingHttpClient(), velocity_engine=engine, events=SilentEmitter())
+	request = {
+		"originatorId": "fi-1",
+		"funding": {"type": "INTERNAL", "debitConfirmed": True, "confirmationRef": "conf"},
+		"destination": {"type": "CARD", "panToken": "tok"},
+		"amount": {"currency": "USD", "minor": 101},
+	}
+	for key in ("v-1", "v-2"):
+		with pytest.raises(ConnectionError):
+			orch.payout({**request, "idempotencyKey": key})
@@ -1,8 +1,87 @@
-from .core.orchestrator import Orchestrator, LedgerNotConfirmed, AFTDeclined, PISFailed, ReceiptReused  # noqa: F401
-from .dx.builder import PayoutBuilder  # noqa: F401
-from .transport.secure_http_client import SecureHttpClient  # noqa: F401
-from .policy.corridor_policy import load_policy, get_rules, PolicyNotFoundError, CorridorRules, Corridor, Policy  # noqa: F401
-from .storage.idempotency_store import InMemoryIdempotencyStore, RedisIdempotencyStore, DynamoIdempotencyStore  # noqa: F401
-from .storage.receipt_store import InMemoryReceiptStore, RedisReceiptStore, DynamoReceiptStore  # noqa: F401
-from .storage.cache import InMemoryCache, DynamoCache  # noqa: F401
-from .client import VisaDirectClient, VisaDirectClientConfig  # noqa: F401
+"""Visa Direct SDK.
+
+Public names are resolved on first attribute access (PEP 562), so
+``import visa_direct_sdk`` loads nothing until a name is used, and using one
+loads only the submodule that defines it.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
+_EXPORTS: Dict[str, str] = {
+	"Orchestrator": ".core.orchestrator",
+	"LedgerNotConfirmed": ".core.orchestrator",
+	"AFTDeclined": ".core.orchestrator",
+	"PISFailed": ".core.orchestrator",
+	"ReceiptReused": ".core.orchestrator",
+	"PayoutRequest": ".core.models",
+	"Funding": ".core.models",
+	"Destination": ".core.models",
+	"Amount": ".core.models",
+	"Preflight": ".core.models",
+	"PayoutBuilder": ".dx.builder",
+	"PayoutTemplate": ".dx.template",
+	"SecureHttpClient": ".transport.secure_http_client",
+	"RateLimit": ".transport.rate_limiter",
+	"RateLimiter": ".transport.rate_limiter",
+	"InMemoryRateLimiter": ".transport.rate_limiter",
+	"RedisRateLimiter": ".transport.rate_limiter",
+	"load_policy": ".policy.corridor_policy",
+	"get_rules": ".policy.corridor_policy",
+	"compile_policy": ".policy.corridor_policy",
+	"PolicyNotFoundError": ".policy.corridor_policy",
+	"InvalidPolicyError": ".policy.corridor_policy",
+	"CorridorRules": ".policy.corridor_policy",
+	"Corridor": ".policy.corridor_policy",
+	"Policy": ".policy.corridor_policy",
+	"CompiledPolicy": ".policy.corridor_policy",
+	"CompiledRules": ".policy.corridor_policy",
+	"PolicyProvider": ".policy.provider",
+	"VelocityEngine": ".policy.velocity",
+	"VelocityLimit": ".policy.velocity",
+	"InMemoryVelocityStore": ".policy.velocity",
+	"RedisVelocityStore": ".policy.velocity",
+	"PayoutStatusTracker": ".services.status_tracker",
+	"InMemoryIdempotencyStore": ".storage.idempotency_store",
+	"RedisIdempotencyStore": ".storage.idempotency_store",
+	"DynamoIdempotencyStore": ".storage.idempotency_store",
+	"InMemoryReceiptStore": ".storage.receipt_store",
+	"RedisReceiptStore": ".storage.receipt_store",
+	"DynamoReceiptStore": ".storage.receipt_store",
+	"InMemoryCache": ".storage.cache",
+	"DynamoCache": ".storage.cache",
+	"VisaDirectClient": ".client",
+	"VisaDirectClientConfig": ".client",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(import_module(module, __name__), name)
+	globals()[name] = value  # later lookups skip __getattr__
+	return value
+
+
+def __dir__() -> List[str]:
+	return sorted(set(globals()) | set(_EXPORTS))
+
+
+if TYPE_CHECKING:  # pragma: no cover
+	from .core.orchestrator import Orchestrator, LedgerNotConfirmed, AFTDeclined, PISFailed, ReceiptReused  # noqa: F401
+	from .core.models import PayoutRequest, Funding, Destination, Amount, Preflight  # noqa: F401
+	from .dx.builder import PayoutBuilder  # noqa: F401
+	from .dx.template import PayoutTemplate  # noqa: F401
+	from .transport.secure_http_client import SecureHttpClient  # noqa: F401
+	from .transport.rate_limiter import RateLimit, RateLimiter, InMemoryRateLimiter, RedisRateLimiter  # noqa: F401
+	from .policy.corridor_policy import load_policy, get_rules, compile_policy, PolicyNotFoundError, InvalidPolicyError, CorridorRules, Corridor, Policy, CompiledPolicy, CompiledRules  # noqa: F401
+	from .policy.provider import PolicyProvider  # noqa: F401
+	from .policy.velocity import VelocityEngine, VelocityLimit, InMemoryVelocityStore, RedisVelocityStore  # noqa: F401
+	from .services.status_tracker import PayoutStatusTracker  # noqa: F401
+	from .storage.idempotency_store import InMemoryIdempotencyStore, RedisIdempotencyStore, DynamoIdempotencyStore  # noqa: F401
+	from .storage.receipt_store import InMemoryReceiptStore, RedisReceiptStore, DynamoReceiptStore  # noqa: F401
+	from .storage.cache import InMemoryCache, DynamoCache  # noqa: F401
+	from .client import VisaDirectClient, VisaDirectClientConfig  # noqa: F401
@@ -5,11 +5,9 @@ from .core.orchestrator import Orchestrator
 from .dx.builder import PayoutBuilder
 from .storage.idempotency_store import RedisIdempotencyStore
 from .storage.receipt_store import RedisReceiptStore
-
-try:
-    import redis
-except ImportError:
-    redis = None
+from .transport.rate_limiter import RateLimiter
+from .utils.recording import TrafficRecorder
+from .utils.timing import TimingCollector
 
 
 class VisaDirectClientConfig:
@@ -25,6 +23,9 @@ class VisaDirectClientConfig:
         password: Optional[str] = None,
         api_key: Optional[str] = None,
         shared_secret: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        timing_collector: Optional[TimingCollector] = None,
+        traffic_recorder: Optional[TrafficRecorder] = None,
     ):
         self.base_url = base_url or os.getenv("VISA_BASE_URL")
         self.cert_path = cert_path or os.getenv("VISA_CERT_PATH")
@@ -36,6 +37,9 @@ class VisaDirectClientConfig:
         self.password = password or os.getenv("VISA_PASSWORD")
         self.api_key = api_key or os.getenv("VISA_API_KEY")
         self.shared_secret = shared_secret or os.getenv("VISA_SHARED_SECRET")
+        self.rate_limiter = rate_limiter
+        self.timing_collector = timing_collector
+        self.traffic_recorder = traffic_recorder
 
 
 class VisaDirectClient:
@@ -49,15 +53,22 @@ class VisaDirectClient:
             cert_path=config.cert_path,
             key_path=config.key_path,
             ca_path=config.ca_path,
+            rate_limiter=config.rate_limiter,
+            recorder=config.traffic_recorder,
         )
 
         # Initialize Redis if URL provided
         self.redis_client = None
-        if config.redis_url and redis:
-            self.redis_client = redis.from_url(config.redis_url)
+        if config.redis_url:
+            try:
+                import redis
+            except ImportError:
+                redis = None
+            if redis:
+                self.redis_client = redis.from_url(config.redis_url)
 
         # Create orchestrator with Redis stores
-        orchestrator_options = {}
+        orchestrator_options = {"timing_collector": config.timing_collector, "recorder": config.traffic_recorder}
         if self.redis_client:
             orchestrator_options.update({
                 "idempotency_store": RedisIdempotencyStore(self.redis_client),
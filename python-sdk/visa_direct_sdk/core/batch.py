@@ -0,0 +1,50 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+@dataclass
+class BatchOutcome:
+	item: Any
+	result: Any = None
+	error: Optional[Exception] = None
+
+	@property
+	def ok(self) -> bool:
+		return self.error is None
+
+
+def run_batch(
+	call: Callable[[Any], Any],
+	items: Iterable[Any],
+	*,
+	max_workers: int = 8,
+	max_in_flight: Optional[int] = None,
+) -> Iterator[BatchOutcome]:
+	"""Apply ``call`` to each item on a thread pool and yield outcomes as they complete.
+
+	``items`` is consumed lazily and at most ``max_in_flight`` (default
+	``2 * max_workers``) calls are pending at once, so arbitrarily long
+	iterables run in bounded memory. Per-item exceptions are captured on the
+	outcome instead of aborting the batch.
+	"""
+	window = max_in_flight or max_workers * 2
+	pending: Dict[Future, Any] = {}
+	source = iter(items)
+	with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="payout-batch") as pool:
+		exhausted = False
+		while True:
+			while not exhausted and len(pending) < window:
+				try:
+					item = next(source)
+				except StopIteration:
+					exhausted = True
+					break
+				pending[pool.submit(call, item)] = item
+			if not pending:
+				return
+			done, _ = wait(pending, return_when=FIRST_COMPLETED)
+			for future in done:
+				item = pending.pop(future)
+				error = future.exception()
+				yield BatchOutcome(item, None if error else future.result(), error)
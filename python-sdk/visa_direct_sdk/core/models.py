@@ -0,0 +1,332 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from ..errors import SchemaValidationError
+from ..policy.corridor_policy import CompiledRules
+
+# The models check their own fields against payout-request.schema.json when
+# they are constructed, so a typed request is validated once, where it is built,
+# and never has to be turned back into a dict for the schema.
+
+_FUNDING_TYPES = ("INTERNAL", "AFT", "PIS")
+_DESTINATION_TYPES = ("CARD", "ACCOUNT", "WALLET", "ALIAS")
+_DESTINATION_REQUIRED = {"CARD": "pan_token", "ACCOUNT": "account_id", "WALLET": "wallet_id", "ALIAS": "alias"}
+_DESTINATION_WIRE_NAMES = {"pan_token": "panToken", "account_id": "accountId", "wallet_id": "walletId", "alias": "alias"}
+
+
+def _string(path: str, value: Any, lo: int = 0, hi: Optional[int] = None, *, optional: bool = False) -> None:
+	if value is None and optional:
+		return
+	if not isinstance(value, str):
+		raise SchemaValidationError(path, "expected string")
+	if len(value) < lo or (hi is not None and len(value) > hi):
+		raise SchemaValidationError(path, f"length must be between {lo} and {hi if hi is not None else 'unbounded'}")
+
+
+def _minor(path: str, value: Any, *, optional: bool = False) -> None:
+	if value is None and optional:
+		return
+	if not isinstance(value, int) or isinstance(value, bool):
+		raise SchemaValidationError(path, "expected integer")
+	if value < 0:
+		raise SchemaValidationError(path, "must be >= 0")
+
+
+def _one_of(path: str, value: Any, allowed: Tuple[str, ...]) -> None:
+	if not isinstance(value, str) or value not in allowed:
+		raise SchemaValidationError(path, f"must be one of {list(allowed)}")
+
+
+def _instance(path: str, value: Any, cls: type, *, optional: bool = False) -> None:
+	if value is None and optional:
+		return
+	if not isinstance(value, cls):
+		raise SchemaValidationError(path, f"expected {cls.__name__}")
+
+
+@dataclass(frozen=True, slots=True)
+class Amount:
+	currency: str
+	minor: int
+
+	def __post_init__(self) -> None:
+		_string("$.amount.currency", self.currency, 3, 3)
+		_minor("$.amount.minor", self.minor)
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "Amount":
+		return cls(data["currency"], data["minor"])
+
+	def to_wire(self) -> Dict[str, Any]:
+		return {"currency": self.currency, "minor": self.minor}
+
+
+@dataclass(frozen=True, slots=True)
+class Funding:
+	type: str
+	debit_confirmed: Optional[bool] = None
+	confirmation_ref: Optional[str] = None
+	receipt_id: Optional[str] = None
+	payment_id: Optional[str] = None
+	status: Optional[str] = None
+
+	def __post_init__(self) -> None:
+		_one_of("$.funding.type", self.type, _FUNDING_TYPES)
+		if self.debit_confirmed is not None and not isinstance(self.debit_confirmed, bool):
+			raise SchemaValidationError("$.funding.debitConfirmed", "expected boolean")
+		_string("$.funding.confirmationRef", self.confirmation_ref, optional=True)
+		_string("$.funding.receiptId", self.receipt_id, 1, optional=True)
+		_string("$.funding.paymentId", self.payment_id, 1, optional=True)
+		_string("$.funding.status", self.status, optional=True)
+		if self.type == "AFT" and self.receipt_id is None:
+			raise SchemaValidationError("$.funding.receiptId", "is required")
+		if self.type == "PIS" and self.payment_id is None:
+			raise SchemaValidationError("$.funding.paymentId", "is required")
+
+	@classmethod
+	def internal(cls, debit_confirmed: bool, confirmation_ref: str) -> "Funding":
+		return cls("INTERNAL", debit_confirmed=debit_confirmed, confirmation_ref=confirmation_ref)
+
+	@classmethod
+	def aft(cls, receipt_id: str, status: str) -> "Funding":
+		return cls("AFT", receipt_id=receipt_id, status=status)
+
+	@classmethod
+	def pis(cls, payment_id: str, status: str) -> "Funding":
+		return cls("PIS", payment_id=payment_id, status=status)
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "Funding":
+		return cls(
+			data["type"],
+			data.get("debitConfirmed"),
+			data.get("confirmationRef"),
+			data.get("receiptId"),
+			data.get("paymentId"),
+			data.get("status"),
+		)
+
+	def to_wire(self) -> Dict[str, Any]:
+		wire: Dict[str, Any] = {"type": self.type}
+		if self.debit_confirmed is not None:
+			wire["debitConfirmed"] = self.debit_confirmed
+		if self.confirmation_ref is not None:
+			wire["confirmationRef"] = self.confirmation_ref
+		if self.receipt_id is not None:
+			wire["receiptId"] = self.receipt_id
+		if self.payment_id is not None:
+			wire["paymentId"] = self.payment_id
+		if self.status is not None:
+			wire["status"] = self.status
+		return wire
+
+
+@dataclass(frozen=True, slots=True)
+class Destination:
+	type: str
+	pan_token: Optional[str] = None
+	account_id: Optional[str] = None
+	wallet_id: Optional[str] = None
+	alias: Optional[str] = None
+	alias_type: Optional[str] = None
+
+	def __post_init__(self) -> None:
+		_one_of("$.destination.type", self.type, _DESTINATION_TYPES)
+		_string("$.destination.panToken", self.pan_token, 1, optional=True)
+		_string("$.destination.accountId", self.account_id, 1, optional=True)
+		_string("$.destination.walletId", self.wallet_id, 1, optional=True)
+		_string("$.destination.alias", self.alias, 1, optional=True)
+		_string("$.destination.aliasType", self.alias_type, optional=True)
+		required = _DESTINATION_REQUIRED[self.type]
+		if getattr(self, required) is None:
+			raise SchemaValidationError(f"$.destination.{_DESTINATION_WIRE_NAMES[required]}", "is required")
+
+	@classmethod
+	def card(cls, pan_token: str) -> "Destination":
+		return cls("CARD", pan_token=pan_token)
+
+	@classmethod
+	def account(cls, account_id: str) -> "Destination":
+		return cls("ACCOUNT", account_id=account_id)
+
+	@classmethod
+	def wallet(cls, wallet_id: str) -> "Destination":
+		return cls("WALLET", wallet_id=wallet_id)
+
+	@classmethod
+	def via_alias(cls, alias: str, alias_type: str = "EMAIL") -> "Destination":
+		return cls("ALIAS", alias=alias, alias_type=alias_type)
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "Destination":
+		return cls(
+			data["type"],
+			data.get("panToken"),
+			data.get("accountId"),
+			data.get("walletId"),
+			data.get("alias"),
+			data.get("aliasType"),
+		)
+
+	def to_wire(self) -> Dict[str, Any]:
+		wire: Dict[str, Any] = {"type": self.type}
+		if self.pan_token is not None:
+			wire["panToken"] = self.pan_token
+		if self.account_id is not None:
+			wire["accountId"] = self.account_id
+		if self.wallet_id is not None:
+			wire["walletId"] = self.wallet_id
+		if self.alias is not None:
+			wire["alias"] = self.alias
+		if self.alias_type is not None:
+			wire["aliasType"] = self.alias_type
+		return wire
+
+
+@dataclass(frozen=True, slots=True)
+class FxLock:
+	src_currency: str
+	dst_currency: str
+	amount_minor: Optional[int] = None
+
+	def __post_init__(self) -> None:
+		_string("$.preflight.fxLock.srcCurrency", self.src_currency, 3, 3)
+		_string("$.preflight.fxLock.dstCurrency", self.dst_currency, 3, 3)
+		_minor("$.preflight.fxLock.amountMinor", self.amount_minor, optional=True)
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "FxLock":
+		return cls(data["srcCurrency"], data["dstCurrency"], data.get("amountMinor"))
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {"srcCurrency": self.src_currency, "dstCurrency": self.dst_currency, "amountMinor": self.amount_minor}
+
+
+@dataclass(frozen=True, slots=True)
+class PayoutCorridor:
+	source_country: str
+	target_country: str
+	source_currency: Optional[str] = None
+	target_currency: Optional[str] = None
+
+	def __post_init__(self) -> None:
+		_string("$.preflight.corridor.sourceCountry", self.source_country, 2, 2)
+		_string("$.preflight.corridor.targetCountry", self.target_country, 2, 2)
+		_string("$.preflight.corridor.sourceCurrency", self.source_currency, optional=True)
+		_string("$.preflight.corridor.targetCurrency", self.target_currency, optional=True)
+
+	@property
+	def label(self) -> str:
+		return f"{self.source_country}->{self.target_country}"
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "PayoutCorridor":
+		return cls(data["sourceCountry"], data["targetCountry"], data.get("sourceCurrency"), data.get("targetCurrency"))
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {
+			"sourceCountry": self.source_country,
+			"targetCountry": self.target_country,
+			"sourceCurrency": self.source_currency,
+			"targetCurrency": self.target_currency,
+		}
+
+
+@dataclass(frozen=True, slots=True)
+class Preflight:
+	fx_lock: Optional[FxLock] = None
+	corridor: Optional[PayoutCorridor] = None
+	compliance_payload: Optional[Mapping[str, Any]] = None
+	# resolved ahead of time (e.g. by PayoutBuilder) so the orchestrator skips the lookup
+	corridor_rules: Optional[CompiledRules] = None
+
+	def __post_init__(self) -> None:
+		_instance("$.preflight.fxLock", self.fx_lock, FxLock, optional=True)
+		_instance("$.preflight.corridor", self.corridor, PayoutCorridor, optional=True)
+		_instance("$.preflight.compliancePayload", self.compliance_payload, Mapping, optional=True)
+
+	@classmethod
+	def from_dict(cls, data: Optional[Mapping[str, Any]]) -> "Preflight":
+		if not data:
+			return NO_PREFLIGHT
+		fx_lock = data.get("fxLock")
+		corridor = data.get("corridor")
+		rules = data.get("corridorRules")
+		return cls(
+			FxLock.from_dict(fx_lock) if fx_lock else None,
+			PayoutCorridor.from_dict(corridor) if corridor else None,
+			data.get("compliancePayload"),
+			rules if isinstance(rules, CompiledRules) else None,
+		)
+
+	def to_dict(self) -> Dict[str, Any]:
+		data: Dict[str, Any] = {}
+		if self.fx_lock is not None:
+			data["fxLock"] = self.fx_lock.to_dict()
+		if self.corridor is not None:
+			data["corridor"] = self.corridor.to_dict()
+		if self.compliance_payload is not None:
+			data["compliancePayload"] = dict(self.compliance_payload)
+		return data
+
+
+NO_PREFLIGHT = Preflight()
+
+
+@dataclass(frozen=True, slots=True)
+class PayoutRequest:
+	"""Immutable payout request.
+
+	Built directly (e.g. by :class:`PayoutBuilder`) or from the documented dict
+	shape via :meth:`from_dict`; :meth:`to_wire` is the only place the outbound
+	payload is assembled.
+	"""
+
+	originator_id: str
+	idempotency_key: str
+	funding: Funding
+	destination: Destination
+	amount: Amount
+	preflight: Preflight = NO_PREFLIGHT
+
+	def __post_init__(self) -> None:
+		# nested models validated themselves when they were built
+		_string("$.originatorId", self.originator_id, 1)
+		_string("$.idempotencyKey", self.idempotency_key, 1)
+		_instance("$.funding", self.funding, Funding)
+		_instance("$.destination", self.destination, Destination)
+		_instance("$.amount", self.amount, Amount)
+		_instance("$.preflight", self.preflight, Preflight)
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "PayoutRequest":
+		return cls(
+			data["originatorId"],
+			data["idempotencyKey"],
+			Funding.from_dict(data["funding"]),
+			Destination.from_dict(data["destination"]),
+			Amount.from_dict(data["amount"]),
+			Preflight.from_dict(data.get("preflight")),
+		)
+
+	def to_dict(self) -> Dict[str, Any]:
+		data = {
+			"originatorId": self.originator_id,
+			"idempotencyKey": self.idempotency_key,
+			"funding": self.funding.to_wire(),
+			"destination": self.destination.to_wire(),
+			"amount": self.amount.to_wire(),
+		}
+		preflight = self.preflight.to_dict()
+		if preflight:
+			data["preflight"] = preflight
+		return data
+
+	def to_wire(self, destination: Optional[Destination] = None, fx_quote_id: Optional[str] = None) -> Dict[str, Any]:
+		return {
+			"originatorId": self.originator_id,
+			"funding": self.funding.to_wire(),
+			"destination": (destination or self.destination).to_wire(),
+			"amount": self.amount.to_wire(),
+			"fxQuoteId": fx_quote_id,
+		}
@@ -1,16 +1,24 @@
-from dataclasses import dataclass
-from typing import Dict, Any, Union, Optional, Tuple
+import time
+from typing import Dict, Any, Iterable, Iterator, Mapping, Union, Optional, Tuple
 from datetime import datetime, timezone
 
 from ..transport.secure_http_client import SecureHttpClient
 from ..storage.idempotency_store import IdempotencyStore, InMemoryIdempotencyStore
 from ..storage.receipt_store import ReceiptStore, InMemoryReceiptStore
 from ..utils.events import LogEmitter
+from ..utils.metrics import get_metrics
 from ..utils.otel import use_span
+from ..utils.recording import TrafficRecorder
+from ..utils.timing import TimingCollector, current_timings, stage
 from ..services.recipient_service import RecipientService
 from ..services.quoting_service import QuotingService
 from ..services.compliance_service import ComplianceService
-from ..policy.corridor_policy import get_rules, load_policy
+from ..policy.corridor_policy import CompiledPolicy, CompiledRules, compile_policy, load_policy
+from ..policy.provider import PolicyProvider
+from ..policy.velocity import VelocityEngine, VelocityReservation
+from .batch import BatchOutcome, run_batch
+from .models import Amount, Destination, PayoutCorridor, PayoutRequest, Preflight  # noqa: F401
+from .validation import validate_payout_request
 from ..errors import DestinationNotAllowedError, QuoteExpiredError, QuoteRequiredError
 
 
@@ -33,12 +41,6 @@ class ReceiptReused(Exception):
 _DEFAULT_IDEM_TTL_SECONDS = 3600
 
 
-@dataclass
-class Amount:
-	currency: str
-	minor: int
-
-
 class Orchestrator:
 
 	def __init__(
@@ -51,6 +53,10 @@ class Orchestrator:
 		recipient_service: Union[RecipientService, None] = None,
 		quoting_service: Union[QuotingService, None] = None,
 		compliance_service: Union[ComplianceService, None] = None,
+		policy_provider: Union[PolicyProvider, None] = None,
+		velocity_engine: Union[VelocityEngine, None] = None,
+		timing_collector: Union[TimingCollector, None] = None,
+		recorder: Union[TrafficRecorder, None] = None,
 	) -> None:
 		self.http = http
 		self.idem = idempotency_store or InMemoryIdempotencyStore()
@@ -59,115 +65,205 @@ class Orchestrator:
 		self.recipient_service = recipient_service or RecipientService(http)
 		self.quoting_service = quoting_service or QuotingService(http)
 		self.compliance_service = compliance_service or ComplianceService(http)
-		self._corridor_policy = None
-
-	def payout(self, req: Dict[str, Any]) -> Any:
-		with use_span("orchestrator.payout", {
-			"visa.destination.type": req.get("destination", {}).get("type"),
-			"visa.amount.currency": req.get("amount", {}).get("currency"),
-			"visa.fx.lock_hint": bool(req.get("preflight", {}).get("fxLock")),
-		}) as span:
-			idem_key = req["idempotencyKey"]
-			cached = self.idem.get(idem_key)
-			if cached is not None:
-				if span:
-					span.add_event("idempotency.hit")
-				return cached
-
-			funding = req["funding"]
-			ftype = funding["type"]
-
-			with use_span("orchestrator.guards", {"visa.funding.type": ftype}):
-				if ftype == "INTERNAL":
-					if not funding.get("debitConfirmed") or not funding.get("confirmationRef"):
-						raise LedgerNotConfirmed("Internal ledger debit not confirmed")
-				elif ftype == "AFT":
-					receipt_id = funding["receiptId"]
-					if not self.receipts.consume_once("AFT", receipt_id):
-						raise ReceiptReused("AFT receipt already used")
-					if funding.get("status") != "approved":
-						raise AFTDeclined("AFT not approved")
-				elif ftype == "PIS":
-					pid = funding["paymentId"]
-					if not self.receipts.consume_once("PIS", pid):
-						raise ReceiptReused("PIS payment already used")
-					if funding.get("status") != "executed":
-						raise PISFailed("PIS not executed")
-
-			destination, fx_quote_id = self._run_preflight(req, span)
-			dtype = destination["type"]
-			if dtype == "CARD":
-				path = "/visadirect/fundstransfer/v1/pushfunds"
-			elif dtype == "ACCOUNT":
-				path = "/accountpayouts/v1/payout"
-			elif dtype == "WALLET":
-				path = "/walletpayouts/v1/payout"
-			else:
-				raise ValueError("Unknown destination type")
-
-			headers = {"x-idempotency-key": idem_key}
-			data = {
-				"originatorId": req["originatorId"],
-				"funding": funding,
-				"destination": destination,
-				"amount": req["amount"],
-				"fxQuoteId": fx_quote_id,
-			}
-			try:
+		self.policy_provider = policy_provider
+		self.velocity = velocity_engine
+		self.timing_collector = timing_collector
+		self.recorder = recorder
+		self._corridor_policy: Optional[CompiledPolicy] = None
+
+	def corridor_policy(self) -> CompiledPolicy:
+		if self.policy_provider is not None:
+			return self.policy_provider.current()
+		if self._corridor_policy is None:
+			self._corridor_policy = compile_policy(load_policy())
+		return self._corridor_policy
+
+	def payout(self, req: Union[PayoutRequest, Mapping[str, Any]]) -> Any:
+		if self.recorder is None:
+			return self._collected_payout(req)
+		started = time.perf_counter_ns()
+		try:
+			result = self._collected_payout(req)
+		except BaseException as exc:
+			self.recorder.record_payout(req, started, error=exc)
+			raise
+		self.recorder.record_payout(req, started, result=result)
+		return result
+
+	def _collected_payout(self, req: Union[PayoutRequest, Mapping[str, Any]]) -> Any:
+		if self.timing_collector is not None and current_timings() is None:
+			with self.timing_collector.collect():
+				return self._payout(req)
+		return self._payout(req)
+
+	def _payout(self, req: Union[PayoutRequest, Mapping[str, Any]]) -> Any:
+		with stage("validate"):
+			# typed requests validated their fields when they were constructed
+			if not isinstance(req, PayoutRequest):
+				validate_payout_request(req)
+				req = PayoutRequest.from_dict(req)
+		metrics = get_metrics()
+		started = time.perf_counter_ns()
+		outcome = "error"
+		try:
+			with use_span("orchestrator.payout", lambda: {
+				"visa.destination.type": req.destination.type,
+				"visa.amount.currency": req.amount.currency,
+				"visa.fx.lock_hint": req.preflight.fx_lock is not None,
+			}) as span:
+				idem_key = req.idempotency_key
+				with stage("idempotency.get"):
+					cached = self.idem.get(idem_key)
+				if cached is not None:
+					outcome = "idempotent"
+					metrics.counter("visa_sdk_idempotency_hits_total").inc()
+					if span:
+						span.add_event("idempotency.hit")
+					return cached
+
+				with stage("policy"):
+					rules = self._corridor_rules_for(req.preflight)
+				reservation = self._reserve_velocity(req, rules)
+				try:
+					result = self._execute(req, idem_key, rules, span)
+				except BaseException:
+					if reservation is not None:
+						reservation.rollback()
+					raise
+				outcome = "ok"
+				return result
+		finally:
+			metrics.timer("visa_sdk_payout_seconds", destination=req.destination.type, outcome=outcome).observe_ns(time.perf_counter_ns() - started)
+
+	def payout_batch(
+		self,
+		requests: Iterable[Union[PayoutRequest, Mapping[str, Any]]],
+		*,
+		max_workers: int = 8,
+		max_in_flight: Optional[int] = None,
+	) -> Iterator[BatchOutcome]:
+		return run_batch(self.payout, requests, max_workers=max_workers, max_in_flight=max_in_flight)
+
+	def _execute(self, req: PayoutRequest, idem_key: str, rules: Optional[CompiledRules], span=None) -> Any:
+		funding = req.funding
+		ftype = funding.type
+		metrics = get_metrics()
+
+		with use_span("orchestrator.guards", lambda: {"visa.funding.type": ftype}), metrics.timer("visa_sdk_stage_seconds", stage="guards").time(), stage("guards"):
+			if ftype == "INTERNAL":
+				if not funding.debit_confirmed or not funding.confirmation_ref:
+					raise LedgerNotConfirmed("Internal ledger debit not confirmed")
+			elif ftype == "AFT":
+				if not self.receipts.consume_once("AFT", funding.receipt_id):
+					metrics.counter("visa_sdk_receipt_reuse_rejections_total", funding="AFT").inc()
+					raise ReceiptReused("AFT receipt already used")
+				if funding.status != "approved":
+					raise AFTDeclined("AFT not approved")
+			elif ftype == "PIS":
+				if not self.receipts.consume_once("PIS", funding.payment_id):
+					metrics.counter("visa_sdk_receipt_reuse_rejections_total", funding="PIS").inc()
+					raise ReceiptReused("PIS payment already used")
+				if funding.status != "executed":
+					raise PISFailed("PIS not executed")
+
+		destination, fx_quote_id = self._run_preflight(req, span, rules)
+		dtype = destination.type
+		if dtype == "CARD":
+			path = "/visadirect/fundstransfer/v1/pushfunds"
+		elif dtype == "ACCOUNT":
+			path = "/accountpayouts/v1/payout"
+		elif dtype == "WALLET":
+			path = "/walletpayouts/v1/payout"
+		else:
+			raise ValueError("Unknown destination type")
+
+		headers = {"x-idempotency-key": idem_key}
+		data = req.to_wire(destination, fx_quote_id)
+		try:
+			with stage("http"):
 				res_data, _, _ = self.http.post(path, data, headers=headers)
-				self.idem.put(idem_key, res_data, _DEFAULT_IDEM_TTL_SECONDS)
-				return res_data
-			except Exception as e:  # noqa: BLE001
-				if span:
-					span.add_event("orchestrator.compensation_emitted")
-				# Best-effort compensation event emission (no await guaranteed)
-				import asyncio
-				payload = {
-					"event": "payout_failed_requires_compensation",
-					"sagaId": idem_key,
-					"funding": funding,
-					"reason": "NetworkError",
-					"metadata": {"message": str(e)},
-					"timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-				}
-				data = {k: payload[k] for k in payload}
+		except Exception as e:  # noqa: BLE001
+			if span:
+				span.add_event("orchestrator.compensation_emitted")
+			metrics.counter("visa_sdk_compensation_events_total").inc()
+			self._emit_compensation({
+				"event": "payout_failed_requires_compensation",
+				"sagaId": idem_key,
+				"funding": data["funding"],
+				"reason": "NetworkError",
+				"metadata": {"message": str(e)},
+				"timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+			})
+			raise
+		with stage("idempotency.put"):
+			self.idem.put(idem_key, res_data, _DEFAULT_IDEM_TTL_SECONDS)
+		return res_data
+
+	def _emit_compensation(self, payload: Dict[str, Any]) -> None:
+		# Best-effort compensation event emission (no await guaranteed); asyncio is
+		# imported here, on the failure path, because it is costly at SDK import
+		import asyncio
+
 		try:
 			loop = asyncio.get_running_loop()
 		except RuntimeError:
-			asyncio.run(self.events.emit(data))
+			asyncio.run(self.events.emit(payload))
 		else:
-			loop.create_task(self.events.emit(data))
-		raise
+			loop.create_task(self.events.emit(payload))
+
+	def _corridor_rules_for(self, preflight: Preflight) -> Optional[CompiledRules]:
+		if preflight.corridor is None:
+			return None
+		rules = preflight.corridor_rules
+		# rules resolved ahead of time (templates) are stale once the policy is swapped
+		if rules is not None and rules.policy_version == self.corridor_policy().version:
+			return rules
+		return self._resolve_corridor_rules(preflight.corridor)
+
+	def _reserve_velocity(self, req: PayoutRequest, rules: Optional[CompiledRules]) -> Optional[VelocityReservation]:
+		if self.velocity is None:
+			return None
+		corridor = req.preflight.corridor
+		with use_span("orchestrator.velocity"), get_metrics().timer("visa_sdk_stage_seconds", stage="velocity").time(), stage("velocity"):
+			return self.velocity.reserve(
+				originator_id=req.originator_id,
+				source_country=corridor.source_country if corridor else "*",
+				target_country=corridor.target_country if corridor else "*",
+				amount_minor=req.amount.minor,
+				rules=rules,
+			)
 
-	def _run_preflight(self, req: Dict[str, Any], span=None) -> Tuple[Dict[str, Any], Optional[str]]:
-		destination = dict(req["destination"])
-		preflight = dict(req.get("preflight") or {})
+	def _run_preflight(self, req: PayoutRequest, span=None, rules: Optional[CompiledRules] = None) -> Tuple[Destination, Optional[str]]:
+		destination = req.destination
+		preflight = req.preflight
+		metrics = get_metrics()
 
-		if destination.get("type") == "ALIAS":
-			with use_span("orchestrator.preflight.alias", {"visa.alias.type": destination.get("aliasType", "EMAIL")}):
-				alias_result = self.recipient_service.resolve_alias(destination["alias"], destination.get("aliasType", "EMAIL"))
+		if destination.type == "ALIAS":
+			alias_type = destination.alias_type or "EMAIL"
+			with use_span("orchestrator.preflight.alias", lambda: {"visa.alias.type": alias_type}), metrics.timer("visa_sdk_stage_seconds", stage="alias").time(), stage("preflight.alias"):
+				alias_result = self.recipient_service.resolve_alias(destination.alias, alias_type)
 				self.recipient_service.pav(alias_result["panToken"])
 				ftai_result = self.recipient_service.ftai(alias_result["panToken"])
 				if ftai_result.get("octEligible") is False:
 					raise ValueError("Destination panToken not OCT eligible")
-				destination = {"type": "CARD", "panToken": alias_result["panToken"]}
+				destination = Destination.card(alias_result["panToken"])
 
-		compliance_payload = preflight.get("compliancePayload")
+		compliance_payload = preflight.compliance_payload
 		if compliance_payload:
-			with use_span("orchestrator.preflight.compliance"):
+			with use_span("orchestrator.preflight.compliance"), metrics.timer("visa_sdk_stage_seconds", stage="compliance").time(), stage("preflight.compliance"):
 				result = self.compliance_service.screen(compliance_payload)
 				if not result.get("approved", True):
 					raise ValueError("Compliance screening failed")
 
 		fx_quote_id: Optional[str] = None
-		if "fxLock" in preflight:
-			params = preflight["fxLock"]
-			with use_span("orchestrator.preflight.fx", {
-				"visa.fx.src": params.get("srcCurrency"),
-				"visa.fx.dst": params.get("dstCurrency"),
-			}):
-				amount_minor = params.get("amountMinor") or req["amount"]["minor"]
-				quote = self.quoting_service.lock(params["srcCurrency"], params["dstCurrency"], amount_minor)
+		fx_lock = preflight.fx_lock
+		if fx_lock is not None:
+			with use_span("orchestrator.preflight.fx", lambda: {
+				"visa.fx.src": fx_lock.src_currency,
+				"visa.fx.dst": fx_lock.dst_currency,
+			}), metrics.timer("visa_sdk_stage_seconds", stage="fx").time(), stage("preflight.fx"):
+				amount_minor = fx_lock.amount_minor or req.amount.minor
+				quote = self.quoting_service.lock(fx_lock.src_currency, fx_lock.dst_currency, amount_minor)
 				expires = datetime.fromisoformat(quote["expiresAt"].replace("Z", "+00:00"))
 				if expires <= datetime.now(expires.tzinfo or timezone.utc):
 					raise QuoteExpiredError("Quote expired")
@@ -176,37 +272,32 @@ class Orchestrator:
 			raise QuoteRequiredError("Quote required for cross-border payout")
 
 		if span:
-			span.set_attribute("visa.destination.final_type", destination["type"])
-
-		corridor = preflight.get("corridor")
-		if corridor:
-			rules = self._resolve_corridor_rules(corridor)
-			if rules.rails and rules.rails.get("allowedDestinations"):
-				dest_type = self._map_destination_type(destination["type"])
-				if dest_type not in rules.rails["allowedDestinations"]:
-					raise DestinationNotAllowedError(
-						f"Destination {dest_type} not permitted for corridor {corridor['sourceCountry']}->{corridor['targetCountry']}"
-					)
-			if rules.fx and rules.fx.get("lockRequired") and not fx_quote_id:
-				raise QuoteRequiredError("FX quote required by corridor policy")
+			span.set_attribute("visa.destination.final_type", destination.type)
+
+		corridor = preflight.corridor
+		if corridor is not None:
+			with stage("policy"):
+				if rules is None:
+					rules = self._corridor_rules_for(preflight)
+				if span:
+					span.set_attribute("visa.policy.version", rules.policy_version)
+				rules.check_destination(self._map_destination_type(destination.type), corridor.label)
+				rules.check_fx_lock(bool(fx_quote_id))
 
 		return destination, fx_quote_id
 
-	def _requires_quote(self, req: Dict[str, Any]) -> bool:
-		currency = req.get("amount", {}).get("currency")
+	def _requires_quote(self, req: PayoutRequest) -> bool:
+		currency = req.amount.currency
 		if not currency:
 			return False
 		return currency != "USD"
 
-	def _resolve_corridor_rules(self, corridor: Dict[str, Any]):
-		if self._corridor_policy is None:
-			self._corridor_policy = load_policy()
-		return get_rules(
-			self._corridor_policy,
-			source_country=corridor["sourceCountry"],
-			target_country=corridor["targetCountry"],
-			source_currency=corridor.get("sourceCurrency"),
-			target_currency=corridor.get("targetCurrency")
+	def _resolve_corridor_rules(self, corridor: PayoutCorridor) -> CompiledRules:
+		return self.corridor_policy().lookup(
+			corridor.source_country,
+			corridor.target_country,
+			corridor.source_currency,
+			corridor.target_currency,
 		)
 
 	def _map_destination_type(self, dtype: str) -> str:
@@ -0,0 +1,9 @@
+import json
+from importlib import resources
+
+from ..utils.schema import compile_schema
+
+with resources.files(__package__).joinpath("payout-request.schema.json").open("r", encoding="utf-8") as _handle:
+	PAYOUT_REQUEST_SCHEMA = json.load(_handle)
+
+validate_payout_request = compile_schema(PAYOUT_REQUEST_SCHEMA)
@@ -1,9 +1,11 @@
 from typing import Any, Dict, Optional
 
+from ..core.models import Amount, Destination, Funding, FxLock, PayoutCorridor, PayoutRequest, Preflight
 from ..core.orchestrator import Orchestrator
-from ..errors import DestinationNotAllowedError, QuoteRequiredError
-from ..policy.corridor_policy import get_rules, load_policy
+from ..errors import DestinationNotAllowedError, SchemaValidationError
+from ..policy.corridor_policy import CompiledRules
 from ..transport.secure_http_client import SecureHttpClient
+from .template import PayoutTemplate
 
 
 class PayoutBuilder:
@@ -11,11 +13,13 @@ class PayoutBuilder:
 	def __init__(self, orchestrator: Orchestrator) -> None:
 		self._orch = orchestrator
 		self._originator_id: Optional[str] = None
-		self._funding: Optional[Dict[str, Any]] = None
-		self._destination: Optional[Dict[str, Any]] = None
-		self._amount: Optional[Dict[str, Any]] = None
+		self._funding: Optional[Funding] = None
+		self._destination: Optional[Destination] = None
+		self._amount: Optional[Amount] = None
 		self._idempotency_key: Optional[str] = None
-		self._preflight: Dict[str, Any] = {}
+		self._fx_lock: Optional[FxLock] = None
+		self._corridor: Optional[PayoutCorridor] = None
+		self._compliance: Optional[Dict[str, Any]] = None
 
 	@staticmethod
 	def create(http: Optional[SecureHttpClient] = None) -> "PayoutBuilder":
@@ -26,34 +30,31 @@ class PayoutBuilder:
 		return self
 
 	def with_funding_internal(self, debit_confirmed: bool, confirmation_ref: str) -> "PayoutBuilder":
-		self._funding = {"type": "INTERNAL", "debitConfirmed": debit_confirmed, "confirmationRef": confirmation_ref}
+		self._funding = Funding.internal(debit_confirmed, confirmation_ref)
 		return self
 
 	def with_funding_from_card(self, receipt_id: str, status: str) -> "PayoutBuilder":
-		self._funding = {"type": "AFT", "receiptId": receipt_id, "status": status}
+		self._funding = Funding.aft(receipt_id, status)
 		return self
 
 	def with_funding_from_external(self, payment_id: str, status: str) -> "PayoutBuilder":
-		self._funding = {"type": "PIS", "paymentId": payment_id, "status": status}
+		self._funding = Funding.pis(payment_id, status)
 		return self
 
 	def to_card_direct(self, pan_token: str) -> "PayoutBuilder":
-		self._destination = {"type": "CARD", "panToken": pan_token}
-		self._preflight.pop("alias", None)
+		self._destination = Destination.card(pan_token)
 		return self
 
 	def to_account(self, account_id: str) -> "PayoutBuilder":
-		self._destination = {"type": "ACCOUNT", "accountId": account_id}
-		self._preflight.pop("alias", None)
+		self._destination = Destination.account(account_id)
 		return self
 
 	def to_wallet(self, wallet_id: str) -> "PayoutBuilder":
-		self._destination = {"type": "WALLET", "walletId": wallet_id}
-		self._preflight.pop("alias", None)
+		self._destination = Destination.wallet(wallet_id)
 		return self
 
 	def for_amount(self, currency: str, minor: int) -> "PayoutBuilder":
-		self._amount = {"currency": currency, "minor": minor}
+		self._amount = Amount(currency, minor)
 		return self
 
 	def with_idempotency_key(self, key: str) -> "PayoutBuilder":
@@ -61,21 +62,15 @@ class PayoutBuilder:
 		return self
 
 	def to_card_via_alias(self, alias: str, alias_type: str = "EMAIL") -> "PayoutBuilder":
-		self._destination = {"type": "ALIAS", "alias": alias, "aliasType": alias_type}
-		self._preflight["alias"] = {"alias": alias, "aliasType": alias_type}
+		self._destination = Destination.via_alias(alias, alias_type)
 		return self
 
 	def with_quote_lock(self, src_currency: str, dst_currency: str) -> "PayoutBuilder":
-		amount_minor = self._amount.get("minor", 0) if self._amount else 0
-		self._preflight["fxLock"] = {
-			"srcCurrency": src_currency,
-			"dstCurrency": dst_currency,
-			"amountMinor": amount_minor,
-		}
+		self._fx_lock = FxLock(src_currency, dst_currency, self._amount.minor if self._amount else 0)
 		return self
 
 	def with_compliance(self, payload: Dict[str, Any]) -> "PayoutBuilder":
-		self._preflight["compliancePayload"] = payload
+		self._compliance = payload
 		return self
 
 	def for_corridor(
@@ -86,60 +81,83 @@ class PayoutBuilder:
 		source_currency: Optional[str] = None,
 		target_currency: Optional[str] = None,
 	) -> "PayoutBuilder":
-		self._preflight["corridor"] = {
-			"sourceCountry": source_country,
-			"targetCountry": target_country,
-			"sourceCurrency": source_currency or self._preflight.get("corridor", {}).get("sourceCurrency"),
-			"targetCurrency": target_currency or self._preflight.get("corridor", {}).get("targetCurrency"),
-		}
+		previous = self._corridor
+		self._corridor = PayoutCorridor(
+			source_country,
+			target_country,
+			source_currency or (previous.source_currency if previous else None),
+			target_currency or (previous.target_currency if previous else None),
+		)
 		return self
 
+	def build(self) -> PayoutRequest:
+		for path, value in (
+			("$.originatorId", self._originator_id),
+			("$.funding", self._funding),
+			("$.destination", self._destination),
+			("$.amount", self._amount),
+		):
+			if value is None:
+				raise SchemaValidationError(path, "is required")
+		fx_lock = self._fx_lock
+		if fx_lock is not None and self._amount is not None:
+			fx_lock = FxLock(fx_lock.src_currency, fx_lock.dst_currency, self._amount.minor)
+		corridor = self._corridor
+		rules = None
+		if corridor is not None:
+			source_currency = corridor.source_currency or (fx_lock.src_currency if fx_lock else None)
+			target_currency = corridor.target_currency or (self._amount.currency if self._amount else None)
+			corridor = PayoutCorridor(corridor.source_country, corridor.target_country, source_currency, target_currency)
+			# handed to the orchestrator so the corridor is resolved once per payout
+			rules = self._enforce_corridor_policy(corridor, fx_lock is not None)
+		return PayoutRequest(
+			self._originator_id,
+			self._idempotency_key or f"{__name__}-{id(self)}",
+			self._funding,
+			self._destination,
+			self._amount,
+			Preflight(fx_lock, corridor, self._compliance, rules),
+		)
+
+	def as_template(self) -> PayoutTemplate:
+		"""Freeze the originator, funding type, currency, corridor, FX pair and compliance payload set so far.
+
+		Only the funding *type* carries over; each payout binds its own funding.
+		"""
+		if self._originator_id is None:
+			raise SchemaValidationError("$.originatorId", "is required")
+		if self._funding is None:
+			raise SchemaValidationError("$.funding.type", "is required")
+		if self._amount is None:
+			raise SchemaValidationError("$.amount.currency", "is required")
+		return PayoutTemplate(
+			self._orch,
+			originator_id=self._originator_id,
+			currency=self._amount.currency,
+			funding_type=self._funding.type,
+			corridor=self._corridor,
+			fx_lock=(self._fx_lock.src_currency, self._fx_lock.dst_currency) if self._fx_lock else None,
+			compliance_payload=self._compliance,
+		)
+
 	def execute(self) -> Any:
-		if "fxLock" in self._preflight and self._amount and "minor" in self._amount:
-			self._preflight["fxLock"]["amountMinor"] = self._amount["minor"]
-		if "corridor" in self._preflight:
-			corridor = self._preflight["corridor"]
-			if not corridor.get("sourceCurrency") and "fxLock" in self._preflight:
-				corridor["sourceCurrency"] = self._preflight["fxLock"].get("srcCurrency")
-			if not corridor.get("targetCurrency") and self._amount:
-				corridor["targetCurrency"] = self._amount.get("currency")
-			self._enforce_corridor_policy()
-		idem = self._idempotency_key or f"{__name__}-{id(self)}"
-		req = {
-			"originatorId": self._originator_id,
-			"idempotencyKey": idem,
-			"funding": self._funding,
-			"destination": self._destination,
-			"amount": self._amount,
-			"preflight": self._preflight,
-		}
-		return self._orch.payout(req)
-
-	def _enforce_corridor_policy(self) -> None:
-		corridor = self._preflight.get("corridor")
-		if not corridor:
-			return
-		policy = load_policy()
-		rules = get_rules(
-			policy,
-			source_country=corridor["sourceCountry"],
-			target_country=corridor["targetCountry"],
-			source_currency=corridor.get("sourceCurrency"),
-			target_currency=corridor.get("targetCurrency"),
+		return self._orch.payout(self.build())
+
+	def _enforce_corridor_policy(self, corridor: PayoutCorridor, has_fx_lock: bool) -> CompiledRules:
+		rules = self._orch.corridor_policy().lookup(
+			corridor.source_country,
+			corridor.target_country,
+			corridor.source_currency,
+			corridor.target_currency,
 		)
-		if rules.fx and rules.fx.get("lockRequired") and "fxLock" not in self._preflight:
-			raise QuoteRequiredError("FX quote required by corridor policy")
-		if rules.rails and rules.rails.get("allowedDestinations"):
-			dest_type = self._policy_destination_type()
-			if dest_type not in rules.rails["allowedDestinations"]:
-				raise DestinationNotAllowedError(
-					f"Destination {dest_type} not permitted for corridor {corridor['sourceCountry']}->{corridor['targetCountry']}"
-				)
+		rules.check_fx_lock(has_fx_lock)
+		rules.check_destination(self._policy_destination_type(), corridor.label)
+		return rules
 
 	def _policy_destination_type(self) -> str:
 		if not self._destination:
 			raise DestinationNotAllowedError("Destination required before corridor policy enforcement")
-		dtype = self._destination.get("type")
+		dtype = self._destination.type
 		if dtype == "ALIAS":
 			return "card"
 		if dtype in ("CARD", "ACCOUNT", "WALLET"):
@@ -0,0 +1,93 @@
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from ..core.batch import BatchOutcome, run_batch
+from ..core.models import Amount, Destination, Funding, FxLock, PayoutCorridor, PayoutRequest, Preflight
+from ..core.orchestrator import Orchestrator
+from ..errors import DestinationNotAllowedError, SchemaValidationError
+
+_POLICY_DESTINATIONS = {"CARD": "card", "ALIAS": "card", "ACCOUNT": "account", "WALLET": "wallet"}
+
+_FUNDING_TYPES = ("INTERNAL", "AFT", "PIS")
+
+TemplateItem = Tuple[Destination, int, str, Funding]
+
+
+class PayoutTemplate:
+	"""The shared part of a run of payouts (originator, currency, funding type, corridor, FX pair).
+
+	Corridor currencies are inferred and the corridor rules resolved and checked
+	once, when the template is created; :meth:`bind` only attaches a destination,
+	amount, idempotency key and funding. Funding is per payout because receipts,
+	payment ids and ledger confirmation refs are single-use; the template only
+	fixes its type. The rules are re-resolved on the next :meth:`bind` after the
+	orchestrator's corridor policy is swapped (e.g. by a ``PolicyProvider``).
+	"""
+
+	def __init__(
+		self,
+		orchestrator: Orchestrator,
+		*,
+		originator_id: str,
+		currency: str,
+		funding_type: str,
+		corridor: Optional[PayoutCorridor] = None,
+		fx_lock: Optional[Tuple[str, str]] = None,
+		compliance_payload: Optional[Dict[str, Any]] = None,
+	) -> None:
+		self._orch = orchestrator
+		self.originator_id = originator_id
+		self.currency = currency
+		if funding_type not in _FUNDING_TYPES:
+			raise SchemaValidationError("$.funding.type", f"must be one of {', '.join(_FUNDING_TYPES)}")
+		self.funding_type = funding_type
+		# amountMinor is left unset so the orchestrator locks each payout's own amount
+		fx = FxLock(fx_lock[0], fx_lock[1]) if fx_lock else None
+		if corridor is not None:
+			corridor = PayoutCorridor(
+				corridor.source_country,
+				corridor.target_country,
+				corridor.source_currency or (fx.src_currency if fx else None),
+				corridor.target_currency or currency,
+			)
+		self.preflight = Preflight(fx, corridor, compliance_payload)
+		self.refresh()
+
+	def refresh(self) -> None:
+		policy = self._orch.corridor_policy()
+		corridor = self.preflight.corridor
+		if corridor is not None:
+			rules = policy.lookup(
+				corridor.source_country,
+				corridor.target_country,
+				corridor.source_currency,
+				corridor.target_currency,
+			)
+			rules.check_fx_lock(self.preflight.fx_lock is not None)
+			self.preflight = Preflight(self.preflight.fx_lock, corridor, self.preflight.compliance_payload, rules)
+		self._policy = policy
+
+	def bind(self, destination: Destination, amount_minor: int, idempotency_key: str, funding: Funding) -> PayoutRequest:
+		if funding is None:
+			raise SchemaValidationError("$.funding", "is required")
+		if funding.type != self.funding_type:
+			raise SchemaValidationError("$.funding.type", f"must be {self.funding_type} for this template")
+		if self._orch.corridor_policy() is not self._policy:
+			self.refresh()
+		preflight = self.preflight
+		if preflight.corridor_rules is not None:
+			dest_type = _POLICY_DESTINATIONS.get(destination.type)
+			if dest_type is None:
+				raise DestinationNotAllowedError(f"Unsupported destination type {destination.type}")
+			preflight.corridor_rules.check_destination(dest_type, preflight.corridor.label)
+		return PayoutRequest(self.originator_id, idempotency_key, funding, destination, Amount(self.currency, amount_minor), preflight)
+
+	def execute(self, destination: Destination, amount_minor: int, idempotency_key: str, funding: Funding) -> Any:
+		return self._orch.payout(self.bind(destination, amount_minor, idempotency_key, funding))
+
+	def execute_batch(self, items: Iterable[TemplateItem], *, max_workers: int = 8, max_in_flight: Optional[int] = None) -> Iterator[BatchOutcome]:
+		"""Execute ``(destination, amount_minor, idempotency_key, funding)`` items, yielding outcomes in completion order."""
+		return run_batch(self._execute_item, items, max_workers=max_workers, max_in_flight=max_in_flight)
+
+	def _execute_item(self, item: TemplateItem) -> Any:
+		destination, amount_minor, idempotency_key, funding = item
+		return self.execute(destination, amount_minor, idempotency_key, funding)
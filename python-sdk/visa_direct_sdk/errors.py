@@ -16,3 +16,41 @@ class QuoteExpiredError(Exception):
 
 class DestinationNotAllowedError(Exception):
 	pass
+
+
+class RateLimitExceeded(Exception):
+
+	def __init__(self, route: str, originator_id=None, retry_after: float = 0.0) -> None:
+		super().__init__(f"Rate limit exceeded for {route} (originator {originator_id or '*'}), retry after {retry_after:.3f}s")
+		self.route = route
+		self.originator_id = originator_id
+		self.retry_after = retry_after
+
+
+class VelocityLimitExceeded(Exception):
+
+	def __init__(self, limit: str, maximum: int, observed: int) -> None:
+		super().__init__(f"Velocity limit {limit} exceeded ({observed} > {maximum})")
+		self.limit = limit
+		self.maximum = maximum
+		self.observed = observed
+
+
+class SchemaValidationError(ValueError):
+
+	def __init__(self, path: str, message: str) -> None:
+		super().__init__(f"{path} {message}".strip())
+		self.path = path
+		self.message = message
+
+	def within(self, parent: str) -> "SchemaValidationError":
+		return SchemaValidationError(parent + self.path, self.message)
+
+
+class PayoutStatusTimeout(Exception):
+
+	def __init__(self, payout_id: str, attempts: int, last_status=None) -> None:
+		super().__init__(f"Payout {payout_id} not terminal after {attempts} status polls (last status {last_status!r})")
+		self.payout_id = payout_id
+		self.attempts = attempts
+		self.last_status = last_status
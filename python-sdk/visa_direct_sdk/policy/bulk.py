@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .corridor_policy import CompiledPolicy, PolicyNotFoundError
+
+try:  # pragma: no cover - optional dependency at runtime
+	import numpy as np
+except ModuleNotFoundError:  # pragma: no cover
+	np = None
+
+NO_CORRIDOR = 1
+DESTINATION_NOT_ALLOWED = 2
+FX_LOCK_REQUIRED = 4
+MAX_VALUE_EXCEEDED = 8
+MALFORMED_ROW = 16
+
+REASON_NAMES = {
+	NO_CORRIDOR: "NO_CORRIDOR",
+	DESTINATION_NOT_ALLOWED: "DESTINATION_NOT_ALLOWED",
+	FX_LOCK_REQUIRED: "FX_LOCK_REQUIRED",
+	MAX_VALUE_EXCEEDED: "MAX_VALUE_EXCEEDED",
+	MALFORMED_ROW: "MALFORMED_ROW",
+}
+
+_DEST_BITS = {"card": 1, "account": 2, "wallet": 4}
+_DEST_TYPES = {"CARD": "card", "ALIAS": "card", "ACCOUNT": "account", "WALLET": "wallet"}
+_ALL_DESTINATIONS = 7
+_NO_MAX = 2 ** 62
+
+_CorridorKey = Tuple[str, str, Optional[str], Optional[str]]
+# corridor slot for rows that could not be parsed; never matches a policy
+_MALFORMED_KEY: _CorridorKey = ("", "", None, None)
+
+
+@dataclass
+class PayoutColumns:
+	"""Column-oriented view of a payout file.
+
+	``corridor_codes`` index into ``corridors`` so rules are resolved once per
+	distinct corridor rather than once per row. Rows that could not be parsed
+	are flagged in ``malformed`` and rejected with ``MALFORMED_ROW`` only.
+	"""
+
+	corridors: List[_CorridorKey]
+	corridor_codes: Sequence[int]
+	destination_bits: Sequence[int]
+	amount_minor: Sequence[int]
+	has_fx_lock: Sequence[bool]
+	malformed: Optional[Sequence[bool]] = None
+
+	def __len__(self) -> int:
+		return len(self.corridor_codes)
+
+	@classmethod
+	def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "PayoutColumns":
+		"""Build columns from flat rows (``sourceCountry``, ``targetCountry``,
+		``sourceCurrency``, ``targetCurrency``, ``destinationType``, ``amountMinor``,
+		``fxLock``), e.g. ``csv.DictReader`` output."""
+		codes: Dict[_CorridorKey, int] = {}
+		corridor_codes: List[int] = []
+		destination_bits: List[int] = []
+		amounts: List[int] = []
+		fx: List[bool] = []
+		malformed: List[bool] = []
+		for row in rows:
+			try:
+				key = (_required(row, "sourceCountry"), _required(row, "targetCountry"), row.get("sourceCurrency") or None, row.get("targetCurrency") or None)
+				amount = int(row.get("amountMinor") or 0)
+				dest = _DEST_TYPES.get(str(row.get("destinationType", "")).upper())
+			except (KeyError, TypeError, ValueError, AttributeError):
+				key, amount, dest = _MALFORMED_KEY, 0, None
+				malformed.append(True)
+			else:
+				malformed.append(False)
+			code = codes.get(key)
+			if code is None:
+				code = codes[key] = len(codes)
+			corridor_codes.append(code)
+			destination_bits.append(_DEST_BITS[dest] if dest else 0)
+			amounts.append(amount)
+			fx.append(not malformed[-1] and _truthy(row.get("fxLock")))
+		if np is not None:
+			return cls(
+				list(codes),
+				np.fromiter(corridor_codes, dtype=np.int32, count=len(corridor_codes)),
+				np.fromiter(destination_bits, dtype=np.uint8, count=len(destination_bits)),
+				np.fromiter(amounts, dtype=np.int64, count=len(amounts)),
+				np.fromiter(fx, dtype=bool, count=len(fx)),
+				np.fromiter(malformed, dtype=bool, count=len(malformed)),
+			)
+		return cls(list(codes), corridor_codes, destination_bits, amounts, fx, malformed)
+
+
+@dataclass
+class BulkValidationResult:
+	valid: Sequence[bool]
+	reasons: Sequence[int]
+
+	def reason_names(self, row: int) -> List[str]:
+		code = int(self.reasons[row])
+		return [name for bit, name in REASON_NAMES.items() if code & bit]
+
+	def rejected_rows(self) -> List[int]:
+		if np is not None and isinstance(self.reasons, np.ndarray):
+			return np.flatnonzero(self.reasons).tolist()
+		return [i for i, code in enumerate(self.reasons) if code]
+
+
+def validate_columns(columns: PayoutColumns, policy: CompiledPolicy) -> BulkValidationResult:
+	found: List[bool] = []
+	allowed: List[int] = []
+	fx_required: List[bool] = []
+	max_value: List[int] = []
+	for source, target, src_ccy, dst_ccy in columns.corridors:
+		try:
+			rules = policy.lookup(source, target, src_ccy, dst_ccy)
+		except PolicyNotFoundError:
+			found.append(False)
+			allowed.append(_ALL_DESTINATIONS)
+			fx_required.append(False)
+			max_value.append(_NO_MAX)
+			continue
+		found.append(True)
+		dests = rules.allowed_destinations
+		allowed.append(sum(_DEST_BITS.get(d, 0) for d in dests) if dests is not None else _ALL_DESTINATIONS)
+		fx_required.append(rules.fx_lock_required)
+		max_value.append(rules.max_value_minor if rules.max_value_minor is not None else _NO_MAX)
+
+	if np is not None and isinstance(columns.corridor_codes, np.ndarray):
+		codes = columns.corridor_codes
+		reasons = np.where(np.asarray(found, dtype=bool)[codes], 0, NO_CORRIDOR).astype(np.uint8)
+		reasons |= np.where((np.asarray(allowed, dtype=np.uint8)[codes] & columns.destination_bits) == 0, DESTINATION_NOT_ALLOWED, 0).astype(np.uint8)
+		reasons |= np.where(np.asarray(fx_required, dtype=bool)[codes] & ~columns.has_fx_lock, FX_LOCK_REQUIRED, 0).astype(np.uint8)
+		reasons |= np.where(columns.amount_minor > np.asarray(max_value, dtype=np.int64)[codes], MAX_VALUE_EXCEEDED, 0).astype(np.uint8)
+		if columns.malformed is not None:
+			reasons = np.where(columns.malformed, MALFORMED_ROW, reasons).astype(np.uint8)
+		return BulkValidationResult(reasons == 0, reasons)
+
+	reasons_list: List[int] = []
+	malformed = columns.malformed if columns.malformed is not None else [False] * len(columns)
+	for code, dest, amount, has_fx, bad in zip(columns.corridor_codes, columns.destination_bits, columns.amount_minor, columns.has_fx_lock, malformed):
+		if bad:
+			reasons_list.append(MALFORMED_ROW)
+			continue
+		reason = 0 if found[code] else NO_CORRIDOR
+		if not allowed[code] & dest:
+			reason |= DESTINATION_NOT_ALLOWED
+		if fx_required[code] and not has_fx:
+			reason |= FX_LOCK_REQUIRED
+		if amount > max_value[code]:
+			reason |= MAX_VALUE_EXCEEDED
+		reasons_list.append(reason)
+	return BulkValidationResult([r == 0 for r in reasons_list], reasons_list)
+
+
+def validate_rows(rows: Iterable[Mapping[str, Any]], policy: CompiledPolicy) -> BulkValidationResult:
+	return validate_columns(PayoutColumns.from_rows(rows), policy)
+
+
+def _required(row: Mapping[str, Any], field: str) -> str:
+	value = row[field]
+	if not value:
+		raise ValueError(f"{field} is empty")
+	return value
+
+
+def _truthy(value: Any) -> bool:
+	if isinstance(value, str):
+		return value.strip().lower() in ("1", "true", "yes", "y")
+	return bool(value)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from functools import lru_cache
+import os
+from dataclasses import dataclass, field
 from importlib import resources
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from ..errors import DestinationNotAllowedError, QuoteRequiredError, SchemaValidationError
+from ..utils.schema import compile_schema
 
 
 @dataclass
@@ -29,49 +32,128 @@ class Corridor:
 class Policy:
 	version: str
 	corridors: List[Corridor]
+	compiled: Optional["CompiledPolicy"] = field(default=None, init=False, repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+	rules: CorridorRules
+	allowed_destinations: Optional[FrozenSet[str]]
+	fx_lock_required: bool
+	max_value_minor: Optional[int]
+	daily_count_max: Optional[int]
+	compliance_scope: Optional[str]
+	policy_version: str = "0.0.0"
+
+	def check_destination(self, dest_type: str, corridor_label: str) -> None:
+		if self.allowed_destinations is not None and dest_type not in self.allowed_destinations:
+			raise DestinationNotAllowedError(f"Destination {dest_type} not permitted for corridor {corridor_label}")
+
+	def check_fx_lock(self, has_lock: bool) -> None:
+		if self.fx_lock_required and not has_lock:
+			raise QuoteRequiredError("FX quote required by corridor policy")
+
+
+_IndexKey = Tuple[str, str, Optional[str], Optional[str]]
+
+
+class CompiledPolicy:
+	"""Hash index over corridors keyed by (source, target, srcCcy, tgtCcy).
+
+	A corridor without a currency constraint is indexed under ``None`` for that
+	slot; lookups try the exact key first, then source-only, target-only and
+	fully wildcarded currencies, so the most specific corridor wins.
+	"""
+
+	def __init__(self, policy: Policy) -> None:
+		self.policy = policy
+		self.version = policy.version
+		self._index: Dict[_IndexKey, CompiledRules] = {}
+		for corridor in policy.corridors:
+			currencies = corridor.currencies or {}
+			key = (corridor.sourceCountry, corridor.targetCountry, currencies.get("source") or None, currencies.get("target") or None)
+			self._index.setdefault(key, compile_rules(corridor.rules or CorridorRules(), policy.version))
+
+	def __len__(self) -> int:
+		return len(self._index)
+
+	def lookup(self, source_country: str, target_country: str, source_currency: Optional[str] = None, target_currency: Optional[str] = None) -> CompiledRules:
+		index = self._index
+		rules = (
+			index.get((source_country, target_country, source_currency, target_currency))
+			or index.get((source_country, target_country, source_currency, None))
+			or index.get((source_country, target_country, None, target_currency))
+			or index.get((source_country, target_country, None, None))
+		)
+		if rules is None:
+			raise PolicyNotFoundError(f"No corridor policy for {source_country}->{target_country}")
+		return rules
 
 
 class PolicyNotFoundError(Exception):
 	pass
 
 
-def _candidate_paths() -> List[Path]:
+class InvalidPolicyError(Exception):
+	pass
+
+
+def _candidate_paths(name: str = "corridor-policy.json") -> List[Path]:
 	cwd = Path(os.getcwd())
 	return [
-		cwd / "policy" / "corridor-policy.json",
-		cwd.parent / "policy" / "corridor-policy.json",
-		Path(__file__).resolve().parents[2] / "policy" / "corridor-policy.json",
-		Path(__file__).resolve().parents[3] / "policy" / "corridor-policy.json",
+		cwd / "policy" / name,
+		cwd.parent / "policy" / name,
+		Path(__file__).resolve().parents[2] / "policy" / name,
+		Path(__file__).resolve().parents[3] / "policy" / name,
 	]
 
 
-def _load_embedded_policy() -> Policy:
-	with resources.files(__package__).joinpath("corridor-policy.default.json").open("r", encoding="utf-8") as handle:
-		raw = json.load(handle)
-	return Policy(
-		version=raw.get("version", "0.0.0"),
-		corridors=[
-			Corridor(
-				sourceCountry=c["sourceCountry"],
-				targetCountry=c["targetCountry"],
-				currencies=c.get("currencies"),
-				rules=CorridorRules(**c.get("rules", {}))
-			)
-			for c in raw.get("corridors", [])
-		]
+def compile_rules(rules: CorridorRules, version: str = "0.0.0") -> CompiledRules:
+	allowed = (rules.rails or {}).get("allowedDestinations")
+	limits = rules.limits or {}
+	max_value = limits.get("maxValueMinor")
+	daily_count = limits.get("dailyCountMax")
+	return CompiledRules(
+		rules=rules,
+		allowed_destinations=frozenset(allowed) if allowed else None,
+		fx_lock_required=bool((rules.fx or {}).get("lockRequired")),
+		max_value_minor=int(max_value) if max_value is not None else None,
+		daily_count_max=int(daily_count) if daily_count is not None else None,
+		compliance_scope=(rules.compliance or {}).get("scope"),
+		policy_version=version,
 	)
 
 
-@lru_cache(maxsize=1)
-def load_policy(file: Optional[str] = None, policy: Optional[Policy] = None) -> Policy:
-	if policy:
-		return policy
-	if file:
-		candidate = Path(file)
-		if not candidate.exists():
-			raise PolicyNotFoundError(f"Corridor policy file not found at {candidate}")
-		with candidate.open("r", encoding="utf-8") as handle:
-			raw = json.load(handle)
+def compile_policy(policy: Policy) -> CompiledPolicy:
+	if policy.compiled is None:
+		policy.compiled = CompiledPolicy(policy)
+	return policy.compiled
+
+
+_policy_validator: Optional[Callable[[object], None]] = None
+
+
+def _validate_policy(raw: object) -> None:
+	# the schema is the repo's policy/corridor-policy.schema.json, next to the
+	# policy itself, so there is one copy; it is compiled on first use
+	global _policy_validator
+	if _policy_validator is None:
+		for candidate in _candidate_paths("corridor-policy.schema.json"):
+			if candidate.exists():
+				with candidate.open("r", encoding="utf-8") as handle:
+					_policy_validator = compile_schema(json.load(handle))
+				break
+		else:
+			raise PolicyNotFoundError("Corridor policy schema policy/corridor-policy.schema.json not found")
+	_policy_validator(raw)
+
+
+def policy_from_dict(raw: Dict[str, object]) -> Policy:
+	try:
+		_validate_policy(raw)
+	except SchemaValidationError as exc:
+		raise InvalidPolicyError(f"Corridor policy failed schema validation: {exc}") from exc
+	try:
 		return Policy(
 			version=raw.get("version", "0.0.0"),
 			corridors=[
@@ -84,19 +166,43 @@ def load_policy(file: Optional[str] = None, policy: Optional[Policy] = None) ->
 				for c in raw.get("corridors", [])
 			]
 		)
-	return _load_embedded_policy()
+	except (AttributeError, KeyError, TypeError) as exc:
+		raise InvalidPolicyError(f"Malformed corridor policy: {exc!r}") from exc
+
+
+def read_policy_file(file: str) -> Policy:
+	candidate = Path(file)
+	if not candidate.exists():
+		raise PolicyNotFoundError(f"Corridor policy file not found at {candidate}")
+	with candidate.open("r", encoding="utf-8") as handle:
+		try:
+			raw = json.load(handle)
+		except json.JSONDecodeError as exc:
+			raise InvalidPolicyError(f"Corridor policy at {candidate} is not valid JSON: {exc}") from exc
+	return policy_from_dict(raw)
+
+
+def _load_embedded_policy() -> Policy:
+	with resources.files(__package__).joinpath("corridor-policy.default.json").open("r", encoding="utf-8") as handle:
+		raw = json.load(handle)
+	return policy_from_dict(raw)
+
+
+_POLICY_CACHE: Dict[Optional[str], Policy] = {}
+
+
+def load_policy(file: Optional[str] = None, policy: Optional[Policy] = None) -> Policy:
+	if policy:
+		return policy
+	cached = _POLICY_CACHE.get(file)
+	if cached is None:
+		cached = read_policy_file(file) if file else _load_embedded_policy()
+		_POLICY_CACHE[file] = cached
+	return cached
+
+
+load_policy.cache_clear = _POLICY_CACHE.clear  # type: ignore[attr-defined]
 
 
 def get_rules(policy: Policy, *, source_country: str, target_country: str, source_currency: Optional[str] = None, target_currency: Optional[str] = None) -> CorridorRules:
-	for corridor in policy.corridors:
-		if corridor.sourceCountry != source_country:
-			continue
-		if corridor.targetCountry != target_country:
-			continue
-		if corridor.currencies:
-			src_ok = corridor.currencies.get("source") == source_currency if corridor.currencies.get("source") else True
-			dst_ok = corridor.currencies.get("target") == target_currency if corridor.currencies.get("target") else True
-			if not (src_ok and dst_ok):
-				continue
-		return corridor.rules or CorridorRules()
-	raise PolicyNotFoundError(f"No corridor policy for {source_country}->{target_country}")
+	return compile_policy(policy).lookup(source_country, target_country, source_currency, target_currency).rules
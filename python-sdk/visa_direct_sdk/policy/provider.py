@@ -0,0 +1,105 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .corridor_policy import (
+	CompiledPolicy,
+	InvalidPolicyError,
+	Policy,
+	PolicyNotFoundError,
+	compile_policy,
+	load_policy,
+	policy_from_dict,
+	read_policy_file,
+)
+
+
+class PolicyProvider:
+	"""Holds the active compiled corridor policy and swaps it atomically on change.
+
+	Readers call :meth:`current` once per payout and keep that snapshot, so an
+	update never changes the rules halfway through a payout. New versions come
+	from polling the policy file's mtime (:meth:`start` / :meth:`refresh`) or from
+	:meth:`push`; they are parsed, validated and compiled before the swap, and an
+	invalid version leaves the previous one active.
+	"""
+
+	def __init__(self, file: Optional[str] = None, *, policy: Optional[Policy] = None, poll_interval: float = 5.0) -> None:
+		self.file = file
+		self.poll_interval = poll_interval
+		self.last_error: Optional[Exception] = None
+		self._listeners: List[Callable[[CompiledPolicy], None]] = []
+		self._lock = threading.Lock()
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+		self._mtime = self._stat()
+		initial = policy or (read_policy_file(file) if file else load_policy())
+		self._current = compile_policy(initial)
+
+	@property
+	def version(self) -> str:
+		return self._current.version
+
+	def current(self) -> CompiledPolicy:
+		return self._current
+
+	def subscribe(self, listener: Callable[[CompiledPolicy], None]) -> None:
+		self._listeners.append(listener)
+
+	def push(self, source: Union[Policy, Dict[str, Any]]) -> CompiledPolicy:
+		policy = source if isinstance(source, Policy) else policy_from_dict(source)
+		return self._swap(self._compile(policy))
+
+	def refresh(self) -> bool:
+		if not self.file:
+			return False
+		mtime = self._stat()
+		if mtime is None or mtime == self._mtime:
+			return False
+		try:
+			compiled = self._compile(read_policy_file(self.file))
+		except (InvalidPolicyError, PolicyNotFoundError, OSError) as exc:
+			self.last_error = exc
+			return False
+		self._mtime = mtime
+		self._swap(compiled)
+		return True
+
+	def start(self) -> "PolicyProvider":
+		if self._thread is None and self.file:
+			self._stop.clear()
+			self._thread = threading.Thread(target=self._poll, name="corridor-policy-watch", daemon=True)
+			self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+
+	def _poll(self) -> None:
+		while not self._stop.wait(self.poll_interval):
+			self.refresh()
+
+	def _compile(self, policy: Policy) -> CompiledPolicy:
+		try:
+			return CompiledPolicy(policy)
+		except (AttributeError, TypeError, ValueError) as exc:
+			raise InvalidPolicyError(f"Corridor policy {policy.version} failed to compile: {exc!r}") from exc
+
+	def _swap(self, compiled: CompiledPolicy) -> CompiledPolicy:
+		with self._lock:
+			self._current = compiled
+			self.last_error = None
+		for listener in self._listeners:
+			listener(compiled)
+		return compiled
+
+	def _stat(self) -> Optional[int]:
+		if not self.file:
+			return None
+		try:
+			return os.stat(self.file).st_mtime_ns
+		except OSError:
+			return None
@@ -0,0 +1,212 @@
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..errors import VelocityLimitExceeded
+from .corridor_policy import CompiledRules
+
+_DAY_SECONDS = 86400
+_SCOPES = ("corridor", "originator", "corridor_originator")
+
+Totals = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class VelocityLimit:
+	"""Count and/or value cap over a window.
+
+	Fixed windows are aligned to the epoch (``window_seconds=86400`` is the UTC
+	day). Sliding windows are split into ``buckets`` sub-windows and summed.
+	"""
+
+	scope: str
+	window_seconds: int = _DAY_SECONDS
+	max_count: Optional[int] = None
+	max_value_minor: Optional[int] = None
+	sliding: bool = False
+	buckets: int = 60
+
+	def __post_init__(self) -> None:
+		if self.scope not in _SCOPES:
+			raise ValueError(f"Unknown velocity scope {self.scope}")
+
+	@property
+	def bucket_seconds(self) -> int:
+		return max(self.window_seconds // self.buckets, 1) if self.sliding else self.window_seconds
+
+	@property
+	def name(self) -> str:
+		return f"{self.scope}:{'sliding' if self.sliding else 'fixed'}:{self.window_seconds}"
+
+
+class VelocityStore:
+
+	def increment(self, keys: Sequence[Tuple[str, int]], amount_minor: int, reads: Sequence[str]) -> Dict[str, Totals]:  # pragma: no cover
+		"""Add one count and ``amount_minor`` to each ``(key, ttl_seconds)`` and return totals for those keys and ``reads``."""
+		raise NotImplementedError
+
+	def decrement(self, keys: Sequence[str], amount_minor: int) -> None:  # pragma: no cover
+		raise NotImplementedError
+
+
+class InMemoryVelocityStore(VelocityStore):
+
+	def __init__(self, shards: int = 16, sweep_every: int = 4096) -> None:
+		self._shards: List[Dict[str, List[float]]] = [{} for _ in range(shards)]
+		self._locks = [threading.Lock() for _ in range(shards)]
+		self._ops = [0] * shards
+		self._sweep_every = sweep_every
+
+	def _shard(self, key: str) -> int:
+		return zlib.crc32(key.encode("utf-8")) % len(self._shards)
+
+	def increment(self, keys: Sequence[Tuple[str, int]], amount_minor: int, reads: Sequence[str]) -> Dict[str, Totals]:
+		now = time.time()
+		totals: Dict[str, Totals] = {}
+		for key, ttl in keys:
+			idx = self._shard(key)
+			with self._locks[idx]:
+				shard = self._shards[idx]
+				entry = shard.get(key)
+				if entry is None or entry[2] < now:
+					entry = shard[key] = [0, 0, now + ttl]
+				entry[0] += 1
+				entry[1] += amount_minor
+				totals[key] = (int(entry[0]), int(entry[1]))
+				self._ops[idx] += 1
+				if self._ops[idx] % self._sweep_every == 0:
+					for stale in [k for k, v in shard.items() if v[2] < now]:
+						del shard[stale]
+		for key in reads:
+			idx = self._shard(key)
+			with self._locks[idx]:
+				entry = self._shards[idx].get(key)
+			totals[key] = (int(entry[0]), int(entry[1])) if entry is not None and entry[2] >= now else (0, 0)
+		return totals
+
+	def decrement(self, keys: Sequence[str], amount_minor: int) -> None:
+		for key in keys:
+			idx = self._shard(key)
+			with self._locks[idx]:
+				entry = self._shards[idx].get(key)
+				if entry is not None:
+					entry[0] -= 1
+					entry[1] -= amount_minor
+
+
+class RedisVelocityStore(VelocityStore):
+
+	def __init__(self, client, prefix: str = "velocity:") -> None:
+		if not hasattr(client, "pipeline"):
+			raise RuntimeError("Redis client must expose pipeline")
+		self.client = client
+		self.prefix = prefix
+
+	def increment(self, keys: Sequence[Tuple[str, int]], amount_minor: int, reads: Sequence[str]) -> Dict[str, Totals]:
+		pipe = self.client.pipeline(transaction=True)
+		for key, ttl in keys:
+			name = self.prefix + key
+			pipe.hincrby(name, "count", 1)
+			pipe.hincrby(name, "value", amount_minor)
+			pipe.expire(name, ttl)
+		for key in reads:
+			pipe.hmget(self.prefix + key, "count", "value")
+		results = pipe.execute()
+		totals: Dict[str, Totals] = {}
+		for i, (key, _ttl) in enumerate(keys):
+			totals[key] = (int(results[i * 3]), int(results[i * 3 + 1]))
+		offset = len(keys) * 3
+		for i, key in enumerate(reads):
+			count, value = results[offset + i]
+			totals[key] = (int(count or 0), int(value or 0))
+		return totals
+
+	def decrement(self, keys: Sequence[str], amount_minor: int) -> None:
+		pipe = self.client.pipeline(transaction=True)
+		for key in keys:
+			pipe.hincrby(self.prefix + key, "count", -1)
+			pipe.hincrby(self.prefix + key, "value", -amount_minor)
+		pipe.execute()
+
+
+class VelocityReservation:
+
+	def __init__(self, store: VelocityStore, keys: List[str], amount_minor: int) -> None:
+		self._store = store
+		self._keys = keys
+		self._amount = amount_minor
+		self._released = False
+
+	def rollback(self) -> None:
+		if self._released or not self._keys:
+			return
+		self._released = True
+		self._store.decrement(self._keys, self._amount)
+
+
+class VelocityEngine:
+	"""Enforces corridor ``limits`` (``maxValueMinor`` per payout, ``dailyCountMax``
+	per originator per corridor) plus any extra :class:`VelocityLimit` windows.
+
+	Counters are incremented optimistically in one store round trip and rolled
+	back if a limit is breached; callers roll back the returned reservation when
+	the payout fails downstream.
+	"""
+
+	def __init__(self, store: Optional[VelocityStore] = None, *, limits: Sequence[VelocityLimit] = ()) -> None:
+		self.store = store or InMemoryVelocityStore()
+		self.limits = tuple(limits)
+
+	def reserve(
+		self,
+		*,
+		originator_id: str,
+		source_country: str,
+		target_country: str,
+		amount_minor: int,
+		rules: Optional[CompiledRules] = None,
+		now: Optional[float] = None,
+	) -> VelocityReservation:
+		corridor = f"{source_country}>{target_country}"
+		if rules is not None and rules.max_value_minor is not None and amount_minor > rules.max_value_minor:
+			raise VelocityLimitExceeded(f"corridor:{corridor}:maxValueMinor", rules.max_value_minor, amount_minor)
+
+		limits = list(self.limits)
+		if rules is not None and rules.daily_count_max is not None:
+			limits.append(VelocityLimit("corridor_originator", _DAY_SECONDS, max_count=rules.daily_count_max))
+		if not limits:
+			return VelocityReservation(self.store, [], amount_minor)
+
+		ts = time.time() if now is None else now
+		scope_keys = {"corridor": corridor, "originator": originator_id, "corridor_originator": f"{corridor}|{originator_id}"}
+		increments: Dict[str, int] = {}
+		reads: List[str] = []
+		windows: List[Tuple[VelocityLimit, List[str]]] = []
+		for limit in limits:
+			bucket = int(ts // limit.bucket_seconds)
+			# bucket width is part of the key: sliding limits on one window with different
+			# bucket counts must not add into each other's buckets
+			kind = f"s{limit.bucket_seconds}" if limit.sliding else "f"
+			base = f"{scope_keys[limit.scope]}:{limit.window_seconds}{kind}"
+			current = f"{base}:{bucket}"
+			increments[current] = limit.window_seconds + limit.bucket_seconds
+			members = [current]
+			if limit.sliding:
+				members += [f"{base}:{bucket - i}" for i in range(1, limit.buckets)]
+				reads.extend(members[1:])
+			windows.append((limit, members))
+
+		totals = self.store.increment(list(increments.items()), amount_minor, reads)
+		reservation = VelocityReservation(self.store, list(increments), amount_minor)
+		for limit, members in windows:
+			count = sum(totals[m][0] for m in members)
+			value = sum(totals[m][1] for m in members)
+			if limit.max_count is not None and count > limit.max_count:
+				reservation.rollback()
+				raise VelocityLimitExceeded(f"{limit.name}:count", limit.max_count, count)
+			if limit.max_value_minor is not None and value > limit.max_value_minor:
+				reservation.rollback()
+				raise VelocityLimitExceeded(f"{limit.name}:value", limit.max_value_minor, value)
+		return reservation
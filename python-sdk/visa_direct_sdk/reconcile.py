@@ -0,0 +1,255 @@
+"""Streaming reconciliation of payout results against a ledger export.
+
+    python -m visa_direct_sdk.reconcile results.jsonl ledger.csv --out recon/ \\
+        --result-key confirmationRef --ledger-key confirmationRef \\
+        --result-amount result.amount.minor --ledger-amount amountMinor
+
+Both inputs are streamed (JSONL, or CSV by extension) into on-disk hash
+partitions by join key, then joined one partition at a time, so memory is
+bounded by the largest ledger partition rather than the input size. Matched
+pairs, amount mismatches, failed payouts that have a ledger entry and records
+missing from either side are written as JSONL streams to the output directory.
+"""
+
+import argparse
+import csv
+import math
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .utils.codec import JsonCodec, default_codec
+
+MATCHED = "matched"
+AMOUNT_MISMATCH = "amount_mismatch"
+MISSING_IN_LEDGER = "missing_in_ledger"
+MISSING_IN_RESULTS = "missing_in_results"
+# the payout failed but the ledger shows the debit: funds taken and not paid out
+FAILED = "failed"
+# payout outcomes (the ``status`` of the payout response) that mean nothing was paid out
+FAILED_OUTCOMES = frozenset({"failed", "declined", "rejected", "returned", "cancelled"})
+STREAMS = (MATCHED, AMOUNT_MISMATCH, FAILED, MISSING_IN_LEDGER, MISSING_IN_RESULTS)
+
+_DEFAULT_PARTITION_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class ReconSummary:
+	# failed_without_ledger: failed payouts with no debit either, which need no action
+	counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(STREAMS + ("failed_without_ledger", "unkeyed_results", "unkeyed_ledger"), 0))
+	partitions: int = 1
+
+	@property
+	def clean(self) -> bool:
+		return not any(self.counts[name] for name in STREAMS if name != MATCHED)
+
+
+def field_getter(path: str):
+	"""``"result.amount.minor"`` -> callable reading that nested field (``None`` when absent)."""
+	parts = path.split(".")
+
+	def get(record: Any) -> Any:
+		for part in parts:
+			if not isinstance(record, dict):
+				return None
+			record = record.get(part)
+		return record
+	return get
+
+
+def iter_records(path: str, codec: JsonCodec) -> Iterator[Dict[str, Any]]:
+	if path.lower().endswith(".csv"):
+		with open(path, "r", encoding="utf-8", newline="") as handle:
+			yield from csv.DictReader(handle)
+		return
+	with open(path, "rb") as handle:
+		for raw in handle:
+			if raw.strip():
+				yield codec.loads(raw)
+
+
+class _Partitioner:
+
+	def __init__(self, directory: str, side: str, count: int, codec: JsonCodec) -> None:
+		self.paths = [os.path.join(directory, f"{side}-{i:04d}.jsonl") for i in range(count)]
+		# keep total write buffering around 32MB however many partitions there are
+		buffering = max(64 * 1024, min(1024 * 1024, 32 * 1024 * 1024 // count))
+		self._handles: List[IO[bytes]] = [open(p, "wb", buffering=buffering) for p in self.paths]
+		self._codec = codec
+
+	def add(self, key: str, amount: Any, currency: Any, failed: bool, record: Dict[str, Any]) -> None:
+		idx = zlib.crc32(key.encode("utf-8")) % len(self._handles)
+		self._handles[idx].write(self._codec.dumps([key, amount, currency, failed, record]) + b"\n")
+
+	def close(self) -> None:
+		for handle in self._handles:
+			handle.close()
+
+
+def _normalize_amount(value: Any) -> Optional[int]:
+	if value is None or value == "":
+		return None
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		return None
+
+
+def reconcile(
+	results_path: str,
+	ledger_path: str,
+	out_dir: str,
+	*,
+	result_key: str = "confirmationRef",
+	ledger_key: str = "confirmationRef",
+	result_amount: str = "result.amount.minor",
+	ledger_amount: str = "amountMinor",
+	result_currency: Optional[str] = None,
+	ledger_currency: Optional[str] = None,
+	result_status: Optional[str] = "status",
+	ok_status: str = "ok",
+	result_outcome: Optional[str] = "result.status",
+	failed_outcomes: Iterable[str] = FAILED_OUTCOMES,
+	partitions: Optional[int] = None,
+	max_partition_bytes: int = _DEFAULT_PARTITION_BYTES,
+	work_dir: Optional[str] = None,
+	codec: Optional[JsonCodec] = None,
+) -> ReconSummary:
+	codec = codec or default_codec()
+	failed_outcomes = frozenset(failed_outcomes)
+	get_outcome = field_getter(result_outcome) if result_outcome else None
+	if partitions is None:
+		partitions = max(1, math.ceil(os.path.getsize(ledger_path) / max_partition_bytes))
+	summary = ReconSummary(partitions=partitions)
+	counts = summary.counts
+	os.makedirs(out_dir, exist_ok=True)
+	scratch = tempfile.mkdtemp(prefix="visa-recon-", dir=work_dir)
+	outputs = {name: open(os.path.join(out_dir, f"{name}.jsonl"), "wb") for name in STREAMS}
+
+	def emit(stream: str, key: str, result: Any = None, ledger: Any = None) -> None:
+		record: Dict[str, Any] = {"key": key}
+		if result is not None:
+			record["result"] = result
+		if ledger is not None:
+			record["ledger"] = ledger
+		outputs[stream].write(codec.dumps(record) + b"\n")
+		counts[stream] += 1
+
+	try:
+		for side, path, key_path, amount_path, currency_path, status_path in (
+			("results", results_path, result_key, result_amount, result_currency, result_status),
+			("ledger", ledger_path, ledger_key, ledger_amount, ledger_currency, None),
+		):
+			get_key, get_amount = field_getter(key_path), field_getter(amount_path)
+			get_currency = field_getter(currency_path) if currency_path else None
+			get_status = field_getter(status_path) if status_path else None
+			partitioner = _Partitioner(scratch, side, partitions, codec)
+			try:
+				for record in iter_records(path, codec):
+					key = get_key(record)
+					if key is None or key == "":
+						counts[f"unkeyed_{side}"] += 1
+						continue
+					# records without a status (not runner output) count as paid; the
+					# runner writes "ok" whenever the call returned, so the payout's
+					# own outcome is checked too
+					failed = False
+					if side == "results":
+						status = get_status(record) if get_status else None
+						failed = (status is not None and status != ok_status) or (
+							get_outcome is not None and get_outcome(record) in failed_outcomes
+						)
+					partitioner.add(
+						str(key),
+						_normalize_amount(get_amount(record)),
+						get_currency(record) if get_currency else None,
+						failed,
+						record,
+					)
+			finally:
+				partitioner.close()
+
+		for i in range(partitions):
+			ledger_rows: Dict[str, List[Tuple[Any, Any, Any]]] = {}
+			with open(os.path.join(scratch, f"ledger-{i:04d}.jsonl"), "rb") as handle:
+				for raw in handle:
+					key, amount, currency, _failed, record = codec.loads(raw)
+					ledger_rows.setdefault(key, []).append((amount, currency, record))
+			with open(os.path.join(scratch, f"results-{i:04d}.jsonl"), "rb") as handle:
+				for raw in handle:
+					key, amount, currency, failed, record = codec.loads(raw)
+					candidates = ledger_rows.get(key)
+					if not candidates:
+						if failed:
+							counts["failed_without_ledger"] += 1
+						else:
+							emit(MISSING_IN_LEDGER, key, result=record)
+						continue
+					ledger_amount_value, ledger_currency_value, ledger_record = candidates.pop(0)
+					if not candidates:
+						del ledger_rows[key]
+					if failed:
+						emit(FAILED, key, result=record, ledger=ledger_record)
+						continue
+					same_currency = currency is None or ledger_currency_value is None or currency == ledger_currency_value
+					if amount is not None and amount == ledger_amount_value and same_currency:
+						emit(MATCHED, key, result=record, ledger=ledger_record)
+					else:
+						emit(AMOUNT_MISMATCH, key, result=record, ledger=ledger_record)
+			for key, leftovers in ledger_rows.items():
+				for _amount, _currency, record in leftovers:
+					emit(MISSING_IN_RESULTS, key, ledger=record)
+	finally:
+		for handle in outputs.values():
+			handle.close()
+		shutil.rmtree(scratch, ignore_errors=True)
+	return summary
+
+
+def main(argv: Optional[list] = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m visa_direct_sdk.reconcile", description="Reconcile payout results against a ledger export.")
+	parser.add_argument("results", help="payout results (JSONL, e.g. python -m visa_direct_sdk.run output, or CSV)")
+	parser.add_argument("ledger", help="ledger export (JSONL or CSV)")
+	parser.add_argument("--out", required=True, help="directory for the matched/amount_mismatch/failed/missing_* JSONL streams")
+	parser.add_argument("--result-key", default="confirmationRef")
+	parser.add_argument("--ledger-key", default="confirmationRef")
+	parser.add_argument("--result-amount", default="result.amount.minor")
+	parser.add_argument("--ledger-amount", default="amountMinor")
+	parser.add_argument("--result-currency")
+	parser.add_argument("--ledger-currency")
+	parser.add_argument("--result-status", default="status", help="result field holding the outcome; '' to treat every result as paid")
+	parser.add_argument("--ok-status", default="ok", help="--result-status value of a paid result")
+	parser.add_argument("--result-outcome", default="result.status", help="result field holding the payout's own status; '' to ignore it")
+	parser.add_argument("--failed-outcome", action="append", help=f"--result-outcome value of an unpaid payout (repeatable; default: {', '.join(sorted(FAILED_OUTCOMES))})")
+	parser.add_argument("--partitions", type=int, help="hash partitions (default: ledger size / --max-partition-mb)")
+	parser.add_argument("--max-partition-mb", type=int, default=_DEFAULT_PARTITION_BYTES // (1024 * 1024))
+	parser.add_argument("--work-dir", help="scratch directory for partitions (default: system temp)")
+	args = parser.parse_args(argv)
+	summary = reconcile(
+		args.results,
+		args.ledger,
+		args.out,
+		result_key=args.result_key,
+		ledger_key=args.ledger_key,
+		result_amount=args.result_amount,
+		ledger_amount=args.ledger_amount,
+		result_currency=args.result_currency,
+		ledger_currency=args.ledger_currency,
+		result_status=args.result_status or None,
+		ok_status=args.ok_status,
+		result_outcome=args.result_outcome or None,
+		failed_outcomes=args.failed_outcome or FAILED_OUTCOMES,
+		partitions=args.partitions,
+		max_partition_bytes=args.max_partition_mb * 1024 * 1024,
+		work_dir=args.work_dir,
+	)
+	print(" ".join(f"{name}={count}" for name, count in summary.counts.items()) + f" partitions={summary.partitions}", file=sys.stderr)
+	return 0 if summary.clean else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
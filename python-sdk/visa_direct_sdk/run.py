@@ -0,0 +1,291 @@
+"""Bulk payout runner.
+
+    python -m visa_direct_sdk.run payouts.jsonl --output results.jsonl --checkpoint run.ckpt --concurrency 16
+
+Requests are streamed from JSONL (one payout request per line, in the dict
+shape accepted by ``Orchestrator.payout``) or CSV (flat columns, see
+``CSV_COLUMNS``) and executed on a bounded thread pool. Each outcome is
+appended to the output as one JSON line and flushed. The checkpoint stores a
+line watermark plus the lines and idempotency keys completed beyond it; on
+restart, outcomes written to the output after the last checkpoint are
+recovered from the output itself, so a restarted run skips everything that
+already has an outcome even after a hard crash.
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Tuple
+
+from .core.batch import run_batch
+from .core.orchestrator import Orchestrator
+from .utils.codec import JsonCodec, default_codec
+
+CSV_COLUMNS = (
+	"originatorId", "idempotencyKey",
+	"fundingType", "debitConfirmed", "confirmationRef", "receiptId", "paymentId", "fundingStatus",
+	"destinationType", "panToken", "accountId", "walletId", "alias", "aliasType",
+	"currency", "amountMinor",
+	"fxSrcCurrency", "fxDstCurrency",
+	"sourceCountry", "targetCountry", "sourceCurrency", "targetCurrency",
+)
+
+
+class Checkpoint:
+	"""Progress of one run: every line up to ``watermark`` has an outcome, plus ``completed`` lines above it.
+
+	Memory is bounded by ``completed``, not by the length of the run.
+	"""
+
+	def __init__(self, path: Optional[str]) -> None:
+		self.path = path
+		self.watermark = 0
+		self.completed: Dict[int, Optional[str]] = {}
+		self.resumed_keys: FrozenSet[str] = frozenset()
+		if path and os.path.exists(path):
+			with open(path, "rb") as handle:
+				state = default_codec().loads(handle.read())
+			self.watermark = int(state.get("watermark", 0))
+			self.completed = {int(line): key for line, key in state.get("completed", {}).items()}
+			self.resumed_keys = frozenset(key for key in self.completed.values() if key)
+
+	@property
+	def resumed(self) -> bool:
+		return self.watermark > 0 or bool(self.completed)
+
+	def is_done(self, line: int, key: Optional[str]) -> bool:
+		return line <= self.watermark or line in self.completed or (key is not None and key in self.resumed_keys)
+
+	def mark(self, line: int, key: Optional[str]) -> None:
+		if line <= self.watermark:
+			return
+		self.completed[line] = key
+		while self.watermark + 1 in self.completed:
+			self.watermark += 1
+			del self.completed[self.watermark]
+
+	def recover(self, path: str, codec: JsonCodec) -> int:
+		"""Mark the outcomes already in output file ``path`` as done and cut off a torn last record.
+
+		Returns the number of outcomes recovered.
+		"""
+		recovered = 0
+		with open(path, "r+b") as handle:
+			size = 0
+			for raw in handle:
+				if not raw.endswith(b"\n"):
+					break
+				try:
+					record = codec.loads(raw)
+					line, key = int(record["line"]), record.get("idempotencyKey")
+				except (ValueError, KeyError, TypeError):
+					break
+				self.mark(line, key)
+				size += len(raw)
+				recovered += 1
+			handle.truncate(size)
+		# only keys above the watermark are kept, so memory stays bounded by the
+		# in-flight window; lines below it are skipped by line number, and a
+		# reordered input still dedupes on the server's idempotency key
+		self.resumed_keys = frozenset(key for key in self.completed.values() if key)
+		return recovered
+
+	def save(self) -> None:
+		if not self.path:
+			return
+		payload = default_codec().dumps({
+			"watermark": self.watermark,
+			"completed": {str(line): key for line, key in self.completed.items()},
+			"updatedAt": time.time(),
+		})
+		tmp = f"{self.path}.tmp"
+		with open(tmp, "wb") as handle:
+			handle.write(payload)
+			handle.flush()
+			os.fsync(handle.fileno())
+		os.replace(tmp, self.path)
+
+
+def iter_jsonl(handle: io.BufferedIOBase, codec: JsonCodec) -> Iterator[Tuple[int, Any]]:
+	"""Yield ``(line, request)``; blank lines yield ``None`` and unparseable ones the exception."""
+	for line_no, raw in enumerate(handle, 1):
+		if not raw.strip():
+			yield line_no, None
+			continue
+		try:
+			yield line_no, codec.loads(raw)
+		except ValueError as exc:
+			yield line_no, exc
+
+
+def iter_csv(handle: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+	# line numbers count data rows, the header is row 0
+	for line_no, row in enumerate(csv.DictReader(handle), 1):
+		try:
+			yield line_no, request_from_row(row)
+		except (KeyError, ValueError) as exc:
+			yield line_no, exc
+
+
+def request_from_row(row: Dict[str, str]) -> Dict[str, Any]:
+	def opt(name: str) -> Optional[str]:
+		value = row.get(name)
+		return value if value not in (None, "") else None
+
+	funding: Dict[str, Any] = {"type": row["fundingType"]}
+	if opt("debitConfirmed") is not None:
+		funding["debitConfirmed"] = row["debitConfirmed"].strip().lower() in ("1", "true", "yes", "y")
+	for column, key in (("confirmationRef", "confirmationRef"), ("receiptId", "receiptId"), ("paymentId", "paymentId"), ("fundingStatus", "status")):
+		if opt(column) is not None:
+			funding[key] = row[column]
+	destination: Dict[str, Any] = {"type": row["destinationType"]}
+	for key in ("panToken", "accountId", "walletId", "alias", "aliasType"):
+		if opt(key) is not None:
+			destination[key] = row[key]
+	request: Dict[str, Any] = {
+		"originatorId": row["originatorId"],
+		"idempotencyKey": row["idempotencyKey"],
+		"funding": funding,
+		"destination": destination,
+		"amount": {"currency": row["currency"], "minor": int(row["amountMinor"])},
+	}
+	preflight: Dict[str, Any] = {}
+	if opt("fxSrcCurrency") and opt("fxDstCurrency"):
+		preflight["fxLock"] = {"srcCurrency": row["fxSrcCurrency"], "dstCurrency": row["fxDstCurrency"]}
+	if opt("sourceCountry") and opt("targetCountry"):
+		preflight["corridor"] = {
+			"sourceCountry": row["sourceCountry"],
+			"targetCountry": row["targetCountry"],
+			"sourceCurrency": opt("sourceCurrency"),
+			"targetCurrency": opt("targetCurrency"),
+		}
+	if preflight:
+		request["preflight"] = preflight
+	return request
+
+
+def run(
+	orchestrator: Orchestrator,
+	source: Iterator[Tuple[int, Any]],
+	output: io.BufferedIOBase,
+	checkpoint: Checkpoint,
+	*,
+	concurrency: int = 8,
+	checkpoint_every: int = 1000,
+	codec: Optional[JsonCodec] = None,
+) -> Dict[str, int]:
+	codec = codec or default_codec()
+	summary = {"ok": 0, "error": 0, "skipped": 0}
+
+	def write(line: int, request: Optional[Dict[str, Any]], result: Any = None, error: Optional[BaseException] = None) -> None:
+		key = request.get("idempotencyKey") if request else None
+		record: Dict[str, Any] = {"line": line, "idempotencyKey": key}
+		funding = request.get("funding") if request else None
+		if isinstance(funding, dict) and funding.get("confirmationRef"):
+			# carried through so results can be reconciled against the ledger
+			record["confirmationRef"] = funding["confirmationRef"]
+		if error is None:
+			record["status"] = "ok"
+			record["result"] = result
+		else:
+			record["status"] = "error"
+			record["error"] = {"type": type(error).__name__, "message": str(error)}
+		output.write(codec.dumps(record) + b"\n")
+		# the output is the record of what was paid: it must reach the OS before
+		# the next payout, so a crash cannot lose an outcome that resume relies on
+		output.flush()
+		summary[record["status"]] += 1
+		checkpoint.mark(line, key)
+		if (summary["ok"] + summary["error"]) % checkpoint_every == 0:
+			_fsync(output)
+			checkpoint.save()
+
+	def pending() -> Iterator[Tuple[int, Any]]:
+		for line, request in source:
+			key = request.get("idempotencyKey") if isinstance(request, dict) else None
+			if request is None or checkpoint.is_done(line, key):
+				if request is not None:
+					summary["skipped"] += 1
+				checkpoint.mark(line, key)
+				continue
+			if isinstance(request, Exception):
+				write(line, None, error=request)
+				continue
+			if not isinstance(request, dict):
+				write(line, None, error=ValueError("payout request must be a JSON object"))
+				continue
+			yield line, request
+
+	try:
+		for outcome in run_batch(lambda item: orchestrator.payout(item[1]), pending(), max_workers=concurrency):
+			line, request = outcome.item
+			write(line, request, outcome.result, outcome.error)
+	finally:
+		_fsync(output)
+		checkpoint.save()
+	return summary
+
+
+def _fsync(output: io.BufferedIOBase) -> None:
+	output.flush()
+	try:
+		os.fsync(output.fileno())
+	except (AttributeError, OSError, io.UnsupportedOperation):
+		pass  # pipes and in-memory buffers
+
+
+def _parse_args(argv: Optional[list]) -> argparse.Namespace:
+	parser = argparse.ArgumentParser(prog="python -m visa_direct_sdk.run", description="Stream payout requests through the Visa Direct SDK.")
+	parser.add_argument("input", help="JSONL or CSV file of payout requests, or - for stdin (JSONL unless --format csv)")
+	parser.add_argument("--format", choices=("auto", "jsonl", "csv"), default="auto")
+	parser.add_argument("--output", default="-", help="JSONL results file (appended to when resuming); - for stdout")
+	parser.add_argument("--checkpoint", help="checkpoint file used to resume an interrupted run")
+	parser.add_argument("--concurrency", type=int, default=8)
+	parser.add_argument("--checkpoint-every", type=int, default=1000, help="outcomes between checkpoint writes")
+	return parser.parse_args(argv)
+
+
+def main(argv: Optional[list] = None, orchestrator: Optional[Orchestrator] = None) -> int:
+	args = _parse_args(argv)
+	fmt = args.format
+	if fmt == "auto":
+		fmt = "csv" if args.input.lower().endswith(".csv") else "jsonl"
+	if orchestrator is None:
+		from .client import VisaDirectClient
+
+		orchestrator = VisaDirectClient().orchestrator
+
+	checkpoint = Checkpoint(args.checkpoint)
+	codec = default_codec()
+	resuming = checkpoint.resumed
+	if args.checkpoint and args.output != "-" and os.path.exists(args.output):
+		# outcomes written after the last checkpoint save (or before the first one)
+		checkpoint.recover(args.output, codec)
+		resuming = True
+	if args.input == "-":
+		# csv.DictReader needs text; JSONL is parsed from bytes
+		source_handle = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="") if fmt == "csv" else sys.stdin.buffer
+	elif fmt == "csv":
+		source_handle = open(args.input, "r", encoding="utf-8", newline="")
+	else:
+		source_handle = open(args.input, "rb")
+	output = sys.stdout.buffer if args.output == "-" else open(args.output, "ab" if resuming else "wb")
+	try:
+		source = iter_csv(source_handle) if fmt == "csv" else iter_jsonl(source_handle, codec)
+		summary = run(orchestrator, source, output, checkpoint, concurrency=args.concurrency, checkpoint_every=args.checkpoint_every, codec=codec)
+	finally:
+		if isinstance(source_handle, io.TextIOWrapper) and args.input == "-":
+			source_handle.detach()  # leave stdin open
+		elif source_handle is not sys.stdin.buffer:
+			source_handle.close()
+		if output is not sys.stdout.buffer:
+			output.close()
+	print(f"ok={summary['ok']} error={summary['error']} skipped={summary['skipped']} watermark={checkpoint.watermark}", file=sys.stderr)
+	return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
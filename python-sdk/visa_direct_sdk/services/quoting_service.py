@@ -1,6 +1,7 @@
 from typing import Any, Dict
 from ..transport.secure_http_client import SecureHttpClient
 from ..storage.cache import Cache, InMemoryCache
+from ..utils.metrics import record_cache_lookup
 
 
 class QuotingService:
@@ -12,6 +13,7 @@ class QuotingService:
 	def lock(self, src_currency: str, dst_currency: str, amount_minor: int) -> Dict[str, Any]:
 		key = f"quote:{src_currency}:{dst_currency}:{amount_minor}"
 		value, should_revalidate = self.cache.get_with_revalidate(key)
+		record_cache_lookup("quote", value, should_revalidate)
 		if value:
 			if should_revalidate:
 				self._revalidate(key, src_currency, dst_currency, amount_minor)
@@ -1,6 +1,7 @@
 from typing import Any, Dict
 from ..transport.secure_http_client import SecureHttpClient
 from ..storage.cache import Cache, InMemoryCache
+from ..utils.metrics import record_cache_lookup
 
 
 class RecipientService:
@@ -12,6 +13,7 @@ class RecipientService:
 	def resolve_alias(self, alias: str, alias_type: str) -> Dict[str, Any]:
 		key = f"alias:{alias_type}:{alias}"
 		value, should_revalidate = self.cache.get_with_revalidate(key)
+		record_cache_lookup("alias", value, should_revalidate)
 		if value:
 			if should_revalidate:
 				self._revalidate(key, "/visaaliasdirectory/v1/resolve", {"alias": alias, "aliasType": alias_type})
@@ -21,6 +23,7 @@ class RecipientService:
 	def pav(self, pan_token: str) -> Dict[str, Any]:
 		key = f"pav:{pan_token}"
 		value, should_revalidate = self.cache.get_with_revalidate(key)
+		record_cache_lookup("pav", value, should_revalidate)
 		if value:
 			if should_revalidate:
 				self._revalidate(key, "/pav/v1/card/validation", {"panToken": pan_token})
@@ -30,6 +33,7 @@ class RecipientService:
 	def ftai(self, pan_token: str) -> Dict[str, Any]:
 		key = f"ftai:{pan_token}"
 		value, should_revalidate = self.cache.get_with_revalidate(key)
+		record_cache_lookup("ftai", value, should_revalidate)
 		if value:
 			if should_revalidate:
 				self._revalidate(key, "/paai/v1/fundstransfer/attributes/inquiry", {"panToken": pan_token})
@@ -39,6 +43,7 @@ class RecipientService:
 	def validate(self, destination_hash: str, payload: Dict[str, Any]) -> Dict[str, Any]:
 		key = f"validate:{destination_hash}"
 		value, should_revalidate = self.cache.get_with_revalidate(key)
+		record_cache_lookup("validate", value, should_revalidate)
 		if value:
 			if should_revalidate:
 				self._revalidate(key, "/visapayouts/v3/payouts/validate", payload)
@@ -0,0 +1,226 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+from ..errors import PayoutStatusTimeout, RateLimitExceeded
+from ..transport.rate_limiter import InMemoryRateLimiter, RateLimit, RateLimiter
+from ..transport.secure_http_client import SecureHttpClient
+
+STATUS_ROUTE = "/visapayouts/v3/payouts/:id"
+TERMINAL_STATUSES = frozenset({"executed", "completed", "settled", "failed", "declined", "rejected", "returned", "cancelled"})
+
+
+class TimerWheel:
+	"""Hashed timing wheel: O(1) schedule, and each tick only visits one slot.
+
+	Items due more than one revolution ahead sit in their slot until the wheel
+	reaches their due tick.
+	"""
+
+	def __init__(self, tick_seconds: float = 0.1, slots: int = 512, *, clock: Callable[[], float] = time.monotonic) -> None:
+		self.tick_seconds = tick_seconds
+		self.clock = clock
+		self._slots: List[List[Tuple[int, Any]]] = [[] for _ in range(slots)]
+		self._current = int(clock() / tick_seconds)
+		self._size = 0
+
+	def __len__(self) -> int:
+		return self._size
+
+	def schedule(self, delay_seconds: float, item: Any) -> None:
+		due = max(int((self.clock() + delay_seconds) / self.tick_seconds), self._current + 1)
+		self._slots[due % len(self._slots)].append((due, item))
+		self._size += 1
+
+	def advance(self, now: Optional[float] = None) -> List[Any]:
+		target = int((self.clock() if now is None else now) / self.tick_seconds)
+		expired: List[Any] = []
+		n = len(self._slots)
+		for tick in range(self._current + 1, self._current + 1 + min(target - self._current, n)):
+			slot = self._slots[tick % n]
+			if not slot:
+				continue
+			keep = []
+			for due, item in slot:
+				if due <= target:
+					expired.append(item)
+				else:
+					keep.append((due, item))
+			self._slots[tick % n] = keep
+		self._current = max(self._current, target)
+		self._size -= len(expired)
+		return expired
+
+
+class _Tracked:
+
+	__slots__ = ("payout_id", "future", "attempts", "last_status")
+
+	def __init__(self, payout_id: str) -> None:
+		self.payout_id = payout_id
+		self.future: Future = Future()
+		self.attempts = 0
+		self.last_status: Optional[str] = None
+
+
+class PayoutStatusTracker:
+	"""Polls payout status until each tracked payout reaches a terminal state.
+
+	Every payout gets its own exponential schedule (``initial_delay`` growing by
+	``multiplier`` up to ``max_delay``, with jitter) on a :class:`TimerWheel`.
+	Due polls are dispatched each tick, in due order, to a small worker pool,
+	paced by one global :class:`RateLimiter` budget (``max_polls_per_second``
+	unless a ``mode="fail_fast"`` limiter is passed). :meth:`track` returns a
+	``Future`` resolved with the final status body, or failed with
+	:class:`PayoutStatusTimeout` after ``max_attempts`` polls.
+	"""
+
+	def __init__(
+		self,
+		http: Optional[SecureHttpClient] = None,
+		*,
+		fetch: Optional[Callable[[str], Any]] = None,
+		rate_limiter: Optional[RateLimiter] = None,
+		max_polls_per_second: float = 50.0,
+		max_workers: int = 8,
+		initial_delay: float = 1.0,
+		multiplier: float = 2.0,
+		max_delay: float = 60.0,
+		jitter: float = 0.1,
+		max_attempts: int = 20,
+		terminal_statuses: FrozenSet[str] = TERMINAL_STATUSES,
+		tick_seconds: float = 0.1,
+		wheel_slots: int = 1024,
+		clock: Callable[[], float] = time.monotonic,
+	) -> None:
+		if fetch is None:
+			if http is None:
+				raise ValueError("PayoutStatusTracker requires an http client or a fetch callable")
+			fetch = lambda payout_id: http.get(f"/visapayouts/v3/payouts/{payout_id}")[0]  # noqa: E731
+		self.fetch = fetch
+		self.rate_limiter = rate_limiter or InMemoryRateLimiter(
+			{STATUS_ROUTE: RateLimit(max_polls_per_second, burst=max(int(max_polls_per_second), 1))},
+			mode="fail_fast",
+		)
+		self.initial_delay = initial_delay
+		self.multiplier = multiplier
+		self.max_delay = max_delay
+		self.jitter = jitter
+		self.max_attempts = max_attempts
+		self.terminal_statuses = frozenset(s.lower() for s in terminal_statuses)
+		self.wheel = TimerWheel(tick_seconds, wheel_slots, clock=clock)
+		self._ready: Deque[_Tracked] = deque()
+		self._items: Dict[str, _Tracked] = {}
+		self._lock = threading.Lock()
+		self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="payout-status") if max_workers > 0 else None
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	@property
+	def pending(self) -> int:
+		return len(self._items)
+
+	def track(self, payout_id: str, callback: Optional[Callable[[Future], None]] = None) -> Future:
+		with self._lock:
+			entry = self._items.get(payout_id)
+			if entry is None:
+				entry = self._items[payout_id] = _Tracked(payout_id)
+				self.wheel.schedule(self._delay(0), entry)
+		if callback is not None:
+			entry.future.add_done_callback(callback)
+		return entry.future
+
+	def untrack(self, payout_id: str) -> None:
+		with self._lock:
+			entry = self._items.pop(payout_id, None)
+		if entry is not None:
+			entry.future.cancel()
+
+	def run_once(self, now: Optional[float] = None) -> int:
+		"""Dispatch due polls until the rate budget runs out; returns how many were sent.
+
+		Polls over budget stay queued in order for the next tick rather than being
+		rescheduled one by one, so a large backlog costs O(sent) per tick.
+		"""
+		with self._lock:
+			self._ready.extend(self.wheel.advance(now))
+		sent = 0
+		ready = self._ready
+		while ready:
+			entry = ready[0]
+			if entry.future.done():
+				ready.popleft()
+				continue
+			try:
+				self.rate_limiter.acquire(STATUS_ROUTE)
+			except RateLimitExceeded:
+				break
+			ready.popleft()
+			if self._pool is None:
+				self._poll(entry)
+			else:
+				self._pool.submit(self._poll, entry)
+			sent += 1
+		return sent
+
+	def start(self) -> "PayoutStatusTracker":
+		if self._thread is None:
+			self._stop.clear()
+			self._thread = threading.Thread(target=self._run, name="payout-status-tracker", daemon=True)
+			self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+		if self._pool is not None:
+			self._pool.shutdown(wait=True)
+
+	def __enter__(self) -> "PayoutStatusTracker":
+		return self.start()
+
+	def __exit__(self, *exc) -> None:
+		self.stop()
+
+	def _run(self) -> None:
+		while not self._stop.wait(self.wheel.tick_seconds):
+			self.run_once()
+
+	def _poll(self, entry: _Tracked) -> None:
+		entry.attempts += 1
+		try:
+			body = self.fetch(entry.payout_id)
+		except Exception:  # noqa: BLE001 - transient (network, 404 before the payout is visible); retry on schedule
+			body = None
+		status = str(body.get("status", "")).lower() if isinstance(body, dict) else None
+		entry.last_status = status
+		if status in self.terminal_statuses:
+			self._finish(entry, result=body)
+		elif entry.attempts >= self.max_attempts:
+			self._finish(entry, error=PayoutStatusTimeout(entry.payout_id, entry.attempts, status))
+		else:
+			with self._lock:
+				if self._items.get(entry.payout_id) is entry:
+					self.wheel.schedule(self._delay(entry.attempts), entry)
+
+	def _finish(self, entry: _Tracked, *, result: Any = None, error: Optional[BaseException] = None) -> None:
+		with self._lock:
+			if self._items.get(entry.payout_id) is entry:
+				del self._items[entry.payout_id]
+		if entry.future.done():
+			return
+		if error is not None:
+			entry.future.set_exception(error)
+		else:
+			entry.future.set_result(result)
+
+	def _delay(self, attempts: int) -> float:
+		delay = min(self.initial_delay * self.multiplier ** attempts, self.max_delay)
+		if self.jitter:
+			delay *= 1 + random.uniform(-self.jitter, self.jitter)
+		return delay
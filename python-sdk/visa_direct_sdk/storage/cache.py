@@ -2,10 +2,7 @@ from typing import Any, Dict, Optional
 import time
 import json
 
-try:  # pragma: no cover
-	import boto3
-except ModuleNotFoundError:  # pragma: no cover
-	boto3 = None
+from ..utils.metrics import get_metrics
 
 
 class Cache:
@@ -31,7 +28,7 @@ class InMemoryCache(Cache):
 			return None
 		value, expires_at, _created = entry
 		if expires_at < time.time():
-			del self._store[key]
+			self._evict(key)
 			return None
 		return value
 
@@ -46,19 +43,25 @@ class InMemoryCache(Cache):
 		value, expires_at, created_at = entry
 		now = time.time()
 		if expires_at < now:
-			del self._store[key]
+			self._evict(key)
 			return None, False
 		ttl = expires_at - created_at
 		age = now - created_at
 		return value, age > ttl / 2 if ttl > 0 else False
 
+	def _evict(self, key: str) -> None:
+		if self._store.pop(key, None) is not None:
+			get_metrics().counter("visa_sdk_cache_evictions_total", reason="expired").inc()
+
 
 class DynamoCache(Cache):
 
 	def __init__(self, table_name: str, client=None, *, payload_attribute: str = "payload", ttl_attribute: str = "ttl", created_at_attribute: str = "createdAt") -> None:
 		if client is None:
-			if boto3 is None:  # pragma: no cover
-				raise RuntimeError("boto3 is required for DynamoCache")
+			try:
+				import boto3
+			except ModuleNotFoundError:  # pragma: no cover
+				raise RuntimeError("boto3 is required for DynamoCache") from None
 			client = boto3.client("dynamodb")
 		self.client = client
 		self.table_name = table_name
@@ -2,11 +2,6 @@ import json
 import time
 from typing import Any, Dict, Optional, Tuple, Callable
 
-try:  # pragma: no cover
-	boto3 = __import__("boto3")
-except ModuleNotFoundError:  # pragma: no cover
-	boto3 = None
-
 
 class IdempotencyStore:
 
@@ -68,8 +63,10 @@ class DynamoIdempotencyStore(IdempotencyStore):
 
 	def __init__(self, table_name: str, client=None, *, payload_attribute: str = "payload", ttl_attribute: str = "ttl") -> None:
 		if client is None:
-			if boto3 is None:  # pragma: no cover
-				raise RuntimeError("boto3 is required for DynamoIdempotencyStore")
+			try:
+				import boto3
+			except ModuleNotFoundError:  # pragma: no cover
+				raise RuntimeError("boto3 is required for DynamoIdempotencyStore") from None
 			client = boto3.client("dynamodb")
 		self.client = client
 		self.table_name = table_name
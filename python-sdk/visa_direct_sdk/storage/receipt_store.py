@@ -1,10 +1,5 @@
 import time
 
-try:  # pragma: no cover - optional dependency at runtime
-	import boto3
-except ModuleNotFoundError:  # pragma: no cover
-	boto3 = None
-
 
 class ReceiptStore:
 
@@ -50,8 +45,10 @@ class DynamoReceiptStore(ReceiptStore):
 
 	def __init__(self, table_name: str, client=None, *, ttl_seconds: int = 86400) -> None:
 		if client is None:
-			if boto3 is None:  # pragma: no cover
-				raise RuntimeError("boto3 is required for DynamoReceiptStore")
+			try:
+				import boto3
+			except ModuleNotFoundError:  # pragma: no cover
+				raise RuntimeError("boto3 is required for DynamoReceiptStore") from None
 			client = boto3.client("dynamodb")
 		self.client = client
 		self.table_name = table_name
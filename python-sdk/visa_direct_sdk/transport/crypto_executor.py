@@ -0,0 +1,142 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from ..errors import JWEDecryptError
+from ..utils.metrics import get_metrics
+
+if TYPE_CHECKING:  # pragma: no cover
+	from concurrent.futures import Future
+
+	from jwcrypto import jwk
+
+# jwcrypto (and the cryptography backend under it) is imported on the first
+# JWE operation, so deployments without MLE never load it.
+
+# Parsed keys, populated lazily in each process (worker or caller) so that RSA
+# material is only imported once per key rather than once per request. Bounded
+# LRU: rotations retire kids, and retired keys should not pile up.
+KEY_CACHE_SIZE = 32
+_KEY_CACHE: "OrderedDict[Tuple[Optional[str], Optional[str], bool], jwk.JWK]" = OrderedDict()
+_KEY_CACHE_LOCK = threading.Lock()
+
+
+def _key_id(key: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], bool]:
+	# the public and private halves of a key share kid and modulus
+	return key.get("kid"), key.get("n") or key.get("x") or key.get("k"), "d" in key
+
+
+def load_jwk(key: Dict[str, Any]) -> "jwk.JWK":
+	cache_key = _key_id(key)
+	with _KEY_CACHE_LOCK:
+		parsed = _KEY_CACHE.get(cache_key)
+		if parsed is not None:
+			_KEY_CACHE.move_to_end(cache_key)
+			return parsed
+	from jwcrypto import jwk
+
+	parsed = jwk.JWK(**key)
+	with _KEY_CACHE_LOCK:
+		_KEY_CACHE[cache_key] = parsed
+		while len(_KEY_CACHE) > KEY_CACHE_SIZE:
+			_KEY_CACHE.popitem(last=False)
+	return parsed
+
+
+def encrypt_compact(plaintext: bytes, key: Dict[str, Any], protected: str) -> str:
+	from jwcrypto import jwe
+
+	token = jwe.JWE(plaintext, protected)
+	token.add_recipient(load_jwk(key))
+	return token.serialize(compact=True)
+
+
+def decrypt_compact(token: str, key: Dict[str, Any]) -> bytes:
+	from jwcrypto import jwe
+
+	jwetoken = jwe.JWE()
+	jwetoken.deserialize(token)
+	jwetoken.decrypt(load_jwk(key))
+	return jwetoken.payload
+
+
+def _init_worker(keys: Iterable[Dict[str, Any]]) -> None:
+	for key in keys:
+		load_jwk(key)
+
+
+def _encrypt_task(plaintext: bytes, key: Dict[str, Any], protected: str) -> str:
+	try:
+		return encrypt_compact(plaintext, key, protected)
+	except Exception as exc:  # noqa: BLE001 - jwcrypto errors do not round-trip through pickle
+		raise JWEDecryptError(f"JWE encryption failed: {exc}") from None
+
+
+def _decrypt_task(token: str, key: Dict[str, Any]) -> bytes:
+	try:
+		return decrypt_compact(token, key)
+	except Exception as exc:  # noqa: BLE001
+		raise JWEDecryptError(f"JWE decryption failed: {exc}") from None
+
+
+class JweCryptoExecutor:
+	"""Runs JWE serialize/decrypt in a process pool so MLE crypto scales past one core.
+
+	Queued plus running tasks are exported as ``visa_sdk_crypto_pool_pending`` and
+	the pool size as ``visa_sdk_crypto_pool_workers``.
+	"""
+
+	def __init__(self, max_workers: Optional[int] = None, *, keys: Iterable[Dict[str, Any]] = (), mp_context=None) -> None:
+		from concurrent.futures import ProcessPoolExecutor
+
+		self.max_workers = max_workers or os.cpu_count() or 1
+		self._pool = ProcessPoolExecutor(
+			max_workers=self.max_workers,
+			mp_context=mp_context,
+			initializer=_init_worker,
+			initargs=(list(keys),),
+		)
+		get_metrics().gauge("visa_sdk_crypto_pool_workers").inc(self.max_workers)
+		self._closed = False
+
+	def submit_encrypt(self, plaintext: bytes, key: Dict[str, Any], protected: str) -> "Future[str]":
+		return self._tracked(self._pool.submit(_encrypt_task, plaintext, key, protected))
+
+	def submit_decrypt(self, token: str, key: Dict[str, Any]) -> "Future[bytes]":
+		return self._tracked(self._pool.submit(_decrypt_task, token, key))
+
+	@staticmethod
+	def _tracked(future: "Future") -> "Future":
+		pending = get_metrics().gauge("visa_sdk_crypto_pool_pending")
+		pending.inc()
+		future.add_done_callback(lambda _f: pending.dec())
+		return future
+
+	def encrypt(self, plaintext: bytes, key: Dict[str, Any], protected: str) -> str:
+		return self.submit_encrypt(plaintext, key, protected).result()
+
+	def decrypt(self, token: str, key: Dict[str, Any]) -> bytes:
+		return self.submit_decrypt(token, key).result()
+
+	async def encrypt_async(self, plaintext: bytes, key: Dict[str, Any], protected: str) -> str:
+		import asyncio  # already loaded by the running loop
+
+		return await asyncio.wrap_future(self.submit_encrypt(plaintext, key, protected))
+
+	async def decrypt_async(self, token: str, key: Dict[str, Any]) -> bytes:
+		import asyncio
+
+		return await asyncio.wrap_future(self.submit_decrypt(token, key))
+
+	def shutdown(self, wait: bool = True) -> None:
+		self._pool.shutdown(wait=wait)
+		if not self._closed:
+			self._closed = True
+			get_metrics().gauge("visa_sdk_crypto_pool_workers").dec(self.max_workers)
+
+	def __enter__(self) -> "JweCryptoExecutor":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.shutdown()
@@ -0,0 +1,110 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Union
+
+from ..utils.metrics import get_metrics
+
+
+@dataclass
+class EndpointStats:
+	url: str
+	ewma_latency: float = 0.0
+	samples: int = 0
+	consecutive_failures: int = 0
+	ejected_until: float = 0.0
+
+
+class EndpointPool:
+	"""Tracks health and EWMA latency for several base URLs of one environment.
+
+	Healthy endpoints are ordered by recent failures, then smoothed latency
+	(unmeasured ones first so they get probed). An endpoint is ejected after
+	``failure_threshold`` consecutive failures and becomes eligible again once
+	``cooldown_seconds`` have passed. Health is exported as the
+	``visa_sdk_endpoint_healthy{endpoint}`` gauge (updated on transitions) and
+	ejections as ``visa_sdk_endpoint_ejections_total{endpoint}``.
+	"""
+
+	def __init__(self, base_urls: Sequence[str], *, alpha: float = 0.2, failure_threshold: int = 3, cooldown_seconds: float = 30.0) -> None:
+		if not base_urls:
+			raise ValueError("EndpointPool requires at least one base URL")
+		self.alpha = alpha
+		self.failure_threshold = failure_threshold
+		self.cooldown_seconds = cooldown_seconds
+		self._stats = {url: EndpointStats(url) for url in base_urls}
+		self._order = list(self._stats)
+		self._lock = threading.Lock()
+		self._healthy = dict.fromkeys(self._stats, True)
+		metrics = get_metrics()
+		for url in self._stats:
+			metrics.gauge("visa_sdk_endpoint_healthy", endpoint=url).set(1)
+
+	@property
+	def primary(self) -> str:
+		return self._order[0]
+
+	def candidates(self) -> List[str]:
+		now = time.monotonic()
+		with self._lock:
+			healthy = [s for s in self._stats.values() if s.ejected_until <= now]
+			ejected = [s for s in self._stats.values() if s.ejected_until > now]
+			# ejected endpoints come back by cooldown, without a success to report it
+			recovered = [s.url for s in healthy if not self._healthy[s.url]]
+			for url in recovered:
+				self._healthy[url] = True
+		for url in recovered:
+			get_metrics().gauge("visa_sdk_endpoint_healthy", endpoint=url).set(1)
+		healthy.sort(key=lambda s: (s.consecutive_failures, s.samples > 0, s.ewma_latency))
+		ejected.sort(key=lambda s: s.ejected_until)
+		return [s.url for s in healthy] + [s.url for s in ejected]
+
+	def record_success(self, url: str, latency_seconds: float) -> None:
+		with self._lock:
+			stats = self._stats[url]
+			if stats.samples == 0:
+				stats.ewma_latency = latency_seconds
+			else:
+				stats.ewma_latency += self.alpha * (latency_seconds - stats.ewma_latency)
+			stats.samples += 1
+			stats.consecutive_failures = 0
+			stats.ejected_until = 0.0
+			recovered = not self._healthy[url]
+			self._healthy[url] = True
+		if recovered:
+			get_metrics().gauge("visa_sdk_endpoint_healthy", endpoint=url).set(1)
+
+	def record_failure(self, url: str) -> None:
+		with self._lock:
+			stats = self._stats[url]
+			stats.consecutive_failures += 1
+			ejected = stats.consecutive_failures >= self.failure_threshold
+			if ejected:
+				stats.ejected_until = time.monotonic() + self.cooldown_seconds
+			newly_ejected = ejected and self._healthy[url]
+			if newly_ejected:
+				self._healthy[url] = False
+		if newly_ejected:
+			metrics = get_metrics()
+			metrics.gauge("visa_sdk_endpoint_healthy", endpoint=url).set(0)
+			metrics.counter("visa_sdk_endpoint_ejections_total", endpoint=url).inc()
+
+	def snapshot(self) -> List[Dict[str, Any]]:
+		now = time.monotonic()
+		with self._lock:
+			return [
+				{
+					"url": s.url,
+					"ewmaLatencyMs": round(s.ewma_latency * 1000, 3),
+					"samples": s.samples,
+					"healthy": s.ejected_until <= now,
+				}
+				for s in self._stats.values()
+			]
+
+
+def parse_base_urls(value: Union[str, Sequence[str], None]) -> List[str]:
+	if not value:
+		return []
+	items = value.split(",") if isinstance(value, str) else list(value)
+	return [item.strip().rstrip("/") for item in items if item and item.strip()]
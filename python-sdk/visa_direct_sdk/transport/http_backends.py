@@ -0,0 +1,106 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+	import ssl
+
+	import requests
+
+# requests and httpx are imported when a backend is built, not when the SDK is
+# imported: together they are a large share of cold-start time.
+
+Cert = Union[None, str, Tuple[str, str]]
+Verify = Union[bool, str]
+
+
+class HttpBackend:
+	"""Wire transport used by SecureHttpClient.
+
+	Responses only need ``status_code``, ``content``, ``headers``, ``raise_for_status()``
+	and ``json()``, which both ``requests`` and ``httpx`` responses provide.
+	"""
+
+	errors: Tuple[Type[BaseException], ...] = ()
+
+	def post(self, url: str, *, data: bytes, headers: Dict[str, str]) -> Any:  # pragma: no cover
+		raise NotImplementedError
+
+	def get(self, url: str, *, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Any:  # pragma: no cover
+		raise NotImplementedError
+
+	def close(self) -> None:  # pragma: no cover
+		pass
+
+
+class RequestsBackend(HttpBackend):
+
+	def __init__(self, *, cert: Cert = None, verify: Verify = True, session: Optional["requests.Session"] = None) -> None:
+		import requests
+
+		self.errors = (requests.RequestException,)
+		self.session = session or requests.Session()
+		self.cert = cert
+		self.verify = verify
+
+	def post(self, url: str, *, data: bytes, headers: Dict[str, str]) -> Any:
+		return self.session.post(url, data=data, headers=headers, cert=self.cert, verify=self.verify)
+
+	def get(self, url: str, *, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Any:
+		return self.session.get(url, headers=headers, timeout=timeout, cert=self.cert, verify=self.verify)
+
+	def close(self) -> None:
+		self.session.close()
+
+
+class Http2Backend(HttpBackend):
+	"""HTTP/2 transport on httpx: concurrent requests multiplex over a few connections.
+
+	``prior_knowledge=True`` speaks h2c without ALPN (for local cleartext stand-ins).
+	"""
+
+	def __init__(
+		self,
+		*,
+		cert: Cert = None,
+		verify: Verify = True,
+		max_connections: int = 4,
+		timeout: float = 30.0,
+		prior_knowledge: bool = False,
+	) -> None:
+		try:
+			import httpx
+		except ModuleNotFoundError:  # pragma: no cover
+			raise RuntimeError("httpx[http2] is required for Http2Backend") from None
+		self.errors = (httpx.HTTPError,)
+		self.client = httpx.Client(
+			http1=not prior_knowledge,
+			http2=True,
+			verify=_ssl_context(cert, verify),
+			timeout=timeout,
+			limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+		)
+
+	def post(self, url: str, *, data: bytes, headers: Dict[str, str]) -> Any:
+		return self.client.post(url, content=data, headers=headers)
+
+	def get(self, url: str, *, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Any:
+		# httpx reads timeout=None as "no timeout", not "client default"
+		if timeout is None:
+			return self.client.get(url, headers=headers)
+		return self.client.get(url, headers=headers, timeout=timeout)
+
+	def close(self) -> None:
+		self.client.close()
+
+
+def _ssl_context(cert: Cert, verify: Verify) -> "ssl.SSLContext":
+	import ssl
+
+	ctx = ssl.create_default_context(cafile=verify if isinstance(verify, str) else None)
+	if verify is False:
+		ctx.check_hostname = False
+		ctx.verify_mode = ssl.CERT_NONE
+	if isinstance(cert, tuple):
+		ctx.load_cert_chain(cert[0], cert[1])
+	elif cert:
+		ctx.load_cert_chain(cert)
+	return ctx
@@ -0,0 +1,147 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from ..errors import RateLimitExceeded
+
+# floor on the interval between sweeps of expired in-memory TATs
+_MIN_SWEEP_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class RateLimit:
+	per_second: float
+	burst: int = 1
+
+	@property
+	def emission_interval(self) -> float:
+		return 1.0 / self.per_second
+
+	@property
+	def tolerance(self) -> float:
+		return self.emission_interval * max(self.burst - 1, 0)
+
+
+class RateLimiter:
+	"""GCRA limiter keyed by route and originator.
+
+	``mode="block"`` waits for admission up to ``max_wait_seconds`` before raising
+	:class:`RateLimitExceeded`; ``mode="fail_fast"`` raises as soon as a request
+	would exceed the limit. Routes without a configured limit are not paced.
+	"""
+
+	def __init__(
+		self,
+		limits: Dict[str, RateLimit],
+		*,
+		default: Optional[RateLimit] = None,
+		mode: str = "block",
+		max_wait_seconds: float = 5.0,
+	) -> None:
+		if mode not in ("block", "fail_fast"):
+			raise ValueError(f"Unknown rate limiter mode {mode}")
+		self.limits = dict(limits)
+		self.default = default
+		self.mode = mode
+		self.max_wait_seconds = max_wait_seconds
+
+	def try_acquire(self, key: str, limit: RateLimit) -> float:  # pragma: no cover
+		"""Admit one request for ``key`` and return 0.0, or return the seconds to wait."""
+		raise NotImplementedError
+
+	def limit_for(self, route: str) -> Optional[RateLimit]:
+		return self.limits.get(route, self.default)
+
+	def acquire(self, route: str, originator_id: Optional[str] = None, *, max_wait_seconds: Optional[float] = None) -> None:
+		limit = self.limit_for(route)
+		if limit is None:
+			return
+		key = f"{route}|{originator_id or '*'}"
+		wait = self.try_acquire(key, limit)
+		if wait <= 0:
+			return
+		if self.mode == "fail_fast":
+			raise RateLimitExceeded(route, originator_id, wait)
+		budget = self.max_wait_seconds if max_wait_seconds is None else max_wait_seconds
+		deadline = time.monotonic() + budget
+		while wait > 0:
+			remaining = deadline - time.monotonic()
+			if wait > remaining:
+				raise RateLimitExceeded(route, originator_id, wait)
+			time.sleep(wait)
+			wait = self.try_acquire(key, limit)
+
+
+class InMemoryRateLimiter(RateLimiter):
+	"""Process-local GCRA state.
+
+	A key whose TAT has passed behaves exactly like a missing key, so such keys
+	are swept out at most once per longest burst horizon seen; memory is bounded
+	by the keys active within that horizon, not by every originator ever seen.
+	"""
+
+	def __init__(self, limits: Dict[str, RateLimit], **kwargs) -> None:
+		super().__init__(limits, **kwargs)
+		self._tat: Dict[str, float] = {}
+		self._lock = threading.Lock()
+		self._horizon = _MIN_SWEEP_SECONDS
+		self._next_sweep = time.monotonic() + self._horizon
+
+	def try_acquire(self, key: str, limit: RateLimit) -> float:
+		now = time.monotonic()
+		with self._lock:
+			if now >= self._next_sweep:
+				# rebuilt rather than deleted from, so the dict also shrinks
+				self._tat = {k: t for k, t in self._tat.items() if t > now}
+				self._next_sweep = now + self._horizon
+			tat = max(self._tat.get(key, now), now)
+			allow_at = tat - limit.tolerance
+			if allow_at > now:
+				return allow_at - now
+			self._tat[key] = tat + limit.emission_interval
+			horizon = limit.emission_interval + limit.tolerance
+			if horizon > self._horizon:
+				self._horizon = horizon
+			return 0.0
+
+
+# KEYS[1] = bucket key, ARGV = emission interval (us), tolerance (us), ttl (ms).
+# Uses the server clock so every SDK instance shares one timeline.
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local allow_at = tat - tolerance
+if allow_at > now then return allow_at - now end
+redis.call('SET', KEYS[1], tat + interval, 'PX', ARGV[3])
+return 0
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+
+	def __init__(self, client, limits: Dict[str, RateLimit], *, prefix: str = "ratelimit:", **kwargs) -> None:
+		super().__init__(limits, **kwargs)
+		self.client = client
+		self.prefix = prefix
+		self._script = client.register_script(_GCRA_SCRIPT) if hasattr(client, "register_script") else None
+
+	def try_acquire(self, key: str, limit: RateLimit) -> float:
+		interval_us, tolerance_us = self._params(limit)
+		ttl_ms = max(int((interval_us + tolerance_us) / 1000) + 1000, 1000)
+		args = [interval_us, tolerance_us, ttl_ms]
+		name = f"{self.prefix}{key}"
+		if self._script is not None:
+			wait_us = self._script(keys=[name], args=args)
+		elif hasattr(self.client, "eval"):
+			wait_us = self.client.eval(_GCRA_SCRIPT, 1, name, *args)
+		else:
+			raise RuntimeError("Redis client must expose register_script or eval")
+		return int(wait_us) / 1_000_000
+
+	def _params(self, limit: RateLimit) -> Tuple[int, int]:
+		return int(limit.emission_interval * 1_000_000), int(limit.tolerance * 1_000_000)
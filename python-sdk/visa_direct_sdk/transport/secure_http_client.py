@@ -1,13 +1,38 @@
+import base64
 import json
 import os
 import re
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import requests
-from jwcrypto import jwk, jwe
 from ..errors import JWEKidUnknownError, JWEDecryptError
+from ..utils.codec import JsonCodec, default_codec
+from ..utils.metrics import get_metrics
 from ..utils.otel import use_span
+from ..utils.recording import TrafficRecorder
+from ..utils.timing import stage
+from .endpoint_pool import EndpointPool, parse_base_urls
+from .http_backends import HttpBackend, RequestsBackend
+from .crypto_executor import JweCryptoExecutor, decrypt_compact, encrypt_compact
+from .rate_limiter import RateLimiter
+
+_FAILOVER_STATUSES = frozenset({502, 503, 504})
+# metric and recording label for paths matching no configured route, so
+# per-resource paths cannot grow label cardinality without bound
+_UNMATCHED_ROUTE = "unmatched"
+
+
+def _error_status(exc: BaseException) -> str:
+	# raise_for_status errors carry the response; transport errors do not
+	response = getattr(exc, "response", None)
+	status_code = getattr(response, "status_code", None)
+	return str(status_code) if status_code is not None else "error"
+
+
+def _protected_header(token: str) -> Dict[str, Any]:
+	# decoded here rather than with jwcrypto so plain-JSON deployments never import it
+	segment = token.split(".", 1)[0]
+	return json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
 
 
 class SecureHttpClient:
@@ -15,11 +40,17 @@ class SecureHttpClient:
 	def __init__(
 		self,
 		*,
-		base_url: Optional[str] = None,
+		base_url: Union[str, List[str], None] = None,
 		cert_path: Optional[str] = None,
 		key_path: Optional[str] = None,
 		ca_path: Optional[str] = None,
 		endpoints_file: Optional[str] = None,
+		rate_limiter: Optional[RateLimiter] = None,
+		codec: Optional[JsonCodec] = None,
+		crypto_executor: Optional[JweCryptoExecutor] = None,
+		backend: Optional[HttpBackend] = None,
+		recorder: Optional[TrafficRecorder] = None,
+		failover_on_idempotency_key: Optional[bool] = None,
 	):
 
 		endpoints_path = endpoints_file or os.path.abspath(os.path.join(os.getcwd(), "../endpoints/endpoints.json"))
@@ -34,21 +65,47 @@ class SecureHttpClient:
 
 		with_env = re.sub(r"\$\{([^:}]+)(?::-(.*?))?}", subst_env, raw)
 		self.endpoints = json.loads(with_env)
+		routes = self.endpoints.get("routes", [])
+		self._exact_routes = {r["path"]: r for r in routes if ":" not in r["path"]}
+		self._param_routes = [r for r in routes if ":" in r["path"]]
 
-		self.base_url = base_url or os.environ.get("VISA_BASE_URL") or self.endpoints["baseUrls"]["visa"]
-		self.session = requests.Session()
+		base_urls = parse_base_urls(base_url or os.environ.get("VISA_BASE_URL") or self.endpoints["baseUrls"]["visa"])
+		failover = self.endpoints.get("failover", {})
+		self.endpoint_pool = EndpointPool(
+			base_urls,
+			alpha=float(failover.get("ewmaAlpha", 0.2)),
+			failure_threshold=int(failover.get("failureThreshold", 3)),
+			cooldown_seconds=float(failover.get("cooldownSeconds", 30)),
+		)
+		# the configured primary; spans record the endpoint each request actually used
+		self.base_url = self.endpoint_pool.primary
+		# a request's x-idempotency-key only makes it safe to resend to another
+		# region if the gateway deduplicates keys globally, so it is opt-in
+		if failover_on_idempotency_key is None:
+			failover_on_idempotency_key = bool(failover.get("idempotencyKeyFailover", False))
+		self.failover_on_idempotency_key = failover_on_idempotency_key
 		self.cert = (cert_path, key_path) if cert_path and key_path else cert_path
 		self.verify = ca_path or True
+		self.backend = backend or RequestsBackend(cert=self.cert, verify=self.verify)
 		self._jwks_cache: Optional[Dict[str, Any]] = None
 		self._jwks_expires: float = 0.0
 		self._env_mode = "production" if os.environ.get("SDK_ENV") == "production" else "dev"
+		self.rate_limiter = rate_limiter
+		self.codec = codec or default_codec()
+		self.crypto_executor = crypto_executor
+		self.recorder = recorder
 
 	def requires_mle(self, path: str) -> bool:
-		for route in self.endpoints.get("routes", []):
-			rp = route.get("path")
-			if rp == path or (":" in rp and self._match_param_route(rp, path)):
-				return bool(route.get("requiresMLE"))
-		return False
+		return bool(self._route(path).get("requiresMLE"))
+
+	def _route(self, path: str) -> Dict[str, Any]:
+		route = self._exact_routes.get(path)
+		if route is not None:
+			return route
+		for route in self._param_routes:
+			if self._match_param_route(route["path"], path):
+				return route
+		return {}
 
 	def _match_param_route(self, template: str, actual: str) -> bool:
 		t = template.split("/")
@@ -64,52 +121,155 @@ class SecureHttpClient:
 
 	def post(self, path: str, data: Dict[str, Any], *, headers: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], int, Dict[str, Any]]:
 
-		with use_span("secure_http_client.post", {
+		route = self._route(path)
+		requires_mle = bool(route.get("requiresMLE"))
+		started = time.perf_counter_ns()
+		status = "error"
+		try:
+			res_data, status_code, res_headers = self._post(path, data, headers, route, requires_mle)
+			status = str(status_code)
+			return res_data, status_code, res_headers
+		except Exception as exc:
+			status = _error_status(exc)
+			raise
+		finally:
+			label = route.get("path", _UNMATCHED_ROUTE)
+			get_metrics().timer("visa_sdk_http_request_seconds", route=label, method="POST", status=status).observe_ns(time.perf_counter_ns() - started)
+			if self.recorder is not None:
+				self.recorder.record_http("POST", label, status, started, mle=requires_mle, headers=headers)
+
+	def _post(self, path: str, data: Dict[str, Any], headers: Optional[Dict[str, str]], route: Dict[str, Any], requires_mle: bool) -> Tuple[Dict[str, Any], int, Dict[str, Any]]:
+		with use_span("secure_http_client.post", lambda: {
 			"http.method": "POST",
-			"http.url": f"{self.base_url}{path}",
-			"visa.requires_mle": self.requires_mle(path),
+			"http.route": route.get("path", path),
+			"visa.requires_mle": requires_mle,
 			"visa.sdk.env": self._env_mode,
 		}) as span:
 			payload: Any = data
 			req_headers = dict(headers or {})
-			requires_mle = self.requires_mle(path)
 			used_encryption = False
 
+			if self.rate_limiter is not None:
+				with stage("rate_limit"):
+					# keyed by route template, like GET, so ids in the path share one bucket
+					self.rate_limiter.acquire(route.get("path", path), data.get("originatorId") if isinstance(data, dict) else None)
+
 			if requires_mle:
-				body, extra_headers, used_encryption = self._encrypt_jwe(data, span)
+				with stage("jwe.encrypt"):
+					body, extra_headers, used_encryption = self._encrypt_jwe(data, span)
 				payload = body
 				req_headers.update(extra_headers)
+			if not used_encryption:
+				with stage("encode"):
+					payload = self.codec.dumps(payload)
+				req_headers.setdefault("content-type", "application/json")
 
-			resp = self.session.post(
-				self.base_url + path,
-				json=payload if not requires_mle or not used_encryption else None,
-				data=payload if requires_mle and used_encryption else None,
-				headers=req_headers,
-				cert=self.cert,
-				verify=self.verify,
-			)
+			idempotent = bool(route.get("idempotent")) or (self.failover_on_idempotency_key and "x-idempotency-key" in req_headers)
+			with stage("network"):
+				resp = self._send(path, payload, req_headers, idempotent, span)
 			resp.raise_for_status()
 
 			if requires_mle and used_encryption:
-				try:
-					res_data = self._decrypt_jwe(resp.text, span)
-				except JWEKidUnknownError:
-					if span:
-						span.add_event("jwe.decrypt.retry_on_kid_miss")
-					self._refresh_jwks()
-					res_data = self._decrypt_jwe(resp.text, span)
-				except Exception as e:  # noqa: BLE001
-					if span:
-						span.add_event("jwe.decrypt.error")
-					raise JWEDecryptError(str(e))
+				with stage("jwe.decrypt"):
+					try:
+						res_data = self._decrypt_jwe(resp.content, span)
+					except JWEKidUnknownError:
+						if span:
+							span.add_event("jwe.decrypt.retry_on_kid_miss")
+						get_metrics().counter("visa_sdk_jwe_kid_miss_total").inc()
+						self._refresh_jwks()
+						res_data = self._decrypt_jwe(resp.content, span)
+					except Exception as e:  # noqa: BLE001
+						if span:
+							span.add_event("jwe.decrypt.error")
+						raise JWEDecryptError(str(e))
 			else:
-				res_data = self._parse_maybe_json(resp.text if isinstance(resp.text, str) else resp.content)
+				with stage("decode"):
+					res_data = self._parse_maybe_json(resp.content)
 
 			if span:
 				span.set_attribute("http.status_code", resp.status_code)
 
 			return res_data, resp.status_code, dict(resp.headers)
 
+	def get(self, path: str, *, headers: Optional[Dict[str, str]] = None) -> Tuple[Any, int, Dict[str, Any]]:
+		route = self._route(path)
+		started = time.perf_counter_ns()
+		status = "error"
+		try:
+			res_data, status_code, res_headers = self._get(path, headers, route)
+			status = str(status_code)
+			return res_data, status_code, res_headers
+		except Exception as exc:
+			status = _error_status(exc)
+			raise
+		finally:
+			get_metrics().timer("visa_sdk_http_request_seconds", route=route.get("path", _UNMATCHED_ROUTE), method="GET", status=status).observe_ns(time.perf_counter_ns() - started)
+
+	def _get(self, path: str, headers: Optional[Dict[str, str]], route: Dict[str, Any]) -> Tuple[Any, int, Dict[str, Any]]:
+		with use_span("secure_http_client.get", lambda: {
+			"http.method": "GET",
+			"http.route": route.get("path", path),
+			"visa.sdk.env": self._env_mode,
+		}) as span:
+			if self.rate_limiter is not None:
+				# keyed by route template so per-resource paths share one bucket
+				self.rate_limiter.acquire(route.get("path", path), None)
+			resp = self._send(path, None, dict(headers or {}), True, span, method="GET")
+			resp.raise_for_status()
+			if route.get("requiresMLE"):
+				res_data = self._decrypt_jwe(resp.content, span)
+			else:
+				res_data = self._parse_maybe_json(resp.content)
+			if span:
+				span.set_attribute("http.status_code", resp.status_code)
+			return res_data, resp.status_code, dict(resp.headers)
+
+	def _send(self, path: str, payload: Any, headers: Dict[str, str], idempotent: bool, span=None, method: str = "POST") -> Any:
+		candidates = self.endpoint_pool.candidates()
+		if not idempotent:
+			candidates = candidates[:1]
+		last = len(candidates) - 1
+		# requests holding a backend connection (or HTTP/2 stream) right now
+		in_flight = get_metrics().gauge("visa_sdk_http_in_flight")
+		for attempt, base in enumerate(candidates):
+			if span:
+				span.set_attribute("http.url", base + path)
+			started = time.perf_counter()
+			in_flight.inc()
+			try:
+				try:
+					if method == "GET":
+						resp = self.backend.get(base + path, headers=headers)
+					else:
+						resp = self.backend.post(base + path, data=payload, headers=headers)
+				finally:
+					in_flight.dec()
+			except self.backend.errors:
+				self.endpoint_pool.record_failure(base)
+				if attempt == last:
+					raise
+				if span:
+					span.add_event("http.failover", {"visa.endpoint": base})
+				continue
+			if resp.status_code in _FAILOVER_STATUSES:
+				self.endpoint_pool.record_failure(base)
+				if attempt < last:
+					if span:
+						span.add_event("http.failover", {"visa.endpoint": base, "http.status_code": resp.status_code})
+					continue
+			else:
+				self.endpoint_pool.record_success(base, time.perf_counter() - started)
+			return resp
+
+	async def post_async(self, path: str, data: Dict[str, Any], *, headers: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], int, Dict[str, Any]]:
+		import asyncio  # already loaded by the running loop
+
+		return await asyncio.to_thread(self.post, path, data, headers=headers)
+
+	def close(self) -> None:
+		self.backend.close()
+
 	def _get_jwks(self) -> Dict[str, Any]:
 		now = time.time()
 		ttl = float(self.endpoints.get("jwks", {}).get("cacheTtlSeconds", 300))
@@ -121,12 +281,14 @@ class SecureHttpClient:
 			self._jwks_expires = now + ttl
 			return self._jwks_cache
 		try:
-			r = self.session.get(url, timeout=5)
+			r = self.backend.get(url, timeout=5)
 			r.raise_for_status()
 			self._jwks_cache = r.json()
 			self._jwks_expires = now + ttl
+			get_metrics().counter("visa_sdk_jwks_fetches_total", outcome="ok").inc()
 			return self._jwks_cache
-		except requests.RequestException as exc:
+		except self.backend.errors as exc:
+			get_metrics().counter("visa_sdk_jwks_fetches_total", outcome="error").inc()
 			if self._env_mode == "production":
 				raise JWEDecryptError(f"Unable to fetch JWKS: {exc}") from exc
 			self._jwks_cache = {"keys": []}
@@ -139,13 +301,11 @@ class SecureHttpClient:
 		self._get_jwks()
 
 	def _parse_maybe_json(self, payload: Any) -> Any:
-		if isinstance(payload, (bytes, bytearray)):
-			payload = payload.decode("utf-8")
-		if isinstance(payload, str):
+		if isinstance(payload, (bytes, bytearray, str)):
 			try:
-				return json.loads(payload)
-			except json.JSONDecodeError:
-				return payload
+				return self.codec.loads(payload)
+			except ValueError:
+				return payload.decode("utf-8", errors="replace") if isinstance(payload, (bytes, bytearray)) else payload
 		return payload
 
 	def _encrypt_jwe(self, payload: Dict[str, Any], span=None) -> Tuple[Any, Dict[str, str], bool]:
@@ -161,31 +321,37 @@ class SecureHttpClient:
 			return payload, {"content-type": "application/json"}, False
 		k = keys[0]
 		kid = k.get("kid", "unknown")
-		pub = jwk.JWK(**k)
-		protected = {"alg": "RSA-OAEP-256", "enc": "A256GCM", "kid": kid}
-		jwetoken = jwe.JWE(json.dumps(payload).encode("utf-8"), json.dumps(protected))
-		jwetoken.add_recipient(pub)
+		protected = json.dumps({"alg": "RSA-OAEP-256", "enc": "A256GCM", "kid": kid})
+		plaintext = self.codec.dumps(payload)
+		if self.crypto_executor is not None:
+			token = self.crypto_executor.encrypt(plaintext, k, protected)
+		else:
+			token = encrypt_compact(plaintext, k, protected)
 		if span:
 			span.add_event("jwe.encrypt.success", {"kid": kid})
-		return jwetoken.serialize(compact=True), {"content-type": "application/jose", "x-jwe-kid": kid}, True
+		return token, {"content-type": "application/jose", "x-jwe-kid": kid}, True
 
-	def _decrypt_jwe(self, token: str, span=None) -> Dict[str, Any]:
-		# accept plain JSON (simulator fallback)
-		if token and token.strip().startswith("{"):
-			return json.loads(token)
+	def _decrypt_jwe(self, token: Union[bytes, str], span=None) -> Dict[str, Any]:
+		if isinstance(token, (bytes, bytearray)):
+			token = token.strip()
+			# accept plain JSON (simulator fallback)
+			if token.startswith(b"{"):
+				return self.codec.loads(token)
+			token = token.decode("ascii")
+		elif token and token.strip().startswith("{"):
+			return self.codec.loads(token)
 		jwks = self._get_jwks()
 		kset = jwks.get("keys", [])
-		header = json.loads(jwe.JWE().deserialize(token).protected)
-		kid = header.get("kid")
+		kid = _protected_header(token).get("kid")
 		match = next((x for x in kset if x.get("kid") == kid), None)
 		if not match:
 			if span:
 				span.add_event("jwe.decrypt.unknown_kid", {"kid": kid})
 			raise JWEKidUnknownError("Unknown kid")
-		priv = jwk.JWK(**match)
-		jwetoken = jwe.JWE()
-		jwetoken.deserialize(token)
-		jwetoken.decrypt(priv)
+		if self.crypto_executor is not None:
+			plaintext = self.crypto_executor.decrypt(token, match)
+		else:
+			plaintext = decrypt_compact(token, match)
 		if span:
 			span.add_event("jwe.decrypt.success")
-		return json.loads(jwetoken.payload.decode("utf-8"))
+		return self.codec.loads(plaintext)
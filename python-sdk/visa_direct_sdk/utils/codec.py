@@ -0,0 +1,51 @@
+import json
+from typing import Any, Union
+
+try:  # pragma: no cover - optional dependency at runtime
+	import orjson
+except ModuleNotFoundError:  # pragma: no cover
+	orjson = None
+
+
+class JsonCodec:
+
+	name = "abstract"
+
+	def dumps(self, value: Any) -> bytes:  # pragma: no cover
+		raise NotImplementedError
+
+	def loads(self, data: Union[bytes, bytearray, str]) -> Any:  # pragma: no cover
+		raise NotImplementedError
+
+
+class StdlibJsonCodec(JsonCodec):
+
+	name = "json"
+
+	def __init__(self) -> None:
+		self._encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+	def dumps(self, value: Any) -> bytes:
+		return self._encoder.encode(value).encode("utf-8")
+
+	def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+		return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+
+	name = "orjson"
+
+	def __init__(self) -> None:
+		if orjson is None:  # pragma: no cover
+			raise RuntimeError("orjson is required for OrjsonCodec")
+
+	def dumps(self, value: Any) -> bytes:
+		return orjson.dumps(value)
+
+	def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+		return orjson.loads(data)
+
+
+def default_codec() -> JsonCodec:
+	return OrjsonCodec() if orjson is not None else StdlibJsonCodec()
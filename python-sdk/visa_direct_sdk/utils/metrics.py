@@ -0,0 +1,413 @@
+"""In-process metrics: counters, gauges and HDR-style latency histograms.
+
+Instruments are looked up by name and labels on a :class:`MetricsRegistry`
+and are cheap enough to leave on (an uncontended lock and a bucket
+increment). The registry renders Prometheus text exposition, can serve it
+over HTTP, and optionally mirrors every recording into the OpenTelemetry
+metrics API.
+"""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+	from http.server import ThreadingHTTPServer
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_SUB_BUCKETS = 64
+_QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+
+class LatencyHistogram:
+	"""Log-linear histogram of microsecond values, about 1.5% relative error.
+
+	Values below 128µs are counted exactly; above that every power of two is
+	split into 64 linear sub-buckets, HdrHistogram style. Values above
+	``max_micros`` are clamped into the top bucket (``max`` is still exact).
+	"""
+
+	__slots__ = ("counts", "count", "total_micros", "min_micros", "max_micros", "_lock")
+
+	def __init__(self, max_micros: int = 3_600_000_000) -> None:
+		self.counts: List[int] = [0] * (self._index(max_micros) + 1)
+		self.count = 0
+		self.total_micros = 0
+		self.min_micros: Optional[int] = None
+		self.max_micros = 0
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _index(micros: int) -> int:
+		if micros < 2 * _SUB_BUCKETS:
+			return micros
+		# (shift - 1) * 64 + 128 + (micros >> shift) - 64 reduces to this
+		shift = micros.bit_length() - 7
+		return (shift << 6) + (micros >> shift)
+
+	@staticmethod
+	def _upper_bound(index: int) -> int:
+		if index < 2 * _SUB_BUCKETS:
+			return index
+		shift, sub = divmod(index - 2 * _SUB_BUCKETS, _SUB_BUCKETS)
+		return ((sub + _SUB_BUCKETS + 1) << (shift + 1)) - 1
+
+	def record_ns(self, nanos: int) -> None:
+		self.record(nanos // 1000)
+
+	def record(self, micros: int) -> None:
+		if micros < 128:
+			index = micros if micros > 0 else 0
+			micros = index
+		else:
+			shift = micros.bit_length() - 7
+			index = (shift << 6) + (micros >> shift)
+		counts = self.counts
+		if index >= len(counts):
+			index = len(counts) - 1
+		with self._lock:
+			counts[index] += 1
+			self.count += 1
+			self.total_micros += micros
+			if micros > self.max_micros:
+				self.max_micros = micros
+			if self.min_micros is None or micros < self.min_micros:
+				self.min_micros = micros
+
+	def merge(self, other: "LatencyHistogram") -> None:
+		with self._lock:
+			for index, value in enumerate(other.counts[:len(self.counts)]):
+				self.counts[index] += value
+			self.count += other.count
+			self.total_micros += other.total_micros
+			self.max_micros = max(self.max_micros, other.max_micros)
+			if other.min_micros is not None and (self.min_micros is None or other.min_micros < self.min_micros):
+				self.min_micros = other.min_micros
+
+	def percentile(self, q: float) -> int:
+		"""Upper bound, in microseconds, of the bucket holding quantile ``q`` (0..1)."""
+		if not self.count:
+			return 0
+		rank = max(1, int(q * self.count + 0.5))
+		seen = 0
+		for index, value in enumerate(self.counts):
+			seen += value
+			if seen >= rank:
+				return min(self._upper_bound(index), self.max_micros)
+		return self.max_micros
+
+	def percentiles(self, quantiles: Sequence[float] = _QUANTILES) -> Dict[float, int]:
+		"""Several quantiles in one pass over the buckets."""
+		result: Dict[float, int] = {}
+		if not self.count:
+			return dict.fromkeys(quantiles, 0)
+		pending = sorted(quantiles)
+		seen = 0
+		for index, value in enumerate(self.counts):
+			if not value:
+				continue
+			seen += value
+			while pending and seen >= max(1, int(pending[0] * self.count + 0.5)):
+				result[pending.pop(0)] = min(self._upper_bound(index), self.max_micros)
+			if not pending:
+				break
+		for q in pending:
+			result[q] = self.max_micros
+		return result
+
+
+class Counter:
+
+	__slots__ = ("value", "_lock", "_otel", "_attributes")
+
+	def __init__(self, otel=None, attributes: Optional[Dict[str, str]] = None) -> None:
+		self.value = 0
+		self._lock = threading.Lock()
+		self._otel = otel
+		self._attributes = attributes
+
+	def inc(self, amount: int = 1) -> None:
+		with self._lock:
+			self.value += amount
+		if self._otel is not None:
+			self._otel.add(amount, self._attributes)
+
+
+class Gauge:
+	"""A value that goes up and down (in-flight requests, pool sizes, health)."""
+
+	__slots__ = ("value", "_lock", "_otel", "_attributes")
+
+	def __init__(self, otel=None, attributes: Optional[Dict[str, str]] = None) -> None:
+		self.value = 0
+		self._lock = threading.Lock()
+		self._otel = otel
+		self._attributes = attributes
+
+	def inc(self, amount: int = 1) -> None:
+		with self._lock:
+			self.value += amount
+		if self._otel is not None:
+			self._otel.add(amount, self._attributes)
+
+	def dec(self, amount: int = 1) -> None:
+		self.inc(-amount)
+
+	def set(self, value: int) -> None:
+		with self._lock:
+			delta = value - self.value
+			self.value = value
+		if self._otel is not None and delta:
+			self._otel.add(delta, self._attributes)
+
+
+class Timer:
+	"""A :class:`LatencyHistogram` bound to one metric name and label set."""
+
+	__slots__ = ("histogram", "_otel", "_attributes")
+
+	def __init__(self, otel=None, attributes: Optional[Dict[str, str]] = None) -> None:
+		self.histogram = LatencyHistogram()
+		self._otel = otel
+		self._attributes = attributes
+
+	def observe_ns(self, nanos: int) -> None:
+		self.histogram.record_ns(nanos)
+		if self._otel is not None:
+			self._otel.record(nanos / 1e9, self._attributes)
+
+	def time(self) -> "_Timing":
+		"""Context manager observing the duration of its block."""
+		return _Timing(self)
+
+
+class _Timing:
+
+	__slots__ = ("_timer", "_started")
+
+	def __init__(self, timer: Timer) -> None:
+		self._timer = timer
+
+	def __enter__(self) -> None:
+		self._started = time.perf_counter_ns()
+
+	def __exit__(self, *exc) -> bool:
+		self._timer.observe_ns(time.perf_counter_ns() - self._started)
+		return False
+
+
+class _NoopInstrument:
+
+	__slots__ = ()
+
+	def inc(self, amount: int = 1) -> None:
+		pass
+
+	def dec(self, amount: int = 1) -> None:
+		pass
+
+	def set(self, value: int) -> None:
+		pass
+
+	def observe_ns(self, nanos: int) -> None:
+		pass
+
+	def time(self) -> "_NoopInstrument":
+		return self
+
+	def __enter__(self) -> None:
+		return None
+
+	def __exit__(self, *exc) -> bool:
+		return False
+
+
+_NOOP = _NoopInstrument()
+
+
+class MetricsRegistry:
+	"""Counters and timers keyed by ``(name, labels)``.
+
+	Timer names end in ``_seconds`` and are exposed to Prometheus as summaries
+	(quantiles from the histogram); counter names end in ``_total``. With
+	``meter`` (an OpenTelemetry ``Meter``) every recording is mirrored into
+	an OTel counter, up-down counter (gauges) or histogram of the same name.
+	"""
+
+	def __init__(self, meter=None) -> None:
+		self.meter = meter
+		self._counters: Dict[Tuple[str, Labels], Counter] = {}
+		self._gauges: Dict[Tuple[str, Labels], Gauge] = {}
+		self._timers: Dict[Tuple[str, Labels], Timer] = {}
+		# call-site label order -> instrument, so lookups skip sorting
+		self._bound: Dict[Tuple[str, str, Labels], object] = {}
+		self._otel_instruments: Dict[str, object] = {}
+		self._lock = threading.Lock()
+
+	def counter(self, name: str, **labels: str) -> Counter:
+		instrument = self._bound.get(("counter", name, tuple(labels.items())))
+		if instrument is None:
+			instrument = self._create("counter", name, labels)
+		return instrument
+
+	def gauge(self, name: str, **labels: str) -> Gauge:
+		instrument = self._bound.get(("gauge", name, tuple(labels.items())))
+		if instrument is None:
+			instrument = self._create("gauge", name, labels)
+		return instrument
+
+	def timer(self, name: str, **labels: str) -> Timer:
+		instrument = self._bound.get(("timer", name, tuple(labels.items())))
+		if instrument is None:
+			instrument = self._create("timer", name, labels)
+		return instrument
+
+	def _create(self, kind: str, name: str, labels: Dict[str, str]):
+		key = (name, tuple(sorted(labels.items())))
+		store = {"counter": self._counters, "gauge": self._gauges}.get(kind, self._timers)
+		with self._lock:
+			instrument = store.get(key)
+			if instrument is None:
+				if kind == "counter":
+					instrument = Counter(self._otel_instrument(name, "counter"), labels or None)
+				elif kind == "gauge":
+					instrument = Gauge(self._otel_instrument(name, "updown"), labels or None)
+				else:
+					instrument = Timer(self._otel_instrument(name, "histogram"), labels or None)
+				store[key] = instrument
+			self._bound[(kind, name, tuple(labels.items()))] = instrument
+		return instrument
+
+	def counters(self) -> Dict[Tuple[str, Labels], int]:
+		return {key: counter.value for key, counter in list(self._counters.items())}
+
+	def gauges(self) -> Dict[Tuple[str, Labels], int]:
+		return {key: gauge.value for key, gauge in list(self._gauges.items())}
+
+	def timers(self) -> Dict[Tuple[str, Labels], LatencyHistogram]:
+		return {key: timer.histogram for key, timer in list(self._timers.items())}
+
+	def render_prometheus(self) -> str:
+		lines: List[str] = []
+		typed = set()
+		for (name, labels), value in sorted(self.counters().items()):
+			if name not in typed:
+				typed.add(name)
+				lines.append(f"# TYPE {name} counter")
+			lines.append(f"{name}{_format_labels(labels)} {value}")
+		for (name, labels), value in sorted(self.gauges().items()):
+			if name not in typed:
+				typed.add(name)
+				lines.append(f"# TYPE {name} gauge")
+			lines.append(f"{name}{_format_labels(labels)} {value}")
+		for (name, labels), histogram in sorted(self.timers().items(), key=lambda item: item[0]):
+			if name not in typed:
+				typed.add(name)
+				lines.append(f"# TYPE {name} summary")
+			for q, micros in histogram.percentiles().items():
+				lines.append(f"{name}{_format_labels(labels + (('quantile', str(q)),))} {micros / 1e6}")
+			lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total_micros / 1e6}")
+			lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+		return "\n".join(lines) + "\n"
+
+	def serve_prometheus(self, port: int = 9464, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+		"""Serve ``render_prometheus()`` at ``/metrics`` from a daemon thread; ``shutdown()`` the result to stop."""
+		from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+		registry = self
+
+		class Handler(BaseHTTPRequestHandler):
+
+			def do_GET(self) -> None:  # noqa: N802
+				if self.path.split("?", 1)[0] != "/metrics":
+					self.send_error(404)
+					return
+				body = registry.render_prometheus().encode("utf-8")
+				self.send_response(200)
+				self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+				self.send_header("Content-Length", str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+
+			def log_message(self, *args) -> None:
+				pass
+
+		server = ThreadingHTTPServer((host, port), Handler)
+		server.daemon_threads = True
+		threading.Thread(target=server.serve_forever, name="visa-metrics", daemon=True).start()
+		return server
+
+	def _otel_instrument(self, name: str, kind: str):
+		if self.meter is None:
+			return None
+		instrument = self._otel_instruments.get(name)
+		if instrument is None:
+			if kind == "counter":
+				instrument = self.meter.create_counter(name)
+			elif kind == "updown":
+				instrument = self.meter.create_up_down_counter(name)
+			else:
+				instrument = self.meter.create_histogram(name, unit="s")
+			self._otel_instruments[name] = instrument
+		return instrument
+
+
+def _format_labels(labels: Labels) -> str:
+	if not labels:
+		return ""
+	parts = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in labels)
+	return "{" + parts + "}"
+
+
+class _NoopRegistry(MetricsRegistry):
+	"""Registry handed out while metrics are disabled; every instrument is a shared no-op."""
+
+	def counter(self, name: str, **labels: str):
+		return _NOOP
+
+	def gauge(self, name: str, **labels: str):
+		return _NOOP
+
+	def timer(self, name: str, **labels: str):
+		return _NOOP
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def configure_metrics(registry: Optional[MetricsRegistry] = None, *, disabled: bool = False, otel: bool = False) -> MetricsRegistry:
+	"""Install the SDK-wide registry.
+
+	``otel=True`` mirrors recordings into the global OpenTelemetry
+	``MeterProvider``; ``disabled=True`` turns every instrument into a no-op.
+	"""
+	global _registry
+	if disabled:
+		_registry = _NoopRegistry()
+	elif registry is not None:
+		_registry = registry
+	else:
+		meter = None
+		if otel:
+			from opentelemetry import metrics
+
+			meter = metrics.get_meter("visa-direct-sdk")
+		_registry = MetricsRegistry(meter)
+	return _registry
+
+
+def record_cache_lookup(cache: str, value: object, stale: bool) -> None:
+	"""Count a read-through cache lookup as ``hit``, ``stale`` (served, refreshing) or ``miss``."""
+	result = ("stale" if stale else "hit") if value else "miss"
+	get_metrics().counter("visa_sdk_cache_requests_total", cache=cache, result=result).inc()
+
+
+def get_metrics() -> MetricsRegistry:
+	"""The SDK-wide registry, configured from ``VISA_METRICS`` (``0`` disables, ``otel`` mirrors to OTel) on first use."""
+	registry = _registry
+	if registry is None:
+		mode = os.environ.get("VISA_METRICS", "1")
+		registry = configure_metrics(disabled=mode == "0", otel=mode == "otel")
+	return registry
@@ -1,49 +1,220 @@
 from __future__ import annotations
 
 import os
-from contextlib import contextmanager
-from typing import Dict, Iterator, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Union
 
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
-from opentelemetry.trace import Span, Status, StatusCode
+if TYPE_CHECKING:  # pragma: no cover
+	from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+	from opentelemetry.sdk.trace.export import SpanExporter
+	from opentelemetry.trace import Span
 
-_provider_initialised = False
-_disabled = False
+# The OpenTelemetry API is bound by _load_api() the first time tracing is
+# configured on, and the SDK is imported only to build a provider, so with
+# tracing disabled neither is ever loaded.
+context = None
+trace = None
+Status = None
+StatusCode = None
+
+Attributes = Optional[Union[Dict[str, object], Callable[[], Dict[str, object]]]]
+
+
+class _OtelState:
+
+	__slots__ = ("configured", "disabled", "tracer")
+
+	def __init__(self) -> None:
+		self.configured = False
+		self.disabled = False
+		self.tracer = None
+
+
+_state = _OtelState()
+
+
+class _NoopSpan:
+	"""Shared context manager handed out while tracing is disabled."""
+
+	__slots__ = ()
+
+	def __enter__(self) -> None:
+		return None
+
+	def __exit__(self, *exc) -> bool:
+		return False
+
+
+_NOOP = _NoopSpan()
+
+
+def _load_api() -> None:
+	global context, trace, Status, StatusCode
+	if trace is None:
+		from opentelemetry import context as _context, trace as _trace
+		from opentelemetry.trace import Status as _Status, StatusCode as _StatusCode
+
+		context, Status, StatusCode = _context, _Status, _StatusCode
+		trace = _trace
+
+
+def configure_otel(
+	*,
+	exporter: Union[str, SpanExporter] = "console",
+	file_path: Optional[str] = None,
+	endpoint: Optional[str] = None,
+	sample_ratio: float = 1.0,
+	batch: bool = True,
+	disabled: bool = False,
+	processors: Sequence[SpanProcessor] = (),
+	provider: Optional[TracerProvider] = None,
+	tail_latency_ms: Optional[float] = None,
+) -> None:
+	"""Install the SDK's tracer provider.
+
+	``exporter`` is ``"console"``, ``"file"`` (JSON lines to ``file_path``),
+	``"otlp"`` (needs the ``otlp`` extra), ``"none"`` or a ``SpanExporter``.
+	Exports go through a ``BatchSpanProcessor`` unless ``batch=False``, and
+	``sample_ratio`` applies parent-based trace-id ratio sampling. Extra
+	``processors`` are added ahead of the exporter. With ``tail_latency_ms``
+	set, exports go through a :class:`TailSamplingSpanProcessor` that only
+	keeps traces slower than that, failed, or carrying a keep event.
+	"""
+	_state.configured = True
+	_state.disabled = disabled
+	_state.tracer = None
+	if disabled:
+		return
+	_load_api()
+	if provider is None:
+		from opentelemetry.sdk.trace import TracerProvider
+		from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+		from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+		provider = TracerProvider(sampler=ParentBased(TraceIdRatioBased(sample_ratio)))
+		for processor in processors:
+			provider.add_span_processor(processor)
+		span_exporter = _make_exporter(exporter, file_path, endpoint)
+		if span_exporter is not None:
+			export_processor = BatchSpanProcessor(span_exporter) if batch else SimpleSpanProcessor(span_exporter)
+			if tail_latency_ms is not None:
+				from .tail_sampling import TailSamplingSpanProcessor
+
+				export_processor = TailSamplingSpanProcessor(export_processor, latency_threshold_ms=tail_latency_ms)
+			provider.add_span_processor(export_processor)
+	if isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+		# the global provider can only be set once; later reconfiguration only changes the SDK's tracer
+		trace.set_tracer_provider(provider)
+	_state.tracer = provider.get_tracer("visa-direct-sdk")
 
 
 def init_otel() -> None:
-	global _provider_initialised, _disabled
-	if _provider_initialised or _disabled:
+	"""Configure once from the environment.
+
+	``OTEL_DISABLED=1`` turns tracing off, ``OTEL_TRACES_EXPORTER`` picks the
+	exporter (``console``/``file``/``otlp``/``none``), ``VISA_OTEL_FILE`` the
+	file path, ``OTEL_TRACES_SAMPLER_ARG`` the sample ratio and
+	``VISA_OTEL_SYNC=1`` exports synchronously (debugging only) and
+	``VISA_OTEL_TAIL_LATENCY_MS`` enables tail sampling at that threshold.
+	"""
+	if _state.configured:
 		return
 	if os.environ.get("OTEL_DISABLED") == "1":
-		_disabled = True
+		configure_otel(disabled=True)
 		return
-	provider = TracerProvider()
-	provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
-	trace.set_tracer_provider(provider)
-	_provider_initialised = True
+	tail_latency = os.environ.get("VISA_OTEL_TAIL_LATENCY_MS")
+	configure_otel(
+		exporter=os.environ.get("OTEL_TRACES_EXPORTER", "console"),
+		file_path=os.environ.get("VISA_OTEL_FILE"),
+		endpoint=os.environ.get("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"),
+		sample_ratio=float(os.environ.get("OTEL_TRACES_SAMPLER_ARG", "1.0")),
+		batch=os.environ.get("VISA_OTEL_SYNC") != "1",
+		tail_latency_ms=float(tail_latency) if tail_latency else None,
+	)
+
+
+def reset_otel() -> None:
+	"""Forget the resolved configuration so the next span re-reads the environment."""
+	_state.configured = False
+	_state.disabled = False
+	_state.tracer = None
+
+
+def tracing_enabled() -> bool:
+	if not _state.configured:
+		init_otel()
+	return not _state.disabled
 
 
 def get_tracer():
-	init_otel()
-	return trace.get_tracer("visa-direct-sdk")
+	if not _state.configured:
+		init_otel()
+	if _state.tracer is None:
+		_load_api()
+		_state.tracer = trace.get_tracer("visa-direct-sdk")
+	return _state.tracer
 
 
-@contextmanager
-def use_span(name: str, attributes: Optional[Dict[str, object]] = None) -> Iterator[Optional[Span]]:
-	if _disabled or os.environ.get("OTEL_DISABLED") == "1":
-		yield None
-		return
-	tracer = get_tracer()
-	with tracer.start_as_current_span(name, attributes=attributes or {}) as span:
+def use_span(name: str, attributes: Attributes = None):
+	"""Start a span as current; ``attributes`` may be a callable so nothing is built unless the span records.
+
+	While tracing is disabled this returns a shared no-op context manager that yields ``None``.
+	"""
+	if not _state.configured:
+		init_otel()
+	if _state.disabled:
+		return _NOOP
+	return _SpanScope(name, attributes)
+
+
+class _SpanScope:
+	"""Starts a span and makes it current without the generator layers of ``start_as_current_span``."""
+
+	__slots__ = ("_name", "_attributes", "_span", "_token")
+
+	def __init__(self, name: str, attributes: Attributes) -> None:
+		self._name = name
+		self._attributes = attributes
+
+	def __enter__(self) -> Span:
+		span = self._span = get_tracer().start_span(self._name)
+		attributes = self._attributes
+		if attributes and span.is_recording():
+			span.set_attributes(attributes() if callable(attributes) else attributes)
+		self._token = context.attach(trace.set_span_in_context(span))
+		return span
+
+	def __exit__(self, exc_type, exc, tb) -> bool:
+		span = self._span
+		try:
+			if exc is not None and span.is_recording():
+				span.record_exception(exc)
+				span.set_status(Status(StatusCode.ERROR))
+		finally:
+			context.detach(self._token)
+			span.end()
+		return False
+
+
+def _make_exporter(exporter: Union[str, SpanExporter], file_path: Optional[str], endpoint: Optional[str]) -> Optional[SpanExporter]:
+	if not isinstance(exporter, str):
+		return exporter
+	if exporter == "none":
+		return None
+	from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+	if exporter == "console":
+		return ConsoleSpanExporter()
+	if exporter == "file":
+		if not file_path:
+			raise ValueError("file exporter requires file_path (VISA_OTEL_FILE)")
+		return ConsoleSpanExporter(out=open(file_path, "a", encoding="utf-8"), formatter=lambda span: span.to_json(indent=None) + os.linesep)
+	if exporter == "otlp":
 		try:
-			yield span
-		except Exception as exc:  # pragma: no cover - instrumentation
-			span.record_exception(exc)
-			span.set_status(Status(StatusCode.ERROR))
-			raise
+			from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+		except ModuleNotFoundError:  # pragma: no cover
+			raise RuntimeError("opentelemetry-exporter-otlp-proto-http is required for the otlp exporter") from None
+		return OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+	raise ValueError(f"Unknown span exporter {exporter}")
 
 
 def redact(value: object) -> str:
@@ -0,0 +1,197 @@
+"""Opt-in traffic recording for replay against the simulator.
+
+A :class:`TrafficRecorder` handed to :class:`Orchestrator` and
+:class:`SecureHttpClient` (or ``VisaDirectClientConfig(traffic_recorder=...)``)
+appends one JSON object per line: a header, then a ``payout`` record per
+``Orchestrator.payout`` and an ``http`` record per ``SecureHttpClient.post``.
+Each record carries ``t``, its arrival offset in seconds from the start of the
+recording, so the inter-arrival timings can be rebuilt.
+
+Nothing identifying is written. Idempotency keys, tokens, aliases, account
+and wallet ids, receipts and originators become salted HMAC references that
+are stable within one recording (so reuse survives) but cannot be reversed.
+Amounts are reduced to currency and number of digits.
+
+Recording is best-effort: a failing sink (disk full, closed file) never
+raises into the payout or request being recorded; failed records are counted
+in ``failures`` and ``visa_sdk_recording_failures_total``.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, TextIO, Union
+
+from .metrics import get_metrics
+
+if TYPE_CHECKING:  # pragma: no cover
+	from ..core.models import PayoutRequest
+
+FORMAT_VERSION = 1
+
+
+class TrafficRecorder:
+
+	def __init__(
+		self,
+		sink: Union[str, os.PathLike, TextIO],
+		*,
+		sample_rate: float = 1.0,
+		salt: Optional[bytes] = None,
+		flush_every: int = 64,
+	) -> None:
+		"""``sample_rate`` keeps that share of idempotency keys, all records of a kept key together."""
+		if isinstance(sink, (str, os.PathLike)):
+			self._out: TextIO = open(sink, "w", encoding="utf-8")
+			self._owns_out = True
+		else:
+			self._out = sink
+			self._owns_out = False
+		self.sample_rate = sample_rate
+		self._salt = salt or os.urandom(16)
+		self._threshold = int(sample_rate * 0xFFFFFFFF)
+		self._flush_every = flush_every
+		self._pending = 0
+		self._lock = threading.Lock()
+		self._origin = time.perf_counter_ns()
+		self.records = 0
+		self.failures = 0
+		self._closed = False
+		self._write({
+			"type": "header",
+			"version": FORMAT_VERSION,
+			"startedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+			"sampleRate": sample_rate,
+		})
+
+	def ref(self, value: Optional[str]) -> Optional[str]:
+		"""Stable, irreversible stand-in for ``value`` within this recording."""
+		if value is None:
+			return None
+		return hmac.new(self._salt, str(value).encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+
+	def record_payout(self, req: Union["PayoutRequest", Mapping[str, Any]], started_ns: int, *, result: Any = None, error: Optional[BaseException] = None) -> None:
+		try:
+			self._record_payout(req, started_ns, result, error)
+		except Exception:  # noqa: BLE001 - best-effort, the payout already happened
+			self._failed()
+
+	def record_http(self, method: str, route: str, status: str, started_ns: int, *, mle: bool, headers: Optional[Mapping[str, str]] = None) -> None:
+		try:
+			self._record_http(method, route, status, started_ns, mle, headers)
+		except Exception:  # noqa: BLE001
+			self._failed()
+
+	def _record_payout(self, req: Union["PayoutRequest", Mapping[str, Any]], started_ns: int, result: Any, error: Optional[BaseException]) -> None:
+		# imported here: the transport imports this module, and must not load the
+		# models and corridor policy with it
+		from ..core.models import PayoutRequest
+
+		finished = time.perf_counter_ns()
+		if not isinstance(req, PayoutRequest):
+			try:
+				req = PayoutRequest.from_dict(req)
+			except (KeyError, TypeError, ValueError):
+				return
+		key = self.ref(req.idempotency_key)
+		if not self._sampled(key):
+			return
+		funding = req.funding
+		destination = req.destination
+		record: Dict[str, Any] = {
+			"type": "payout",
+			"t": self._offset(started_ns),
+			"key": key,
+			"originator": self.ref(req.originator_id),
+			"funding": funding.type,
+			"fundingRef": self.ref(funding.receipt_id or funding.payment_id or funding.confirmation_ref),
+			"fundingStatus": funding.status,
+			"destination": destination.type,
+			"destinationRef": self.ref(destination.pan_token or destination.account_id or destination.wallet_id or destination.alias),
+			"currency": req.amount.currency,
+			"amountDigits": len(str(abs(req.amount.minor))),
+			"durationMs": round((finished - started_ns) / 1e6, 3),
+		}
+		if destination.alias_type is not None:
+			record["aliasType"] = destination.alias_type
+		preflight = req.preflight
+		if preflight.fx_lock is not None:
+			record["fx"] = {"src": preflight.fx_lock.src_currency, "dst": preflight.fx_lock.dst_currency}
+		if preflight.corridor is not None:
+			record["corridor"] = preflight.corridor.to_dict()
+		if preflight.compliance_payload:
+			record["compliance"] = True
+		if error is not None:
+			record["error"] = type(error).__name__
+		elif isinstance(result, Mapping):
+			record["status"] = result.get("status")
+		self._write(record)
+
+	def _record_http(self, method: str, route: str, status: str, started_ns: int, mle: bool, headers: Optional[Mapping[str, str]]) -> None:
+		finished = time.perf_counter_ns()
+		key = self.ref(headers.get("x-idempotency-key")) if headers else None
+		if key is not None:
+			if not self._sampled(key):
+				return
+		elif self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+			return
+		record = {
+			"type": "http",
+			"t": self._offset(started_ns),
+			"method": method,
+			"route": route,
+			"status": status,
+			"mle": mle,
+			"durationMs": round((finished - started_ns) / 1e6, 3),
+		}
+		if key is not None:
+			record["key"] = key
+		self._write(record)
+
+	def flush(self) -> None:
+		with self._lock:
+			self._out.flush()
+			self._pending = 0
+
+	def close(self) -> None:
+		with self._lock:
+			if self._closed:
+				return
+			self._closed = True
+			self._out.flush()
+			if self._owns_out:
+				self._out.close()
+
+	def __enter__(self) -> "TrafficRecorder":
+		return self
+
+	def __exit__(self, *exc: Any) -> None:
+		self.close()
+
+	def _sampled(self, ref: str) -> bool:
+		return self.sample_rate >= 1.0 or int(ref[:8], 16) < self._threshold
+
+	def _offset(self, started_ns: int) -> float:
+		return round((started_ns - self._origin) / 1e9, 6)
+
+	def _failed(self) -> None:
+		with self._lock:
+			self.failures += 1
+		get_metrics().counter("visa_sdk_recording_failures_total").inc()
+
+	def _write(self, record: Dict[str, Any]) -> None:
+		line = json.dumps(record, separators=(",", ":")) + "\n"
+		with self._lock:
+			if self._closed:
+				raise ValueError("recorder is closed")
+			self._out.write(line)
+			self.records += 1
+			self._pending += 1
+			if self._pending >= self._flush_every:
+				self._out.flush()
+				self._pending = 0
@@ -0,0 +1,265 @@
+import re
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List
+
+from ..errors import SchemaValidationError
+
+Validator = Callable[[Any], None]
+
+# "object" is any Mapping, as Orchestrator.payout accepts; dict is listed first
+# so the common case skips the ABC check
+_OBJECT = (dict, Mapping)
+
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+	"object": lambda v: isinstance(v, _OBJECT),
+	"array": lambda v: isinstance(v, list),
+	"string": lambda v: isinstance(v, str),
+	"boolean": lambda v: isinstance(v, bool),
+	"integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+	"number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+	"null": lambda v: v is None,
+}
+
+_SUPPORTED = {
+	"$schema", "$id", "title", "description", "type", "properties", "required", "additionalProperties",
+	"enum", "const", "minLength", "maxLength", "pattern", "minimum", "maximum", "items", "minItems", "allOf", "if", "then",
+}
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], None]:
+	"""Compile the draft-07 subset used by the SDK's schemas into nested closures.
+
+	The returned callable raises :class:`SchemaValidationError` with a ``$.a.b`` path;
+	paths are only built on failure, so valid instances pay no string formatting.
+	"""
+	check = _compile(schema)
+
+	def validate(instance: Any) -> None:
+		try:
+			check(instance)
+		except SchemaValidationError as exc:
+			raise exc.within("$") from None
+
+	return validate
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+	unknown = set(schema) - _SUPPORTED
+	if unknown:
+		raise ValueError(f"Unsupported schema keywords: {sorted(unknown)}")
+	checks: List[Validator] = []
+
+	if "type" in schema:
+		names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+		preds = [_TYPES[n] for n in names]
+		expected = "/".join(names)
+		if len(preds) == 1:
+			pred = preds[0]
+
+			def check_type(v, pred=pred):
+				if not pred(v):
+					raise SchemaValidationError("", f"expected {expected}")
+		else:
+			def check_type(v):
+				if not any(p(v) for p in preds):
+					raise SchemaValidationError("", f"expected {expected}")
+		checks.append(check_type)
+
+	if "enum" in schema:
+		allowed = schema["enum"]
+		allowed_str = frozenset(a for a in allowed if isinstance(a, str))
+
+		def check_enum(v):
+			ok = v in allowed_str if isinstance(v, str) else any(v == a and type(v) is type(a) for a in allowed)
+			if not ok:
+				raise SchemaValidationError("", f"must be one of {allowed}")
+		checks.append(check_enum)
+
+	if "const" in schema:
+		const = schema["const"]
+
+		def check_const(v):
+			if v != const or type(v) is not type(const):
+				raise SchemaValidationError("", f"must equal {const!r}")
+		checks.append(check_const)
+
+	if "minLength" in schema or "maxLength" in schema:
+		lo, hi = schema.get("minLength", 0), schema.get("maxLength")
+
+		def check_length(v):
+			if isinstance(v, str) and (len(v) < lo or (hi is not None and len(v) > hi)):
+				raise SchemaValidationError("", f"length must be between {lo} and {hi if hi is not None else 'unbounded'}")
+		checks.append(check_length)
+
+	if "pattern" in schema:
+		regex = re.compile(schema["pattern"])
+
+		def check_pattern(v):
+			if isinstance(v, str) and not regex.search(v):
+				raise SchemaValidationError("", f"does not match {regex.pattern}")
+		checks.append(check_pattern)
+
+	if "minimum" in schema or "maximum" in schema:
+		lo, hi = schema.get("minimum"), schema.get("maximum")
+
+		def check_range(v):
+			if isinstance(v, (int, float)) and not isinstance(v, bool):
+				if lo is not None and v < lo:
+					raise SchemaValidationError("", f"must be >= {lo}")
+				if hi is not None and v > hi:
+					raise SchemaValidationError("", f"must be <= {hi}")
+		checks.append(check_range)
+
+	if "required" in schema:
+		required = tuple(schema["required"])
+
+		def check_required(v):
+			if isinstance(v, _OBJECT):
+				for name in required:
+					if name not in v:
+						raise SchemaValidationError(f".{name}", "is required")
+		checks.append(check_required)
+
+	if "properties" in schema or "additionalProperties" in schema:
+		props = {name: _compile(sub) for name, sub in schema.get("properties", {}).items()}
+		additional = schema.get("additionalProperties", True)
+		extra = _compile(additional) if isinstance(additional, dict) else None
+
+		def check_properties(v):
+			if not isinstance(v, _OBJECT):
+				return
+			for name, value in v.items():
+				sub = props.get(name)
+				if sub is None:
+					if additional is False:
+						raise SchemaValidationError(f".{name}", "is not allowed")
+					sub = extra
+					if sub is None:
+						continue
+				try:
+					sub(value)
+				except SchemaValidationError as exc:
+					raise exc.within(f".{name}") from None
+		checks.append(check_properties)
+
+	if "items" in schema or "minItems" in schema:
+		item = _compile(schema["items"]) if "items" in schema else None
+		min_items = schema.get("minItems", 0)
+
+		def check_items(v):
+			if not isinstance(v, list):
+				return
+			if len(v) < min_items:
+				raise SchemaValidationError("", f"must have at least {min_items} items")
+			if item is not None:
+				for i, value in enumerate(v):
+					try:
+						item(value)
+					except SchemaValidationError as exc:
+						raise exc.within(f"[{i}]") from None
+		checks.append(check_items)
+
+	for sub in schema.get("allOf", []):
+		checks.append(_compile(sub))
+
+	if "if" in schema:
+		condition = _predicate(schema["if"])
+		then = _compile(schema.get("then", {}))
+
+		def check_conditional(v):
+			if condition(v):
+				then(v)
+		checks.append(check_conditional)
+
+	if not checks:
+		return lambda v: None
+	if len(checks) == 1:
+		return checks[0]
+	checks_t = tuple(checks)
+
+	def check_all(v):
+		for check in checks_t:
+			check(v)
+	return check_all
+
+
+def _predicate(schema: Dict[str, Any]) -> Callable[[Any], bool]:
+	"""Compile a schema into a boolean test, for ``if`` conditions.
+
+	Conditions fail for most instances (one ``if`` per funding or destination
+	type), so they must not pay for raising and catching an exception.
+	"""
+	unknown = set(schema) - _SUPPORTED
+	if unknown:
+		raise ValueError(f"Unsupported schema keywords: {sorted(unknown)}")
+	preds: List[Callable[[Any], bool]] = []
+
+	if "type" in schema:
+		names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+		types = [_TYPES[n] for n in names]
+		preds.append(types[0] if len(types) == 1 else lambda v: any(t(v) for t in types))
+
+	if "enum" in schema:
+		allowed = schema["enum"]
+		preds.append(lambda v: any(v == a and type(v) is type(a) for a in allowed))
+
+	if "const" in schema:
+		const = schema["const"]
+		preds.append(lambda v: v == const and type(v) is type(const))
+
+	if "minLength" in schema or "maxLength" in schema:
+		lo, hi = schema.get("minLength", 0), schema.get("maxLength")
+		preds.append(lambda v: not isinstance(v, str) or (len(v) >= lo and (hi is None or len(v) <= hi)))
+
+	if "pattern" in schema:
+		regex = re.compile(schema["pattern"])
+		preds.append(lambda v: not isinstance(v, str) or regex.search(v) is not None)
+
+	if "minimum" in schema or "maximum" in schema:
+		lo, hi = schema.get("minimum"), schema.get("maximum")
+		preds.append(lambda v: not isinstance(v, (int, float)) or isinstance(v, bool) or ((lo is None or v >= lo) and (hi is None or v <= hi)))
+
+	if "required" in schema:
+		required = tuple(schema["required"])
+		preds.append(lambda v: not isinstance(v, _OBJECT) or all(name in v for name in required))
+
+	if "properties" in schema or "additionalProperties" in schema:
+		props = {name: _predicate(sub) for name, sub in schema.get("properties", {}).items()}
+		additional = schema.get("additionalProperties", True)
+		extra = _predicate(additional) if isinstance(additional, dict) else None
+
+		def match_properties(v):
+			if not isinstance(v, _OBJECT):
+				return True
+			for name, value in v.items():
+				sub = props.get(name)
+				if sub is None:
+					if additional is False:
+						return False
+					sub = extra
+					if sub is None:
+						continue
+				if not sub(value):
+					return False
+			return True
+		preds.append(match_properties)
+
+	if "items" in schema or "minItems" in schema:
+		item = _predicate(schema["items"]) if "items" in schema else None
+		min_items = schema.get("minItems", 0)
+		preds.append(lambda v: not isinstance(v, list) or (len(v) >= min_items and (item is None or all(item(x) for x in v))))
+
+	for sub in schema.get("allOf", []):
+		preds.append(_predicate(sub))
+
+	if "if" in schema:
+		condition = _predicate(schema["if"])
+		then = _predicate(schema.get("then", {}))
+		preds.append(lambda v: not condition(v) or then(v))
+
+	if not preds:
+		return lambda v: True
+	if len(preds) == 1:
+		return preds[0]
+	preds_t = tuple(preds)
+	return lambda v: all(p(v) for p in preds_t)
@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+KEEP_EVENTS = frozenset({"orchestrator.compensation_emitted", "jwe.decrypt.retry_on_kid_miss"})
+
+
+class _TraceBuffer:
+
+	__slots__ = ("spans", "keep", "created")
+
+	def __init__(self, created: float) -> None:
+		self.spans: List[ReadableSpan] = []
+		self.keep = False
+		self.created = created
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+	"""Buffers each trace in process and forwards it to ``downstream`` only if it is interesting.
+
+	A trace is kept when any span failed or emitted one of ``keep_events``, or
+	when its local root span took at least ``latency_threshold_ms``; the
+	decision is made when the local root ends. Memory is bounded by
+	``max_traces`` buffered traces of at most ``max_spans_per_trace`` spans:
+	the oldest trace is evicted on overflow (forwarded if already marked
+	interesting), traces whose root never ends are expired after
+	``trace_timeout_seconds``, and every drop is counted in :attr:`stats`.
+	"""
+
+	def __init__(
+		self,
+		downstream: SpanProcessor,
+		*,
+		latency_threshold_ms: float = 1000.0,
+		keep_events: FrozenSet[str] = KEEP_EVENTS,
+		max_traces: int = 10000,
+		max_spans_per_trace: int = 128,
+		trace_timeout_seconds: float = 120.0,
+		clock: Callable[[], float] = time.monotonic,
+	) -> None:
+		self.downstream = downstream
+		self.latency_threshold_ns = int(latency_threshold_ms * 1_000_000)
+		self.keep_events = frozenset(keep_events)
+		self.max_traces = max_traces
+		self.max_spans_per_trace = max_spans_per_trace
+		self.trace_timeout_seconds = trace_timeout_seconds
+		self.clock = clock
+		self.stats: Dict[str, int] = {
+			"kept_traces": 0,
+			"dropped_traces": 0,
+			"evicted_traces": 0,
+			"expired_traces": 0,
+			"overflow_spans": 0,
+		}
+		self._traces: "OrderedDict[int, _TraceBuffer]" = OrderedDict()
+		self._lock = threading.Lock()
+		self._next_sweep = clock() + trace_timeout_seconds
+
+	@property
+	def buffered_traces(self) -> int:
+		return len(self._traces)
+
+	def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+		pass
+
+	def on_end(self, span: ReadableSpan) -> None:
+		trace_id = span.context.trace_id
+		is_root = span.parent is None or span.parent.is_remote
+		interesting = self._interesting(span)
+		forward: List[ReadableSpan] = []
+		now = self.clock()
+		with self._lock:
+			buffer = self._traces.get(trace_id)
+			if buffer is None:
+				buffer = self._traces[trace_id] = _TraceBuffer(now)
+				if len(self._traces) > self.max_traces:
+					_old_id, evicted = self._traces.popitem(last=False)
+					self.stats["evicted_traces"] += 1
+					forward.extend(self._decide(evicted, evicted.keep))
+			if interesting:
+				buffer.keep = True
+			if len(buffer.spans) < self.max_spans_per_trace:
+				buffer.spans.append(span)
+			else:
+				self.stats["overflow_spans"] += 1
+			if is_root:
+				del self._traces[trace_id]
+				slow = span.end_time is not None and span.start_time is not None and span.end_time - span.start_time >= self.latency_threshold_ns
+				forward.extend(self._decide(buffer, buffer.keep or slow))
+			if now >= self._next_sweep:
+				forward.extend(self._expire(now))
+		for kept in forward:
+			self.downstream.on_end(kept)
+
+	def shutdown(self) -> None:
+		self.downstream.shutdown()
+
+	def force_flush(self, timeout_millis: int = 30000) -> bool:
+		return self.downstream.force_flush(timeout_millis)
+
+	def _interesting(self, span: ReadableSpan) -> bool:
+		if span.status is not None and span.status.status_code is StatusCode.ERROR:
+			return True
+		for event in span.events:
+			if event.name in self.keep_events:
+				return True
+		return False
+
+	def _decide(self, buffer: _TraceBuffer, keep: bool) -> List[ReadableSpan]:
+		if keep:
+			self.stats["kept_traces"] += 1
+			return buffer.spans
+		self.stats["dropped_traces"] += 1
+		return []
+
+	def _expire(self, now: float) -> List[ReadableSpan]:
+		self._next_sweep = now + self.trace_timeout_seconds
+		cutoff = now - self.trace_timeout_seconds
+		forward: List[ReadableSpan] = []
+		# insertion order is creation order, so stop at the first live trace
+		while self._traces:
+			trace_id, buffer = next(iter(self._traces.items()))
+			if buffer.created > cutoff:
+				break
+			del self._traces[trace_id]
+			self.stats["expired_traces"] += 1
+			forward.extend(self._decide(buffer, buffer.keep))
+		return forward
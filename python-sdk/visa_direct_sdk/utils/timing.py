@@ -0,0 +1,171 @@
+"""Opt-in per-payout stage timings.
+
+A :class:`StageTimings` is made current for a block with
+:func:`collect_timings` (or per payout by an :class:`Orchestrator` built with
+a :class:`TimingCollector`); every :func:`stage` entered in that context
+appends its ``perf_counter_ns`` duration. Outside a collection ``stage``
+returns a shared no-op, so the instrumentation costs one context variable
+lookup.
+"""
+
+import io
+import itertools
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class StageTimings:
+	"""Stage durations of one payout, in the order the stages finished.
+
+	Stages nest (``http`` contains ``jwe.encrypt``, ``network`` and
+	``jwe.decrypt``), so durations do not add up to ``total_ns``.
+	"""
+
+	__slots__ = ("stages", "total_ns", "profile", "error")
+
+	def __init__(self) -> None:
+		self.stages: List[Tuple[str, int]] = []
+		self.total_ns = 0
+		self.profile: Optional[str] = None
+		self.error: Optional[BaseException] = None
+
+	def add(self, name: str, nanos: int) -> None:
+		self.stages.append((name, nanos))
+
+	def as_dict(self) -> Dict[str, int]:
+		"""Nanoseconds per stage name, summed over repeats."""
+		result: Dict[str, int] = {}
+		for name, nanos in self.stages:
+			result[name] = result.get(name, 0) + nanos
+		return result
+
+	def as_millis(self) -> Dict[str, float]:
+		return {name: nanos / 1e6 for name, nanos in self.as_dict().items()}
+
+
+_current: ContextVar[Optional[StageTimings]] = ContextVar("visa_stage_timings", default=None)
+
+
+def current_timings() -> Optional[StageTimings]:
+	return _current.get()
+
+
+class _Stage:
+
+	__slots__ = ("_timings", "_name", "_started")
+
+	def __init__(self, timings: StageTimings, name: str) -> None:
+		self._timings = timings
+		self._name = name
+
+	def __enter__(self) -> None:
+		self._started = time.perf_counter_ns()
+
+	def __exit__(self, *exc) -> bool:
+		self._timings.add(self._name, time.perf_counter_ns() - self._started)
+		return False
+
+
+class _NoopStage:
+
+	__slots__ = ()
+
+	def __enter__(self) -> None:
+		return None
+
+	def __exit__(self, *exc) -> bool:
+		return False
+
+
+_NOOP = _NoopStage()
+
+
+def stage(name: str):
+	"""Time a block as ``name`` if a collection is active."""
+	timings = _current.get()
+	if timings is None:
+		return _NOOP
+	return _Stage(timings, name)
+
+
+class collect_timings:  # noqa: N801 - used like a function
+	"""Collect stage timings for the block into ``timings`` (a new :class:`StageTimings` by default).
+
+	``profile=True`` also runs the block under ``cProfile`` and stores the top
+	``profile_limit`` functions by cumulative time in ``timings.profile``.
+	"""
+
+	__slots__ = ("timings", "_token", "_started", "_profiler", "_profile_limit")
+
+	def __init__(self, timings: Optional[StageTimings] = None, *, profile: bool = False, profile_limit: int = 30) -> None:
+		self.timings = timings if timings is not None else StageTimings()
+		self._profiler = None
+		if profile:
+			import cProfile
+
+			self._profiler = cProfile.Profile()
+		self._profile_limit = profile_limit
+
+	def __enter__(self) -> StageTimings:
+		self._token = _current.set(self.timings)
+		if self._profiler is not None:
+			try:
+				self._profiler.enable()
+			except ValueError:
+				# another profiler (or a concurrent sampled payout on this thread) is active
+				self._profiler = None
+		self._started = time.perf_counter_ns()
+		return self.timings
+
+	def __exit__(self, exc_type, exc, tb) -> bool:
+		self.timings.total_ns = time.perf_counter_ns() - self._started
+		self.timings.error = exc
+		_current.reset(self._token)
+		if self._profiler is not None:
+			self._profiler.disable()
+			import pstats
+
+			out = io.StringIO()
+			pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(self._profile_limit)
+			self.timings.profile = out.getvalue()
+		return False
+
+
+class TimingCollector:
+	"""Collects stage timings for every payout of an orchestrator and hands them to ``callback``.
+
+	Every ``profile_every``-th payout (``0`` never) also runs under
+	``cProfile``. Callback errors are swallowed so reporting can never fail a
+	payout.
+	"""
+
+	def __init__(self, callback: Callable[[StageTimings], None], *, profile_every: int = 0, profile_limit: int = 30) -> None:
+		self.callback = callback
+		self.profile_every = profile_every
+		self.profile_limit = profile_limit
+		self._seq = itertools.count(1)
+
+	def collect(self) -> "_CollectorScope":
+		profile = bool(self.profile_every) and next(self._seq) % self.profile_every == 0
+		return _CollectorScope(self, collect_timings(profile=profile, profile_limit=self.profile_limit))
+
+
+class _CollectorScope:
+
+	__slots__ = ("_collector", "_scope")
+
+	def __init__(self, collector: TimingCollector, scope: collect_timings) -> None:
+		self._collector = collector
+		self._scope = scope
+
+	def __enter__(self) -> StageTimings:
+		return self._scope.__enter__()
+
+	def __exit__(self, exc_type, exc, tb) -> bool:
+		self._scope.__exit__(exc_type, exc, tb)
+		try:
+			self._collector.callback(self._scope.timings)
+		except Exception:  # noqa: BLE001 - best-effort reporting
+			pass
+		return False
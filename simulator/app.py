@@ -1,15 +1,43 @@
-from flask import Flask, request, jsonify
-from datetime import datetime
+from flask import Flask, g, request, jsonify
+from datetime import datetime, timedelta
+import argparse
 import hashlib
+import itertools
+import json
+import os
+import time
+
+from runtime import BoundedStore, KeyRing, SimulatorConfig, mle_routes
 
 
 app = Flask(__name__)
 
-# In-memory stores for idempotency and receipt reuse checks
-IDEMPOTENCY_STORE = {}
-PAYOUT_STATUS = {}
-USED_RECEIPTS = set()
-ALIAS_MAP = {}
+MAX_ENTRIES = int(os.environ.get("SIM_MAX_ENTRIES", "100000"))
+QUOTE_TTL = timedelta(seconds=int(os.environ.get("SIM_QUOTE_TTL_SECONDS", "300")))
+
+# Bounded, lock-protected in-memory stores for idempotency and receipt reuse checks.
+# They are per process: run several threads, not several worker processes.
+IDEMPOTENCY_STORE = BoundedStore(MAX_ENTRIES)
+PAYOUT_STATUS = BoundedStore(MAX_ENTRIES)
+USED_RECEIPTS = BoundedStore(MAX_ENTRIES)
+ALIAS_MAP = BoundedStore(MAX_ENTRIES)
+
+# Latency and fault injection; replaced wholesale via PUT /__sim/config
+CONFIG = SimulatorConfig.from_file(os.environ["SIM_CONFIG"]) if os.environ.get("SIM_CONFIG") else SimulatorConfig()
+
+# Message level encryption: requests sent as application/jose are decrypted, and
+# requiresMLE routes answer them with a JWE under the active key. SIM_MLE=0 turns it off.
+ENDPOINTS_FILE = os.environ.get("SIM_ENDPOINTS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "endpoints", "endpoints.json"))
+REQUIRES_MLE = mle_routes(ENDPOINTS_FILE) if os.path.exists(ENDPOINTS_FILE) else (lambda path: False)
+STRICT_MLE = os.environ.get("SIM_REQUIRE_MLE") == "1"
+KEYS = None if os.environ.get("SIM_MLE") == "0" else KeyRing(
+	os.environ.get("SIM_MLE_KEY_ID", "simulator-key"),
+	retain=int(os.environ.get("SIM_MLE_RETAIN_KEYS", "2")),
+	pem_path=os.environ.get("SIM_MLE_PRIVATE_KEY_PATH"),
+)
+
+# makes generated ids unique when two requests land in the same microsecond
+_SEQUENCE = itertools.count()
 
 
 def _idempotency_key():
@@ -17,22 +45,51 @@ def _idempotency_key():
 	return request.headers.get("x-idempotency-key")
 
 
+def _body() -> dict:
+
+	if "mle_body" in g:
+
+		return g.mle_body
+
+	return request.get_json(force=True, silent=True) or {}
+
+
 def _maybe_return_idempotent():
 
 	key = _idempotency_key()
-	if key and key in IDEMPOTENCY_STORE:
+	stored = IDEMPOTENCY_STORE.get(key) if key else None
+	if stored is not None:
 
-		return jsonify(IDEMPOTENCY_STORE[key])
+		return jsonify(stored)
 
 	return None
 
 
 def _store_idempotent(payload):
+	"""Store the response for the request's key; a concurrent duplicate that got here first wins."""
 
 	key = _idempotency_key()
 	if key:
 
-		IDEMPOTENCY_STORE[key] = payload
+		return IDEMPOTENCY_STORE.setdefault(key, payload)
+
+	return payload
+
+
+def _record_payout(payload):
+
+	stored = _store_idempotent(payload)
+	if stored is payload:
+
+		PAYOUT_STATUS.put(payload["payoutId"], payload)
+
+	return jsonify(stored)
+
+
+def _unique_id(prefix: str, amount_minor: int, length: int) -> str:
+
+	seed = f"{prefix}:{datetime.utcnow().isoformat()}:{next(_SEQUENCE)}:{amount_minor}"
+	return hashlib.sha256(seed.encode()).hexdigest()[:length]
 
 
 def _is_odd_minor(amount_minor: int) -> bool:
@@ -46,25 +103,146 @@ def _extract_amount_minor(body: dict) -> int:
 	return int(amount.get("minor", 0))
 
 
+# ---------------------- latency and fault injection ----------------------
+
+@app.before_request
+def _inject_behavior():
+
+	if request.path.startswith("/__sim/") or (request.path == "/jwks" and "/jwks" not in CONFIG.routes):
+
+		return None
+
+	rule = request.url_rule.rule if request.url_rule is not None else None
+	behavior = CONFIG.for_route(request.path, rule)
+	delay = behavior.latency.sample()
+	if delay > 0:
+
+		time.sleep(delay)
+
+	fault = behavior.fault()
+	if fault is not None:
+
+		status, body, headers = fault
+		return jsonify(body), status, headers
+
+	return None
+
+
+# ---------------------- message level encryption ----------------------
+
+@app.before_request
+def _decrypt_mle():
+
+	if KEYS is None or request.path.startswith("/__sim/"):
+
+		return None
+
+	if request.mimetype != "application/jose":
+
+		if STRICT_MLE and REQUIRES_MLE(request.path):
+
+			return jsonify({"error": "mle_required", "message": "This route requires an application/jose body"}), 400
+
+		return None
+
+	try:
+
+		g.mle_body = json.loads(KEYS.decrypt(request.get_data(as_text=True).strip()))
+	except KeyError as exc:
+
+		return jsonify({"error": "unknown_kid", "message": f"No key for kid {exc.args[0]}"}), 400
+	except Exception as exc:  # malformed token or wrong key
+
+		return jsonify({"error": "jwe_invalid", "message": str(exc)}), 400
+
+	return None
+
+
+@app.after_request
+def _encrypt_mle(response):
+
+	if "mle_body" not in g or not REQUIRES_MLE(request.path) or response.status_code >= 400:
+
+		return response
+
+	token, kid = KEYS.encrypt(response.get_data())
+	response.set_data(token)
+	response.headers["Content-Type"] = "application/jose"
+	response.headers["x-jwe-kid"] = kid
+	return response
+
+
+@app.route("/jwks", methods=["GET"])
+def jwks():
+
+	if KEYS is None:
+
+		return jsonify({"error": "mle_disabled", "message": "Simulator started without MLE"}), 404
+
+	return jsonify(KEYS.jwks())
+
+
+@app.route("/__sim/jwks/rotate", methods=["POST"])
+def rotate_keys():
+
+	if KEYS is None:
+
+		return jsonify({"error": "mle_disabled", "message": "Simulator started without MLE"}), 404
+
+	kid = KEYS.rotate()
+	return jsonify({"kid": kid, "kids": KEYS.kids(), "rotations": KEYS.rotations})
+
+
+@app.route("/__sim/config", methods=["GET"])
+def get_config():
+
+	return jsonify(CONFIG.spec)
+
+
+@app.route("/__sim/config", methods=["PUT"])
+def put_config():
+
+	global CONFIG
+	try:
+
+		CONFIG = SimulatorConfig(request.get_json(force=True))
+	except (TypeError, ValueError, KeyError) as exc:
+
+		return jsonify({"error": "invalid_config", "message": str(exc)}), 400
+
+	return jsonify(CONFIG.spec)
+
+
+@app.route("/__sim/state", methods=["GET"])
+def get_state():
+
+	stores = {"idempotency": IDEMPOTENCY_STORE, "payouts": PAYOUT_STATUS, "receipts": USED_RECEIPTS, "aliases": ALIAS_MAP}
+	return jsonify({name: {"entries": len(store), "maxEntries": store.max_entries, "evictions": store.evictions} for name, store in stores.items()})
+
+
+@app.route("/__sim/reset", methods=["POST"])
+def reset_state():
+
+	for store in (IDEMPOTENCY_STORE, PAYOUT_STATUS, USED_RECEIPTS, ALIAS_MAP):
+
+		store.clear()
+
+	return jsonify({"reset": True})
+
+
 # ---------------------- Phase 2 support endpoints ----------------------
 
 @app.route("/visaaliasdirectory/v1/resolve", methods=["POST"])
 def alias_resolve():
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	alias = body.get("alias")
 	alias_type = body.get("aliasType", "EMAIL")
-	if alias in ALIAS_MAP:
-
-		mapped = ALIAS_MAP[alias]
-	else:
-
-		# deterministic token from alias
-		mapped = {
-			"credentialType": "CARD",
-			"panToken": hashlib.sha256(alias.encode()).hexdigest()[:24]
-		}
-		ALIAS_MAP[alias] = mapped
+	# deterministic token from alias
+	mapped = ALIAS_MAP.get_or_create(alias, lambda: {
+		"credentialType": "CARD",
+		"panToken": hashlib.sha256(alias.encode()).hexdigest()[:24]
+	})
 
 	return jsonify({
 		"alias": alias,
@@ -76,7 +254,7 @@ def alias_resolve():
 @app.route("/pav/v1/card/validation", methods=["POST"])  # PAV
 def pav_validate():
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	pan_token = body.get("panToken")
 	# simple: tokens ending with '0' are bad
 	good = not str(pan_token).endswith('0')
@@ -86,7 +264,7 @@ def pav_validate():
 @app.route("/paai/v1/fundstransfer/attributes/inquiry", methods=["POST"])  # FTAI
 def ftai_inquiry():
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	pan_token = body.get("panToken")
 	oct_ok = not str(pan_token).endswith('9')
 	return jsonify({ "octEligible": oct_ok, "reasonCodes": [] if oct_ok else ["NOT_ELIGIBLE"] })
@@ -95,16 +273,16 @@ def ftai_inquiry():
 @app.route("/visapayouts/v3/payouts/validate", methods=["POST"])  # payout validate for account/wallet
 def payout_validate():
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	return jsonify({ "valid": True, "warnings": [] })
 
 
 @app.route("/forexrates/v1/lock", methods=["POST"])  # FX lock
 def fx_lock():
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	qid = "Q-" + hashlib.sha256((body.get("src") or "") .encode()).hexdigest()[:10]
-	expires = datetime.utcnow().isoformat() + "Z"
+	expires = (datetime.utcnow() + QUOTE_TTL).isoformat() + "Z"
 	return jsonify({ "quoteId": qid, "expiresAt": expires })
 
 
@@ -116,11 +294,11 @@ def pullfunds():
 
 		return maybe
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	amount_minor = _extract_amount_minor(body)
 
 	status = "approved" if _is_odd_minor(amount_minor) else "declined"
-	receipt_id = hashlib.sha256(f"aft:{datetime.utcnow().isoformat()}:{amount_minor}".encode()).hexdigest()[:18]
+	receipt_id = _unique_id("aft", amount_minor, 18)
 
 	response = {
 		"fundingType": body.get("fundingType", "AFT"),
@@ -130,8 +308,7 @@ def pullfunds():
 		"created": datetime.utcnow().isoformat() + "Z"
 	}
 
-	_store_idempotent(response)
-	return jsonify(response)
+	return jsonify(_store_idempotent(response))
 
 
 @app.route("/visadirect/fundstransfer/v1/pushfunds", methods=["POST"])  # OCT card payout
@@ -142,10 +319,10 @@ def pushfunds():
 
 		return maybe
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	amount_minor = _extract_amount_minor(body)
 	status = "executed" if _is_odd_minor(amount_minor) else "failed"
-	payout_id = hashlib.sha256(f"oct:{datetime.utcnow().isoformat()}:{amount_minor}".encode()).hexdigest()[:24]
+	payout_id = _unique_id("oct", amount_minor, 24)
 
 	payload = {
 		"payoutId": payout_id,
@@ -155,9 +332,7 @@ def pushfunds():
 		"created": datetime.utcnow().isoformat() + "Z"
 	}
 
-	PAYOUT_STATUS[payout_id] = payload
-	_store_idempotent(payload)
-	return jsonify(payload)
+	return _record_payout(payload)
 
 
 @app.route("/accountpayouts/v1/payout", methods=["POST"])  # Account payout
@@ -168,10 +343,10 @@ def account_payout():
 
 		return maybe
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	amount_minor = _extract_amount_minor(body)
 	status = "executed" if _is_odd_minor(amount_minor) else "failed"
-	payout_id = hashlib.sha256(f"acct:{datetime.utcnow().isoformat()}:{amount_minor}".encode()).hexdigest()[:24]
+	payout_id = _unique_id("acct", amount_minor, 24)
 
 	payload = {
 		"payoutId": payout_id,
@@ -181,9 +356,7 @@ def account_payout():
 		"created": datetime.utcnow().isoformat() + "Z"
 	}
 
-	PAYOUT_STATUS[payout_id] = payload
-	_store_idempotent(payload)
-	return jsonify(payload)
+	return _record_payout(payload)
 
 
 @app.route("/walletpayouts/v1/payout", methods=["POST"])  # Wallet payout
@@ -194,10 +367,10 @@ def wallet_payout():
 
 		return maybe
 
-	body = request.get_json(force=True, silent=True) or {}
+	body = _body()
 	amount_minor = _extract_amount_minor(body)
 	status = "executed" if _is_odd_minor(amount_minor) else "failed"
-	payout_id = hashlib.sha256(f"wallet:{datetime.utcnow().isoformat()}:{amount_minor}".encode()).hexdigest()[:24]
+	payout_id = _unique_id("wallet", amount_minor, 24)
 
 	payload = {
 		"payoutId": payout_id,
@@ -207,21 +380,79 @@ def wallet_payout():
 		"created": datetime.utcnow().isoformat() + "Z"
 	}
 
-	PAYOUT_STATUS[payout_id] = payload
-	_store_idempotent(payload)
-	return jsonify(payload)
+	return _record_payout(payload)
 
 
 @app.route("/visapayouts/v3/payouts/<payout_id>", methods=["GET"])  # status
 def payout_status(payout_id):
 
-	if payout_id in PAYOUT_STATUS:
+	stored = PAYOUT_STATUS.get(payout_id)
+	if stored is not None:
 
-		return jsonify(PAYOUT_STATUS[payout_id])
+		return jsonify(stored)
 
 	return jsonify({"payoutId": payout_id, "status": "unknown"}), 404
 
 
+def serve(host: str, port: int, *, server: str = "threaded", threads: int = 16):
+	"""Run the app in this process; every server shares the module-level stores across its threads."""
+
+	if server == "waitress":
+
+		try:
+
+			from waitress import serve as waitress_serve
+		except ModuleNotFoundError:
+
+			raise RuntimeError("waitress is required for --server waitress (pip install waitress)")
+
+		waitress_serve(app, host=host, port=port, threads=threads, connection_limit=max(100, threads * 8))
+		return
+
+	# Werkzeug spawns a thread per connection; fine for local load tests
+	app.run(host=host, port=port, threaded=True)
+
+
+def main(argv=None):
+
+	parser = argparse.ArgumentParser(description="Visa Direct simulator")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8766)
+	parser.add_argument("--server", choices=("threaded", "waitress"), default="threaded", help="threaded werkzeug server or waitress")
+	parser.add_argument("--threads", type=int, default=16, help="worker threads (waitress)")
+	parser.add_argument("--no-mle", action="store_true", help="plain JSON only: no JWKS, no JWE")
+	parser.add_argument("--require-mle", action="store_true", help="reject plain JSON on requiresMLE routes")
+	parser.add_argument("--config", help="JSON file with per-route latency and fault injection")
+	parser.add_argument("--latency", help="default latency, e.g. fixed:20, lognormal:40:0.5, longtail:40:0.3:0.01:1500")
+	parser.add_argument("--error-rate", type=float, help="default share of injected 500s")
+	parser.add_argument("--rate-429", type=float, help="default share of injected 429s")
+	parser.add_argument("--rate-503", type=float, help="default share of injected 503s")
+	args = parser.parse_args(argv)
+
+	global CONFIG, KEYS, STRICT_MLE
+	if args.no_mle:
+
+		KEYS = None
+
+	STRICT_MLE = STRICT_MLE or args.require_mle
+	spec = CONFIG.spec
+	if args.config:
+
+		with open(args.config, "r", encoding="utf-8") as handle:
+
+			spec = json.load(handle)
+
+	default = dict(spec.get("default", {}))
+	for key, value in (("latency", args.latency), ("errorRate", args.error_rate), ("rate429", args.rate_429), ("rate503", args.rate_503)):
+
+		if value is not None:
+
+			default[key] = value
+
+	CONFIG = SimulatorConfig({**spec, "default": default})
+	serve(args.host, args.port, server=args.server, threads=args.threads)
+
+
 if __name__ == "__main__":
 
-	app.run(host="127.0.0.1", port=8766)
+	main()
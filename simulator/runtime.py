@@ -0,0 +1,339 @@
+"""Thread-safe state, latency models, fault injection and MLE keys for the simulator."""
+
+import json
+import math
+import random
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+	from jwcrypto import jwe, jwk
+	from jwcrypto.common import base64url_decode
+except ModuleNotFoundError:  # only needed for MLE
+	jwe = None
+	jwk = None
+	base64url_decode = None
+
+
+class BoundedStore:
+	"""Lock-protected mapping that evicts its oldest entries beyond ``max_entries``."""
+
+	def __init__(self, max_entries: int = 100000):
+
+		self.max_entries = max_entries
+		self.evictions = 0
+		self._data = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key, default=None):
+
+		with self._lock:
+			return self._data.get(key, default)
+
+	def __contains__(self, key) -> bool:
+
+		with self._lock:
+			return key in self._data
+
+	def __len__(self) -> int:
+
+		return len(self._data)
+
+	def put(self, key, value) -> None:
+
+		with self._lock:
+			self._data[key] = value
+			self._data.move_to_end(key)
+			self._trim()
+
+	def setdefault(self, key, value):
+		"""Store ``value`` unless ``key`` is present; returns whichever value is stored (first writer wins)."""
+
+		with self._lock:
+			existing = self._data.get(key)
+			if existing is not None:
+				return existing
+			self._data[key] = value
+			self._trim()
+			return value
+
+	def get_or_create(self, key, factory: Callable[[], Any]):
+
+		with self._lock:
+			existing = self._data.get(key)
+			if existing is not None:
+				return existing
+			value = self._data[key] = factory()
+			self._trim()
+			return value
+
+	def clear(self) -> None:
+
+		with self._lock:
+			self._data.clear()
+
+	def _trim(self) -> None:
+
+		while len(self._data) > self.max_entries:
+			self._data.popitem(last=False)
+			self.evictions += 1
+
+
+# ---------------------- latency distributions ----------------------
+
+class LatencyModel:
+
+	def sample(self) -> float:  # pragma: no cover
+		"""Seconds to wait before answering."""
+		raise NotImplementedError
+
+
+class Fixed(LatencyModel):
+
+	def __init__(self, ms: float = 0.0):
+
+		self.seconds = ms / 1000.0
+
+	def sample(self) -> float:
+
+		return self.seconds
+
+
+class Uniform(LatencyModel):
+
+	def __init__(self, min_ms: float, max_ms: float):
+
+		self.low, self.high = min_ms / 1000.0, max_ms / 1000.0
+
+	def sample(self) -> float:
+
+		return random.uniform(self.low, self.high)
+
+
+class LogNormal(LatencyModel):
+	"""Log-normal around ``median_ms``; ``sigma`` around 0.3 to 0.8 resembles real service times."""
+
+	def __init__(self, median_ms: float, sigma: float = 0.5, max_ms: Optional[float] = None):
+
+		self.mu = math.log(max(median_ms, 1e-3) / 1000.0)
+		self.sigma = sigma
+		self.cap = max_ms / 1000.0 if max_ms else None
+
+	def sample(self) -> float:
+
+		value = random.lognormvariate(self.mu, self.sigma)
+		return min(value, self.cap) if self.cap else value
+
+
+class LongTail(LatencyModel):
+	"""Log-normal body with probability ``tail_probability`` of a Pareto-distributed stall above ``tail_ms``."""
+
+	def __init__(self, median_ms: float, sigma: float = 0.3, tail_probability: float = 0.01, tail_ms: float = 1000.0, tail_alpha: float = 1.5, max_ms: float = 30000.0):
+
+		self.body = LogNormal(median_ms, sigma)
+		self.tail_probability = tail_probability
+		self.tail_seconds = tail_ms / 1000.0
+		self.tail_alpha = tail_alpha
+		self.cap = max_ms / 1000.0
+
+	def sample(self) -> float:
+
+		if random.random() < self.tail_probability:
+			return min(self.tail_seconds * random.paretovariate(self.tail_alpha), self.cap)
+		return self.body.sample()
+
+
+def latency_from_config(spec: Any) -> LatencyModel:
+	"""``{"dist": "lognormal", "medianMs": 40, "sigma": 0.5}`` or the short form ``"lognormal:40:0.5"``."""
+
+	if spec is None:
+		return Fixed(0)
+	if isinstance(spec, (int, float)):
+		return Fixed(float(spec))
+	if isinstance(spec, str):
+		name, *args = spec.split(":")
+		values = [float(a) for a in args]
+		spec = {"dist": name}
+		keys = {
+			"fixed": ("ms",),
+			"uniform": ("minMs", "maxMs"),
+			"lognormal": ("medianMs", "sigma", "maxMs"),
+			"longtail": ("medianMs", "sigma", "tailProbability", "tailMs"),
+		}.get(name, ())
+		spec.update(zip(keys, values))
+	dist = spec.get("dist", "fixed")
+	if dist == "fixed":
+		return Fixed(spec.get("ms", 0))
+	if dist == "uniform":
+		return Uniform(spec["minMs"], spec["maxMs"])
+	if dist == "lognormal":
+		return LogNormal(spec["medianMs"], spec.get("sigma", 0.5), spec.get("maxMs"))
+	if dist == "longtail":
+		return LongTail(
+			spec["medianMs"],
+			spec.get("sigma", 0.3),
+			spec.get("tailProbability", 0.01),
+			spec.get("tailMs", 1000.0),
+			spec.get("tailAlpha", 1.5),
+			spec.get("maxMs", 30000.0),
+		)
+	raise ValueError(f"Unknown latency distribution {dist}")
+
+
+# ---------------------- fault injection ----------------------
+
+class RouteBehavior:
+	"""Latency and injected failures for one route (or the default)."""
+
+	def __init__(self, spec: Optional[Dict[str, Any]] = None):
+
+		spec = spec or {}
+		self.spec = spec
+		self.latency = latency_from_config(spec.get("latency"))
+		self.error_rate = float(spec.get("errorRate", 0.0))
+		self.rate_429 = float(spec.get("rate429", 0.0))
+		self.rate_503 = float(spec.get("rate503", 0.0))
+		self.retry_after = int(spec.get("retryAfterSeconds", 1))
+
+	def fault(self) -> Optional[Tuple[int, Dict[str, Any], Dict[str, str]]]:
+		"""``(status, body, headers)`` of an injected failure, or ``None`` to serve normally."""
+
+		roll = random.random()
+		if roll < self.rate_429:
+			return 429, {"error": "rate_limited", "message": "Too many requests (injected)"}, {"Retry-After": str(self.retry_after)}
+		roll -= self.rate_429
+		if roll < self.rate_503:
+			return 503, {"error": "unavailable", "message": "Service unavailable (injected)"}, {"Retry-After": str(self.retry_after)}
+		roll -= self.rate_503
+		if roll < self.error_rate:
+			return 500, {"error": "internal", "message": "Internal error (injected)"}, {}
+		return None
+
+
+class SimulatorConfig:
+	"""Per-route behaviour keyed by request path or Flask rule, e.g.::
+
+		{"default": {"latency": "lognormal:20:0.4"},
+		 "routes": {"/visadirect/fundstransfer/v1/pushfunds": {"latency": {"dist": "longtail", "medianMs": 80}, "rate503": 0.01}}}
+
+	Replaced atomically, so requests in flight keep the behaviour they started with.
+	"""
+
+	def __init__(self, spec: Optional[Dict[str, Any]] = None):
+
+		self.spec = spec or {}
+		self.default = RouteBehavior(self.spec.get("default"))
+		self.routes = {path: RouteBehavior({**self.spec.get("default", {}), **route}) for path, route in self.spec.get("routes", {}).items()}
+
+	def for_route(self, path: str, rule: Optional[str] = None) -> RouteBehavior:
+
+		behavior = self.routes.get(path)
+		if behavior is None and rule is not None:
+			behavior = self.routes.get(rule)
+		return behavior or self.default
+
+	@classmethod
+	def from_file(cls, path: str) -> "SimulatorConfig":
+
+		with open(path, "r", encoding="utf-8") as handle:
+			return cls(json.load(handle))
+
+
+# ---------------------- message level encryption ----------------------
+
+class KeyRing:
+	"""RSA keys for MLE: the newest encrypts responses, the last ``retain`` still decrypt requests.
+
+	The SDK decrypts responses with the JWKS entry for their ``kid``, so ``jwks()``
+	includes private material. These keys are for local testing only.
+
+	Rotation builds a new ring and swaps it in, so readers take one snapshot of
+	``_keys`` without the lock and never see it change under them.
+	"""
+
+	def __init__(self, kid: str = "simulator-key", *, retain: int = 2, size: int = 2048, pem_path: Optional[str] = None):
+
+		if jwk is None:
+			raise RuntimeError("jwcrypto is required for simulator MLE (pip install jwcrypto)")
+		self.retain = max(1, retain)
+		self.size = size
+		self.rotations = 0
+		self._lock = threading.Lock()
+		self._keys = OrderedDict()
+		if pem_path:
+			with open(pem_path, "rb") as handle:
+				key = jwk.JWK.from_pem(handle.read())
+			self._add(jwk.JWK(**{**json.loads(key.export()), "kid": kid}))
+		else:
+			self._add(jwk.JWK.generate(kty="RSA", size=size, kid=kid))
+
+	@property
+	def active(self):
+
+		return self._active
+
+	def rotate(self) -> str:
+		"""Make a fresh key active; returns its kid. Responses switch to it immediately."""
+
+		key = jwk.JWK.generate(kty="RSA", size=self.size, kid=f"sim-{secrets.token_hex(6)}")
+		with self._lock:
+			self._add(key)
+			self.rotations += 1
+		return key.get("kid")
+
+	def kids(self) -> List[str]:
+
+		return list(reversed(self._keys))
+
+	def jwks(self) -> Dict[str, Any]:
+		"""Active key first: the SDK encrypts with ``keys[0]``."""
+
+		keys = self._keys
+		return {"keys": [json.loads(key.export()) for key in reversed(keys.values())]}
+
+	def decrypt(self, token: str) -> bytes:
+		"""Payload of a compact JWE; ``KeyError`` when its kid has been retired."""
+
+		kid = json.loads(base64url_decode(token.split(".", 1)[0])).get("kid")
+		key = self._keys.get(kid)
+		if key is None:
+			raise KeyError(kid)
+		message = jwe.JWE()
+		message.deserialize(token, key=key)
+		return message.payload
+
+	def encrypt(self, payload: bytes) -> Tuple[str, str]:
+		"""Compact JWE under the active key and that key's kid."""
+
+		key = self._active
+		kid = key.get("kid")
+		message = jwe.JWE(payload, json.dumps({"alg": "RSA-OAEP-256", "enc": "A256GCM", "kid": kid}))
+		message.add_recipient(key)
+		return message.serialize(compact=True), kid
+
+	def _add(self, key) -> None:
+
+		keys = OrderedDict(self._keys)
+		keys[key.get("kid")] = key
+		while len(keys) > self.retain:
+			keys.popitem(last=False)
+		# published complete: the new kid decrypts before responses use it
+		self._keys = keys
+		self._active = key
+
+
+def mle_routes(endpoints_file: str) -> Callable[[str], bool]:
+	"""Predicate for paths the SDK's endpoints file marks ``requiresMLE`` (``:param`` segments match anything)."""
+
+	with open(endpoints_file, "r", encoding="utf-8") as handle:
+		routes = json.load(handle).get("routes", [])
+	templates = [route["path"].strip("/").split("/") for route in routes if route.get("requiresMLE")]
+
+	def matches(path: str) -> bool:
+
+		parts = path.strip("/").split("/")
+		return any(len(t) == len(parts) and all(a.startswith(":") or a == b for a, b in zip(t, parts)) for t in templates)
+
+	return matches